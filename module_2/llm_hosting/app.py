@@ -1,23 +1,46 @@
 # -*- coding: utf-8 -*-
-"""Flask + tiny local LLM standardizer with incremental JSONL CLI output."""
+"""Flask + tiny local LLM standardizer with incremental JSONL CLI output.
+
+``llama_cpp`` and ``huggingface_hub`` are imported on first use, so importing
+this module (tests, CLI start-up, container cold start) stays cheap. Models
+are resolved offline from ``MODEL_DIR``; downloading is the explicit
+``--download-model`` step.
+"""
 
 from __future__ import annotations
 
+import hashlib
 import json
 import os
 import re
 import sys
-import difflib
+import threading
 import time
 import multiprocessing as mp
-from typing import Any, Dict, List, Tuple
+from functools import lru_cache, partial
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, List, TextIO, Tuple
+
+from flask import Flask, Response, jsonify, request, url_for
 
-from flask import Flask, jsonify, request
-from huggingface_hub import hf_hub_download
-from llama_cpp import Llama  # CPU-only by default if N_GPU_LAYERS=0
+import model_registry
+from fuzzy_index import FuzzyIndex
+from jobs import JobStore
+from metrics import Metrics
+
+if TYPE_CHECKING:
+    from llama_cpp import Llama, LlamaGrammar  # CPU-only by default if N_GPU_LAYERS=0
 
 app = Flask(__name__)
 
+# Per-process stage counters; served at /metrics and summarized by the CLI.
+METRICS = Metrics()
+
+# Background batches submitted via POST /jobs; results kept JOB_TTL seconds.
+JOBS = JobStore(
+    workers=int(os.getenv("JOB_WORKERS", "1")),
+    ttl=float(os.getenv("JOB_TTL", "3600")),
+)
+
 # Ensure Unicode can be written to stdout on Windows terminals.
 if hasattr(sys.stdout, "reconfigure"):
     sys.stdout.reconfigure(encoding="utf-8")
@@ -32,16 +55,53 @@ MODEL_FILE = os.getenv(
     "tinyllama-1.1b-chat-v1.0.Q4_K_M.gguf",
 )
 
+# Local model directory; resolution is offline (see model_registry).
+MODEL_DIR = os.getenv("MODEL_DIR", "models")
+# Optional expected SHA-256; selects the model in MODEL_DIR by checksum.
+MODEL_SHA256 = os.getenv("MODEL_SHA256", "")
+
 N_THREADS = int(os.getenv("N_THREADS", str(os.cpu_count() or 2)))
 N_CTX = int(os.getenv("N_CTX", "2048"))
 N_GPU_LAYERS = int(os.getenv("N_GPU_LAYERS", "0"))  # 0 → CPU-only
+# Memory-map the GGUF so parallel workers share one copy via the page cache.
+USE_MMAP = os.getenv("USE_MMAP", "1") != "0"
+# Resolve rows that already match the canonical lists without the model.
+RULES_FIRST = os.getenv("RULES_FIRST", "1") != "0"
+# Constrain generation to the two-key JSON answer (see JSON_GRAMMAR_GBNF).
+JSON_GRAMMAR = os.getenv("JSON_GRAMMAR", "1") != "0"
+MAX_TOKENS = int(os.getenv("MAX_TOKENS", "64" if JSON_GRAMMAR else "128"))
 
 CANON_UNIS_PATH = os.getenv("CANON_UNIS_PATH", "canon_universities.txt")
 CANON_PROGS_PATH = os.getenv("CANON_PROGS_PATH", "canon_programs.txt")
 
+# Characters read per refill when streaming JSON input files.
+READ_CHUNK = 1 << 16
+
+# Fields this service adds to a row; ignored when hashing rows for --resume.
+OUTPUT_FIELDS = (
+    "llm-generated-program",
+    "llm-generated-university",
+    "degree_level",
+    "row_index",
+)
+
+# Unordered CLI mode: largest pool chunk and seconds between output flushes.
+MAX_CHUNKSIZE = int(os.getenv("MAX_CHUNKSIZE", "32"))
+FLUSH_SECONDS = float(os.getenv("FLUSH_SECONDS", "2.0"))
+
+# Streamed HTTP responses: one JSON row per line.
+NDJSON_MIMETYPE = "application/x-ndjson"
+
 # Precompiled, non-greedy JSON object matcher to tolerate chatter around JSON
 JSON_OBJ_RE = re.compile(r"\{.*?\}", re.DOTALL)
 
+# Precompiled helpers for the per-row normalization hot path
+WS_RE = re.compile(r"\s+")
+OF_RE = re.compile(r"\bOf\b")
+SPLIT_RE = re.compile(r",| at | @ ")
+MCG_RE = re.compile(r"(?i)mcg(ill)?(\.)?")
+UBC_RE = re.compile(r"(?i)(ubc|u\.?b\.?c\.?|university of british columbia)")
+
 # ---------------- Canonical lists + abbrev maps ----------------
 def _read_lines(path: str) -> List[str]:
     """Read non-empty, stripped lines from a file (UTF-8)."""
@@ -55,6 +115,10 @@ def _read_lines(path: str) -> List[str]:
 CANON_UNIS = _read_lines(CANON_UNIS_PATH)
 CANON_PROGS = _read_lines(CANON_PROGS_PATH)
 
+# Built once at import; lookups only score length-compatible candidates.
+UNI_INDEX = FuzzyIndex(CANON_UNIS)
+PROG_INDEX = FuzzyIndex(CANON_PROGS)
+
 ABBREV_UNI: Dict[str, str] = {
     r"(?i)^mcg(\.|ill)?$": "McGill University",
     r"(?i)^(ubc|u\.?b\.?c\.?)$": "University of British Columbia",
@@ -81,11 +145,33 @@ DEGREE_PATTERNS: List[Tuple[str, str]] = [
 ]
 
 
+# ---------------- Normalization engine (built once at import) ----------------
+ABBREV_UNI_RES = [(re.compile(pat), full) for pat, full in ABBREV_UNI.items()]
+DEGREE_RES = [(re.compile(pat), label) for pat, label in DEGREE_PATTERNS]
+
+CANON_UNIS_SET = frozenset(CANON_UNIS)
+CANON_PROGS_SET = frozenset(CANON_PROGS)
+
+
+def _alias_map(canon: List[str], fixes: Dict[str, str]) -> Dict[str, str]:
+    """Map case-folded canonical names and known misspellings to their fix."""
+    aliases: Dict[str, str] = {}
+    for name in canon:
+        aliases.setdefault(name.casefold(), name)
+    for wrong, right in fixes.items():
+        aliases[wrong.casefold()] = right
+    return aliases
+
+
+UNI_ALIASES = _alias_map(CANON_UNIS, COMMON_UNI_FIXES)
+PROG_ALIASES = _alias_map(CANON_PROGS, COMMON_PROG_FIXES)
+
+
 def _extract_degree_level(text: str) -> str:
     """Extract degree level from the raw program text."""
     t = text or ""
-    for pattern, label in DEGREE_PATTERNS:
-        if re.search(pattern, t):
+    for pattern, label in DEGREE_RES:
+        if pattern.search(t):
             return label
     return ""
 
@@ -132,107 +218,228 @@ FEW_SHOTS: List[Tuple[Dict[str, str], Dict[str, str]]] = [
     ),
 ]
 
+# Exactly {"standardized_program": "...", "standardized_university": "..."}:
+# no chatter before, nothing after the closing brace, so output always parses.
+JSON_GRAMMAR_GBNF = r'''
+root ::= "{" ws "\"standardized_program\"" ws ":" ws string ws "," ws "\"standardized_university\"" ws ":" ws string ws "}"
+string ::= "\"" char* "\""
+char ::= [^"\\\x00-\x1f] | "\\" (["\\/bfnrt] | "u" [0-9a-fA-F] [0-9a-fA-F] [0-9a-fA-F] [0-9a-fA-F])
+ws ::= " "?
+'''
+
 _LLM: Llama | None = None
+_GRAMMAR: LlamaGrammar | None = None
+_LLM_LOCK = threading.Lock()
+# llama.cpp contexts are not thread-safe; request and job threads take turns.
+_LLM_CALL_LOCK = threading.Lock()
+# Model lifecycle for readiness: idle -> loading -> ready (or error).
+MODEL_STATE: Dict[str, str] = {"status": "idle", "error": ""}
+
+# Set by _init_worker in pool processes; None means single-process defaults.
+_WORKER_MODEL_PATH: str | None = None
+_WORKER_THREADS: int | None = None
+
+
+def _resolve_model_path() -> str:
+    """Return the validated local GGUF path (no network; see --download-model)."""
+    return model_registry.resolve(MODEL_DIR, MODEL_FILE, MODEL_SHA256)
+
+
+def _download_model() -> str:
+    """Explicitly fetch MODEL_FILE from MODEL_REPO into MODEL_DIR and register it."""
+    return model_registry.download(MODEL_REPO, MODEL_FILE, MODEL_DIR, MODEL_SHA256)
+
+
+def _threads_per_worker(n_workers: int) -> int:
+    """Split N_THREADS across workers so the pool does not oversubscribe cores."""
+    return max(1, N_THREADS // max(1, n_workers))
+
+
+def _init_worker(model_path: str, n_threads: int) -> None:
+    """Pool initializer: reuse the parent's model path and thread budget."""
+    global _WORKER_MODEL_PATH, _WORKER_THREADS
+    _WORKER_MODEL_PATH = model_path
+    _WORKER_THREADS = n_threads
 
 
 def _load_llm() -> Llama:
-    """Download (or reuse) the GGUF file and initialize llama.cpp."""
+    """Resolve the GGUF file and initialize llama.cpp (once per process)."""
     global _LLM
     if _LLM is not None:
         return _LLM
 
-    model_path = hf_hub_download(
-        repo_id=MODEL_REPO,
-        filename=MODEL_FILE,
-        local_dir="models",
-        local_dir_use_symlinks=False,
-        force_filename=MODEL_FILE,
-    )
-
-    _LLM = Llama(
-        model_path=model_path,
-        n_ctx=N_CTX,
-        n_threads=N_THREADS,
-        n_gpu_layers=N_GPU_LAYERS,
-        verbose=False,
-    )
+    # The background warm-up and the first request may race; load only once.
+    with _LLM_LOCK:
+        if _LLM is not None:
+            return _LLM
+        MODEL_STATE.update(status="loading", error="")
+        try:
+            from llama_cpp import Llama
+
+            model_path = _WORKER_MODEL_PATH or _resolve_model_path()
+            _LLM = Llama(
+                model_path=model_path,
+                n_ctx=N_CTX,
+                n_threads=_WORKER_THREADS or N_THREADS,
+                n_gpu_layers=N_GPU_LAYERS,
+                use_mmap=USE_MMAP,
+                verbose=False,
+            )
+        except Exception as exc:
+            MODEL_STATE.update(status="error", error=str(exc))
+            raise
+        MODEL_STATE["status"] = "ready"
     return _LLM
 
 
+def _warm_model() -> None:
+    """Load the model in the background so the server can answer health checks."""
+    try:
+        _load_llm()
+        _json_grammar()
+    except Exception as exc:
+        print(f"Model warm-up failed: {exc}", file=sys.stderr)
+
+
+def start_background_warmup() -> threading.Thread:
+    """Start loading the model on a daemon thread and return the thread."""
+    thread = threading.Thread(target=_warm_model, name="model-warmup", daemon=True)
+    thread.start()
+    return thread
+
+
+def _json_grammar() -> LlamaGrammar | None:
+    """Return the compiled answer grammar (once per process), or None if disabled."""
+    global _GRAMMAR
+    if JSON_GRAMMAR and _GRAMMAR is None:
+        from llama_cpp import LlamaGrammar
+
+        _GRAMMAR = LlamaGrammar.from_string(JSON_GRAMMAR_GBNF, verbose=False)
+    return _GRAMMAR if JSON_GRAMMAR else None
+
+
 def _split_fallback(text: str) -> Tuple[str, str]:
     """Simple, rules-first parser if the model returns non-JSON."""
-    s = re.sub(r"\s+", " ", (text or "")).strip().strip(",")
-    parts = [p.strip() for p in re.split(r",| at | @ ", s) if p.strip()]
+    s = WS_RE.sub(" ", (text or "")).strip().strip(",")
+    parts = [p.strip() for p in SPLIT_RE.split(s) if p.strip()]
     prog = parts[0] if parts else ""
     uni = parts[1] if len(parts) > 1 else ""
 
     # High-signal expansions
-    if re.fullmatch(r"(?i)mcg(ill)?(\.)?", uni or ""):
+    if MCG_RE.fullmatch(uni or ""):
         uni = "McGill University"
-    if re.fullmatch(
-        r"(?i)(ubc|u\.?b\.?c\.?|university of british columbia)",
-        uni or "",
-    ):
+    if UBC_RE.fullmatch(uni or ""):
         uni = "University of British Columbia"
 
     # Title-case program; normalize 'Of' → 'of' for universities
     prog = prog.title()
     if uni:
-        uni = re.sub(r"\bOf\b", "of", uni.title())
+        uni = OF_RE.sub("of", uni.title())
     else:
         uni = ""
     return prog, uni
 
 
-def _best_match(name: str, candidates: List[str], cutoff: float = 0.86) -> str | None:
-    """Fuzzy match via difflib (lightweight, Replit-friendly)."""
-    if not name or not candidates:
-        return None
-    matches = difflib.get_close_matches(name, candidates, n=1, cutoff=cutoff)
-    return matches[0] if matches else None
+def _best_match(name: str, index: FuzzyIndex, cutoff: float = 0.86) -> str | None:
+    """Fuzzy match against a prebuilt index (same results as difflib)."""
+    start = time.perf_counter()
+    match = index.best_match(name, cutoff=cutoff)
+    METRICS.add(fuzzy_calls=1, fuzzy_s=time.perf_counter() - start)
+    return match
 
 
+def _strip_degree_tokens(prog: str) -> str:
+    """Remove degree-level tokens and stray separators from a program name."""
+    p = (prog or "").strip()
+    for pattern, _label in DEGREE_RES:
+        p = pattern.sub("", p)
+    return WS_RE.sub(" ", p).strip(" ,-/")
+
+
+@lru_cache(maxsize=65536)
 def _post_normalize_program(prog: str) -> str:
     """Apply common fixes, title case, then canonical/fuzzy mapping."""
-    p = (prog or "").strip()
-    # Remove degree-level tokens from program names.
-    for pattern, _label in DEGREE_PATTERNS:
-        p = re.sub(pattern, "", p)
-    p = re.sub(r"\s+", " ", p).strip(" ,-/")
-    p = COMMON_PROG_FIXES.get(p, p)
-    p = p.title()
-    if p in CANON_PROGS:
+    p = _strip_degree_tokens(prog)
+    # Case-insensitive canonical names and common fixes
+    alias = PROG_ALIASES.get(p.casefold())
+    if alias in CANON_PROGS_SET:
+        return alias
+    p = (alias or p).title()
+    if p in CANON_PROGS_SET:
         return p
-    match = _best_match(p, CANON_PROGS, cutoff=0.84)
+    match = _best_match(p, PROG_INDEX, cutoff=0.84)
     return match or p
 
 
+@lru_cache(maxsize=65536)
 def _post_normalize_university(uni: str) -> str:
     """Expand abbreviations, apply common fixes, capitalization, and canonical map."""
     u = (uni or "").strip()
 
     # Abbreviations
-    for pat, full in ABBREV_UNI.items():
-        if re.fullmatch(pat, u):
+    for pattern, full in ABBREV_UNI_RES:
+        if pattern.fullmatch(u):
             u = full
             break
 
-    # Common spelling fixes
-    u = COMMON_UNI_FIXES.get(u, u)
+    # Case-insensitive canonical names and common spelling fixes
+    alias = UNI_ALIASES.get(u.casefold())
+    if alias in CANON_UNIS_SET:
+        return alias
+    u = alias or u
 
     # Normalize 'Of' → 'of'
     if u:
-        u = re.sub(r"\bOf\b", "of", u.title())
+        u = OF_RE.sub("of", u.title())
 
     # Canonical or fuzzy map
-    if u in CANON_UNIS:
+    if u in CANON_UNIS_SET:
         return u
-    match = _best_match(u, CANON_UNIS, cutoff=0.86)
+    match = _best_match(u, UNI_INDEX, cutoff=0.86)
     return match or u or ""
 
 
+def _rules_first(program_text: str, uni_text: str = "") -> Dict[str, str] | None:
+    """Resolve rows whose parts already match the canonical lists exactly.
+
+    With its own ``university`` the whole program text (minus degree tokens)
+    must be a canonical program. Otherwise the text is split at a separator,
+    trying the longest program first, so that the part before it is a
+    canonical program and the rest a canonical university (case-insensitive).
+    Canonical names on either side may contain commas. Returns ``None`` for
+    anything ambiguous so the row goes to the model.
+    """
+    text = WS_RE.sub(" ", program_text or "").strip().strip(",")
+    if uni_text:
+        program = PROG_ALIASES.get(_strip_degree_tokens(text).casefold())
+        if program not in CANON_PROGS_SET:
+            return None
+        # _process_row normalizes the separate university column itself.
+        return {"standardized_program": program, "standardized_university": ""}
+
+    separators = list(SPLIT_RE.finditer(text))
+    for position, sep in reversed(list(enumerate(separators))):
+        program = PROG_ALIASES.get(_strip_degree_tokens(text[:sep.start()]).casefold())
+        if program not in CANON_PROGS_SET:
+            continue
+        candidates = [text[sep.end():].strip()]
+        if position == 0:
+            # abbreviations such as "McG" only expand for a plain two-part row
+            candidates.append(_split_fallback(text)[1])
+        for candidate in candidates:
+            university = UNI_ALIASES.get(candidate.casefold())
+            if university in CANON_UNIS_SET:
+                return {
+                    "standardized_program": program,
+                    "standardized_university": university,
+                }
+    return None
+
+
 def _call_llm(program_text: str) -> Dict[str, str]:
     """Query the tiny LLM and return standardized fields."""
+    from llama_cpp import LogitsProcessorList
+
     llm = _load_llm()
 
     messages = [{"role": "system", "content": SYSTEM_PROMPT}]
@@ -253,20 +460,48 @@ def _call_llm(program_text: str) -> Dict[str, str]:
         }
     )
 
-    out = llm.create_chat_completion(
-        messages=messages,
-        temperature=0.0,
-        max_tokens=128,
-        top_p=1.0,
+    # The logits processor first runs once the prompt is evaluated, which
+    # splits wall time into prompt-eval and generation phases.
+    first_token: List[float] = []
+
+    def _mark_first_token(_input_ids: Any, scores: Any) -> Any:
+        if not first_token:
+            first_token.append(time.perf_counter())
+        return scores
+
+    grammar = _json_grammar()
+    with _LLM_CALL_LOCK:
+        start = time.perf_counter()
+        out = llm.create_chat_completion(
+            messages=messages,
+            temperature=0.0,
+            max_tokens=MAX_TOKENS,
+            top_p=1.0,
+            grammar=grammar,
+            logits_processor=LogitsProcessorList([_mark_first_token]),
+        )
+        end = time.perf_counter()
+    usage = out.get("usage") or {}
+    prompt_done = first_token[0] if first_token else end
+    METRICS.add(
+        llm_calls=1,
+        truncated_calls=int(out["choices"][0].get("finish_reason") == "length"),
+        llm_s=end - start,
+        prompt_tokens=usage.get("prompt_tokens", 0),
+        completion_tokens=usage.get("completion_tokens", 0),
+        prompt_eval_s=prompt_done - start,
+        generation_s=end - prompt_done,
     )
 
     text = (out["choices"][0]["message"]["content"] or "").strip()
     try:
-        match = JSON_OBJ_RE.search(text)
+        # Grammar output is exactly one object; free text may carry chatter.
+        match = None if JSON_GRAMMAR else JSON_OBJ_RE.search(text)
         obj = json.loads(match.group(0) if match else text)
         std_prog = str(obj.get("standardized_program", "")).strip()
         std_uni = str(obj.get("standardized_university", "")).strip()
     except Exception:
+        METRICS.add(json_failures=1)
         std_prog, std_uni = _split_fallback(program_text)
 
     std_prog = _post_normalize_program(std_prog)
@@ -277,18 +512,51 @@ def _call_llm(program_text: str) -> Dict[str, str]:
     }
 
 
-def _process_row(row: Dict[str, Any]) -> Dict[str, Any]:
-    """Process a single row (safe for multiprocessing)."""
+def _standardize_row(row: Dict[str, Any]) -> Tuple[Dict[str, Any], bool]:
+    """Process a single row; also report whether it skipped the LLM."""
+    start = time.perf_counter()
     program_text = (row or {}).get("program") or ""
-    result = _call_llm(program_text)
-    row["llm-generated-program"] = result["standardized_program"]
     uni_text = (row or {}).get("university") or ""
+    result = _rules_first(program_text, uni_text) if RULES_FIRST else None
+    fast_path = result is not None
+    if result is None:
+        result = _call_llm(program_text)
+    row["llm-generated-program"] = result["standardized_program"]
     if uni_text:
         row["llm-generated-university"] = _post_normalize_university(uni_text)
     else:
         row["llm-generated-university"] = result["standardized_university"]
     row["degree_level"] = _extract_degree_level(program_text)
-    return row
+    METRICS.add(rows=1, row_s=time.perf_counter() - start, fast_path_rows=int(fast_path))
+    return row, fast_path
+
+
+def _process_row(row: Dict[str, Any]) -> Dict[str, Any]:
+    """Process a single row (safe for multiprocessing)."""
+    return _standardize_row(row)[0]
+
+
+def _cli_task(
+    item: Tuple[int, Dict[str, Any]],
+    record_index: bool = False,
+) -> Tuple[Dict[str, Any], bool, Dict[str, float]]:
+    """Process an (input position, row) pair for the CLI (safe for multiprocessing).
+
+    Returns the row, whether it took the fast path, and this process's metrics
+    since the previous row so the parent can aggregate across workers.
+    """
+    index, row = item
+    row, fast_path = _standardize_row(row)
+    if record_index:
+        row["row_index"] = index
+    return row, fast_path, METRICS.drain()
+
+
+def _unordered_chunksize(total: int | None, n_workers: int) -> int:
+    """Pick a pool chunk size: ~4 chunks per worker, capped at MAX_CHUNKSIZE."""
+    if total is None:
+        return max(1, MAX_CHUNKSIZE // 4)
+    return max(1, min(MAX_CHUNKSIZE, -(-total // (n_workers * 4))))
 
 
 def _normalize_input(payload: Any) -> List[Dict[str, Any]]:
@@ -300,44 +568,259 @@ def _normalize_input(payload: Any) -> List[Dict[str, Any]]:
     return []
 
 
+def _iter_json_values(f: TextIO) -> Iterator[Any]:
+    """Incrementally decode a JSON array or a stream of JSON values (NDJSON).
+
+    For a top-level array the elements are yielded one at a time; otherwise
+    each top-level value is yielded. Only one chunk plus the value being
+    decoded is held in memory.
+    """
+    decoder = json.JSONDecoder()
+    buf = ""
+    pos = 0
+    eof = False
+    in_array = None
+
+    def fill() -> bool:
+        nonlocal buf, pos, eof
+        # Grow reads geometrically so one large value is not re-decoded O(n) times.
+        chunk = f.read(max(READ_CHUNK, len(buf) - pos))
+        if not chunk:
+            eof = True
+            return False
+        buf = buf[pos:] + chunk
+        pos = 0
+        return True
+
+    while True:
+        # Skip whitespace (and array commas) between values.
+        while True:
+            while pos < len(buf) and (buf[pos].isspace() or (in_array and buf[pos] == ",")):
+                pos += 1
+            if pos < len(buf) or not fill():
+                break
+        if pos >= len(buf):
+            return
+        if in_array is None:
+            in_array = buf[pos] == "["
+            if in_array:
+                pos += 1
+                continue
+        if in_array and buf[pos] == "]":
+            return
+        try:
+            value, end = decoder.raw_decode(buf, pos)
+        except json.JSONDecodeError:
+            # The value may just be cut off at the chunk boundary.
+            if eof or not fill():
+                raise
+            continue
+        if end == len(buf) and not eof and fill():
+            # A value ending exactly at the boundary (e.g. a number) may continue.
+            continue
+        pos = end
+        yield value
+
+
+def _iter_input_rows(in_path: str) -> Iterator[Dict[str, Any]]:
+    """Stream rows from a JSON array, NDJSON, or a {'rows': [...]} file."""
+    with open(in_path, "r", encoding="utf-8") as f:
+        for value in _iter_json_values(f):
+            if isinstance(value, dict) and isinstance(value.get("rows"), list):
+                # Wrapped payloads are decoded whole; arrays and NDJSON stream.
+                yield from value["rows"]
+            elif isinstance(value, dict):
+                yield value
+
+
+def _count_input_rows(in_path: str) -> int | None:
+    """Cheaply count NDJSON rows for progress/ETA; ``None`` for other layouts."""
+    with open(in_path, "r", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                try:
+                    first = json.loads(line)
+                except json.JSONDecodeError:
+                    return None
+                if not isinstance(first, dict) or "rows" in first:
+                    return None
+                break
+        else:
+            return 0
+        f.seek(0)
+        return sum(1 for line in f if line.strip())
+
+
+def _row_key(row: Dict[str, Any]) -> str:
+    """Identify a row across runs by its URL, else by a hash of its input fields."""
+    url = row.get("url") or row.get("overview_url")
+    if url:
+        return f"url:{url}"
+    fields = {k: v for k, v in row.items() if k not in OUTPUT_FIELDS}
+    blob = json.dumps(fields, ensure_ascii=False, sort_keys=True)
+    return "sha1:" + hashlib.sha1(blob.encode("utf-8")).hexdigest()
+
+
+def _load_done_keys(out_path: str) -> set[str]:
+    """Index rows already written to a JSONL output so --resume can skip them.
+
+    A trailing partial line left by an interrupted run is truncated so the
+    resumed output stays valid JSONL.
+    """
+    done: set[str] = set()
+    if not os.path.exists(out_path):
+        return done
+    good_end = 0
+    with open(out_path, "rb") as f:
+        for raw in f:
+            if not raw.endswith(b"\n"):
+                break
+            good_end += len(raw)
+            line = raw.strip()
+            if line:
+                done.add(_row_key(json.loads(line)))
+    if good_end != os.path.getsize(out_path):
+        with open(out_path, "r+b") as f:
+            f.truncate(good_end)
+    return done
+
+
+def _write_json_array(jsonl_path: str, sink: TextIO) -> None:
+    """Re-emit a JSONL file as an indented JSON array, one row at a time."""
+    first = True
+    with open(jsonl_path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            text = json.dumps(json.loads(line), ensure_ascii=False, indent=2)
+            sink.write("[\n  " if first else ",\n  ")
+            sink.write(text.replace("\n", "\n  "))
+            first = False
+    sink.write("[]" if first else "\n]")
+
+
 @app.get("/")
 def health() -> Any:
-    """Simple liveness check."""
+    """Health summary: the process is up and reports the model status."""
+    return jsonify({"ok": True, "status": MODEL_STATE["status"]})
+
+
+@app.get("/livez")
+def livez() -> Any:
+    """Liveness: the server process is answering requests."""
     return jsonify({"ok": True})
 
 
+@app.get("/readyz")
+def readyz() -> Any:
+    """Readiness: 200 once the model is loaded, 503 while loading or failed."""
+    ready = MODEL_STATE["status"] == "ready"
+    body = {"ready": ready, "status": MODEL_STATE["status"]}
+    if MODEL_STATE["error"]:
+        body["error"] = MODEL_STATE["error"]
+    return jsonify(body), 200 if ready else 503
+
+
+@app.get("/metrics")
+def metrics() -> Any:
+    """Per-stage counters, timings and token throughput since startup."""
+    return jsonify(METRICS.report())
+
+
+def _wants_ndjson() -> bool:
+    """Return True if the client asked for a streamed NDJSON response."""
+    if request.args.get("stream", "0") not in ("", "0"):
+        return True
+    best = request.accept_mimetypes.best_match([NDJSON_MIMETYPE, "application/json"])
+    return best == NDJSON_MIMETYPE
+
+
+def _ndjson_response(rows: Iterable[Dict[str, Any]]) -> Response:
+    """Stream rows one JSON document per line, flushing each as it is ready."""
+    lines = (json.dumps(row, ensure_ascii=False) + "\n" for row in rows)
+    return Response(lines, mimetype=NDJSON_MIMETYPE)
+
+
 @app.post("/standardize")
 def standardize() -> Any:
-    """Standardize rows from an HTTP request and return JSON."""
+    """Standardize rows from an HTTP request and return JSON.
+
+    With ``?stream=1`` (or ``Accept: application/x-ndjson``) each row is sent
+    as an NDJSON line as soon as it is standardized, in input order.
+    """
     payload = request.get_json(force=True, silent=True)
     rows = _normalize_input(payload)
 
-    out: List[Dict[str, Any]] = []
-    for row in rows:
-        program_text = (row or {}).get("program") or ""
-        result = _call_llm(program_text)
-        row["llm-generated-program"] = result["standardized_program"]
-        uni_text = (row or {}).get("university") or ""
-        if uni_text:
-            row["llm-generated-university"] = _post_normalize_university(uni_text)
-        else:
-            row["llm-generated-university"] = result["standardized_university"]
-        row["degree_level"] = _extract_degree_level(program_text)
-        out.append(row)
-
+    if _wants_ndjson():
+        return _ndjson_response(_process_row(row) for row in rows)
+    out: List[Dict[str, Any]] = [_process_row(row) for row in rows]
     return jsonify({"rows": out})
 
 
+@app.post("/jobs")
+def submit_job() -> Any:
+    """Queue rows for background standardization and return a job id (202)."""
+    payload = request.get_json(force=True, silent=True)
+    job = JOBS.submit(_normalize_input(payload), _process_row)
+    body = job.info()
+    body["status_url"] = url_for("job_status", job_id=job.id)
+    body["results_url"] = url_for("job_results", job_id=job.id)
+    return jsonify(body), 202, {"Location": body["status_url"]}
+
+
+@app.get("/jobs/<job_id>")
+def job_status(job_id: str) -> Any:
+    """Report a job's progress; 404 once it is unknown or expired."""
+    job = JOBS.get(job_id)
+    if job is None:
+        return jsonify({"error": "unknown or expired job"}), 404
+    return jsonify(job.info())
+
+
+@app.get("/jobs/<job_id>/results")
+def job_results(job_id: str) -> Any:
+    """Stream finished rows as NDJSON, following the job until it ends.
+
+    ``?start=N`` skips rows already received; ``?wait=0`` returns only the
+    rows finished so far instead of following the job.
+    """
+    job = JOBS.get(job_id)
+    if job is None:
+        return jsonify({"error": "unknown or expired job"}), 404
+    start = request.args.get("start", default=0, type=int)
+    wait = request.args.get("wait", "1") != "0"
+    return _ndjson_response(job.stream(start=start, wait=wait))
+
+
 def _cli_process_file(
     in_path: str,
     out_path: str | None,
     append: bool,
     to_stdout: bool,
+    resume: bool = False,
+    unordered: bool = False,
 ) -> None:
-    """Process a JSON file and write JSONL incrementally."""
-    with open(in_path, "r", encoding="utf-8") as f:
-        rows = _normalize_input(json.load(f))
-    total = len(rows)
+    """Stream a JSON/NDJSON file and write JSONL incrementally.
+
+    With ``resume`` the existing output is indexed and rows already present
+    (matched by :func:`_row_key`) are skipped; new rows are appended.
+
+    With ``unordered`` rows are written as soon as any worker finishes them,
+    in larger pool chunks with buffered, periodically flushed writes. Each row
+    then carries ``row_index`` (its input position) so order can be restored.
+    """
+    rows = enumerate(_iter_input_rows(in_path))
+    total = _count_input_rows(in_path)
+    if resume and not to_stdout:
+        out_path = out_path or (in_path + ".jsonl")
+        done = _load_done_keys(out_path)
+        append = True
+        if done:
+            print(f"Resuming: {len(done)} rows already in {out_path}", file=sys.stderr)
+            rows = ((i, row) for i, row in rows if _row_key(row) not in done)
+            if total is not None:
+                total = max(0, total - len(done))
     progress_every = int(os.getenv("PROGRESS_EVERY", "100"))
     start_time = time.time()
     n_workers = int(os.getenv("N_WORKERS", "1"))
@@ -346,45 +829,72 @@ def _cli_process_file(
     if not to_stdout:
         out_path = out_path or (in_path + ".jsonl")
         mode = "a" if append else "w"
-        sink = open(out_path, mode, encoding="utf-8")
+        sink = open(out_path, mode, encoding="utf-8", buffering=1 << 20 if unordered else -1)
 
     assert sink is not None  # for type-checkers
 
+    pool = None
+    run_metrics = Metrics()
+    task = partial(_cli_task, record_index=unordered)
+    fast_rows = 0
+    idx = 0
     try:
         if n_workers > 1:
+            # Resolve the model once in the parent so workers mmap the same
+            # file instead of racing the download, and split the thread budget.
+            model_path = _resolve_model_path()
+            n_threads = _threads_per_worker(n_workers)
+            print(
+                f"Starting {n_workers} workers x {n_threads} threads "
+                f"(mmap={'on' if USE_MMAP else 'off'})",
+                file=sys.stderr,
+            )
             ctx = mp.get_context("spawn")
-            with ctx.Pool(processes=n_workers) as pool:
-                for idx, row in enumerate(pool.imap(_process_row, rows, chunksize=1), start=1):
-                    json.dump(row, sink, ensure_ascii=False)
-                    sink.write("\n")
-                    sink.flush()
-                    if progress_every > 0 and (idx == 1 or idx % progress_every == 0 or idx == total):
-                        elapsed = time.time() - start_time
-                        rate = idx / elapsed if elapsed > 0 else 0.0
-                        remaining = (total - idx) / rate if rate > 0 else 0.0
-                        print(
-                            f"[{idx}/{total}] {rate:.2f} rows/s, ETA {remaining/60:.1f} min",
-                            file=sys.stderr,
-                        )
+            pool = ctx.Pool(
+                processes=n_workers,
+                initializer=_init_worker,
+                initargs=(model_path, n_threads),
+            )
+            if unordered:
+                chunksize = _unordered_chunksize(total, n_workers)
+                results = pool.imap_unordered(task, rows, chunksize=chunksize)
+            else:
+                results = pool.imap(task, rows, chunksize=1)
         else:
-            for idx, row in enumerate(rows, start=1):
-                row = _process_row(row)
-
-                json.dump(row, sink, ensure_ascii=False)
-                sink.write("\n")
+            results = map(task, rows)
+
+        last_flush = time.time()
+        for idx, (row, fast_path, row_metrics) in enumerate(results, start=1):
+            fast_rows += fast_path
+            run_metrics.merge(row_metrics)
+            json.dump(row, sink, ensure_ascii=False)
+            sink.write("\n")
+            if not unordered:
+                sink.flush()
+            elif time.time() - last_flush >= FLUSH_SECONDS:
                 sink.flush()
-                if progress_every > 0 and (idx == 1 or idx % progress_every == 0 or idx == total):
-                    elapsed = time.time() - start_time
-                    rate = idx / elapsed if elapsed > 0 else 0.0
+                last_flush = time.time()
+            if progress_every > 0 and (idx == 1 or idx % progress_every == 0 or idx == total):
+                elapsed = time.time() - start_time
+                rate = idx / elapsed if elapsed > 0 else 0.0
+                if total is None:
+                    position, eta = f"{idx}", ""
+                else:
                     remaining = (total - idx) / rate if rate > 0 else 0.0
-                    print(
-                        f"[{idx}/{total}] {rate:.2f} rows/s, ETA {remaining/60:.1f} min",
-                        file=sys.stderr,
-                    )
+                    position, eta = f"{idx}/{total}", f", ETA {remaining/60:.1f} min"
+                print(
+                    f"[{position}] {rate:.2f} rows/s{eta}, fast path {fast_rows / idx:.1%}",
+                    file=sys.stderr,
+                )
     finally:
+        if pool is not None:
+            pool.terminate()
         if sink is not sys.stdout:
             sink.close()
 
+    if idx:
+        print(run_metrics.summary(), file=sys.stderr)
+
 
 if __name__ == "__main__":
     import argparse
@@ -394,9 +904,15 @@ if __name__ == "__main__":
     )
     parser.add_argument(
         "--file",
-        help="Path to JSON input (list of rows or {'rows': [...]})",
+        help="Path to JSON input (list of rows, NDJSON, or {'rows': [...]}); "
+        "arrays and NDJSON are streamed row by row.",
         default=None,
     )
+    parser.add_argument(
+        "--download-model",
+        action="store_true",
+        help="Download MODEL_FILE from MODEL_REPO into MODEL_DIR, record its checksum, and exit.",
+    )
     parser.add_argument(
         "--serve",
         action="store_true",
@@ -413,6 +929,17 @@ if __name__ == "__main__":
         action="store_true",
         help="Append to the output file instead of overwriting.",
     )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Skip rows already in the output JSONL (by URL or row hash) and append the rest.",
+    )
+    parser.add_argument(
+        "--unordered",
+        action="store_true",
+        help="Write rows as workers finish them (adds row_index for reordering); "
+        "uses larger pool chunks and buffered writes.",
+    )
     parser.add_argument(
         "--stdout",
         action="store_true",
@@ -429,9 +956,15 @@ if __name__ == "__main__":
         help="Path for the JSON array output (defaults to the JSONL output path).",
     )
     args = parser.parse_args()
+    if args.resume and args.stdout:
+        parser.error("--resume needs a file output; it cannot be combined with --stdout")
 
-    if args.serve or args.file is None:
+    if args.download_model:
+        print(_download_model())
+    elif args.serve or args.file is None:
         port = int(os.getenv("PORT", "8000"))
+        if os.getenv("WARM_START", "1") != "0":
+            start_background_warmup()
         app.run(host="0.0.0.0", port=port, debug=False)
     else:
         _cli_process_file(
@@ -439,16 +972,12 @@ if __name__ == "__main__":
             out_path=args.out,
             append=bool(args.append),
             to_stdout=bool(args.stdout),
+            resume=bool(args.resume),
+            unordered=bool(args.unordered),
         )
         if not args.stdout and not sys.stdout.isatty():
             jsonl_path = args.out or (args.file + ".jsonl")
-            rows_list: List[Dict[str, Any]] = []
-            with open(jsonl_path, "r", encoding="utf-8") as f:
-                for line in f:
-                    line = line.strip()
-                    if line:
-                        rows_list.append(json.loads(line))
-            json.dump(rows_list, sys.stdout, ensure_ascii=False, indent=2)
+            _write_json_array(jsonl_path, sys.stdout)
             sys.stdout.write("\n")
         if args.json_array and not args.stdout:
             if args.out and args.out.lower().endswith(".json"):
@@ -463,11 +992,5 @@ if __name__ == "__main__":
                     array_out = args.json_array_out or jsonl_path[:-1]
                 else:
                     array_out = args.json_array_out or (jsonl_path + ".json")
-            rows_list: List[Dict[str, Any]] = []
-            with open(jsonl_path, "r", encoding="utf-8") as f:
-                for line in f:
-                    line = line.strip()
-                    if line:
-                        rows_list.append(json.loads(line))
             with open(array_out, "w", encoding="utf-8") as f:
-                json.dump(rows_list, f, ensure_ascii=False, indent=2)
+                _write_json_array(jsonl_path, f)
@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+"""Microbenchmark for the post-LLM normalization step.
+
+Replays the raw ``program``/``university`` strings from ``out.json`` through
+``_post_normalize_program`` and ``_post_normalize_university`` and compares:
+
+- ``baseline``: list membership, uncompiled ``re`` calls and a full
+  ``difflib.get_close_matches`` scan per value (the original implementation);
+- ``cold``: the import-time engine with every memo cleared before the pass;
+- ``warm``: the engine with memos populated, as in a long CLI run.
+
+Usage::
+
+    python bench_normalize.py [--data out.json] [--repeat 3]
+"""
+
+from __future__ import annotations
+
+import argparse
+import difflib
+import json
+import re
+import time
+from typing import Callable, List
+
+import app
+
+
+def _baseline_program(prog: str) -> str:
+    """Reference copy of the original list/uncompiled-regex program path."""
+    p = (prog or "").strip()
+    for pattern, _label in app.DEGREE_PATTERNS:
+        p = re.sub(pattern, "", p)
+    p = re.sub(r"\s+", " ", p).strip(" ,-/")
+    p = app.COMMON_PROG_FIXES.get(p, p)
+    p = p.title()
+    if p in app.CANON_PROGS:
+        return p
+    match = difflib.get_close_matches(p, app.CANON_PROGS, n=1, cutoff=0.84)
+    return match[0] if match and p else p
+
+
+def _baseline_university(uni: str) -> str:
+    """Reference copy of the original list/uncompiled-regex university path."""
+    u = (uni or "").strip()
+    for pat, full in app.ABBREV_UNI.items():
+        if re.fullmatch(pat, u):
+            u = full
+            break
+    u = app.COMMON_UNI_FIXES.get(u, u)
+    if u:
+        u = re.sub(r"\bOf\b", "of", u.title())
+    if u in app.CANON_UNIS:
+        return u
+    match = difflib.get_close_matches(u, app.CANON_UNIS, n=1, cutoff=0.86)
+    return (match[0] if match and u else u) or ""
+
+
+def _clear_caches() -> None:
+    """Drop every memo so the next pass measures first-seen values."""
+    app._post_normalize_program.cache_clear()
+    app._post_normalize_university.cache_clear()
+    app.PROG_INDEX._cache.clear()
+    app.UNI_INDEX._cache.clear()
+
+
+def _time_pass(progs: List[str], unis: List[str], prog_fn: Callable, uni_fn: Callable) -> float:
+    """Return seconds spent normalizing every program and university once."""
+    start = time.perf_counter()
+    for value in progs:
+        prog_fn(value)
+    for value in unis:
+        uni_fn(value)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    """Run each variant ``--repeat`` times and print the best pass."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--data", default="out.json")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with open(args.data, "r", encoding="utf-8") as f:
+        rows = app._normalize_input(json.load(f))
+    progs = [r.get("program") or "" for r in rows]
+    unis = [r.get("university") or "" for r in rows]
+    n = len(progs) + len(unis)
+
+    results = {}
+    results["baseline"] = min(
+        _time_pass(progs, unis, _baseline_program, _baseline_university)
+        for _ in range(args.repeat)
+    )
+    cold = []
+    for _ in range(args.repeat):
+        _clear_caches()
+        cold.append(
+            _time_pass(progs, unis, app._post_normalize_program, app._post_normalize_university)
+        )
+    results["cold"] = min(cold)
+    results["warm"] = min(
+        _time_pass(progs, unis, app._post_normalize_program, app._post_normalize_university)
+        for _ in range(args.repeat)
+    )
+
+    print(f"{n} values from {args.data}")
+    for name, secs in results.items():
+        speedup = results["baseline"] / secs if secs > 0 else float("inf")
+        print(f"{name:>8}: {secs * 1e3:9.1f} ms  {n / secs:12.0f} values/s  x{speedup:.1f}")
+
+
+if __name__ == "__main__":
+    main()
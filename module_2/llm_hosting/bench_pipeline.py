@@ -0,0 +1,168 @@
+# -*- coding: utf-8 -*-
+"""End-to-end benchmark for ``_process_row`` over a fixed corpus slice.
+
+Replays rows ``[--offset, --offset + --limit)`` of ``applicant_data.json.jsonl``
+(LLM output fields removed) through ``app._process_row`` and reports:
+
+- rows/s and p50/p95 per-row latency;
+- the normalization cache hit rate and the rules-first fast-path share;
+- agreement of program/university with the ``out.json`` reference, joined on
+  ``overview_url``.
+
+Two modes share the same slice:
+
+- ``stub``: ``_call_llm`` is replaced by the deterministic split fallback, so
+  the numbers are pure pipeline overhead and need no model;
+- ``model``: the real local GGUF (resolved offline from ``MODEL_DIR``).
+
+Every mode starts from cold caches. Usage::
+
+    python bench_pipeline.py [--mode stub|model|both] [--limit 500] [--offset 0]
+"""
+
+from __future__ import annotations
+
+import argparse
+import itertools
+import time
+from typing import Any, Callable, Dict, List, Tuple
+
+import app
+from bench_normalize import _clear_caches
+from metrics import Metrics
+
+LLM_FIELDS = ("llm-generated-program", "llm-generated-university")
+
+
+def _stub_llm(program_text: str) -> Dict[str, str]:
+    """Deterministic stand-in for ``_call_llm``: split fallback plus normalization."""
+    app.METRICS.add(llm_calls=1)
+    prog, uni = app._split_fallback(program_text)
+    return {
+        "standardized_program": app._post_normalize_program(prog),
+        "standardized_university": app._post_normalize_university(uni),
+    }
+
+
+def load_slice(path: str, offset: int, limit: int) -> List[Dict[str, Any]]:
+    """Return a fixed slice of input rows with any LLM output fields dropped."""
+    rows = itertools.islice(app._iter_input_rows(path), offset, offset + limit)
+    return [{k: v for k, v in row.items() if k not in LLM_FIELDS} for row in rows]
+
+
+def load_reference(path: str) -> Dict[str, Tuple[str, str]]:
+    """Map each reference row's key to its (program, university) answer."""
+    return {
+        app._row_key(row): (row.get(LLM_FIELDS[0]) or "", row.get(LLM_FIELDS[1]) or "")
+        for row in app._iter_input_rows(path)
+    }
+
+
+def percentile(values: List[float], q: float) -> float:
+    """Return the nearest-rank ``q`` percentile (0-100) of ``values``."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, -(-len(ordered) * q // 100))
+    return ordered[int(rank) - 1]
+
+
+def _cache_counts() -> Tuple[int, int]:
+    """Return combined (hits, misses) of the normalization memos."""
+    infos = (app._post_normalize_program.cache_info(), app._post_normalize_university.cache_info())
+    return sum(i.hits for i in infos), sum(i.misses for i in infos)
+
+
+def run(
+    rows: List[Dict[str, Any]],
+    reference: Dict[str, Tuple[str, str]],
+    call_llm: Callable[[str], Dict[str, str]] | None = None,
+) -> Dict[str, Any]:
+    """Process ``rows`` from cold caches and return the benchmark report.
+
+    ``call_llm`` replaces ``app._call_llm`` for the run when given.
+    """
+    original_llm, original_metrics = app._call_llm, app.METRICS
+    _clear_caches()
+    app.METRICS = metrics = Metrics()
+    if call_llm is not None:
+        app._call_llm = call_llm
+    latencies: List[float] = []
+    outputs: List[Dict[str, Any]] = []
+    try:
+        start = time.perf_counter()
+        for row in rows:
+            row_start = time.perf_counter()
+            outputs.append(app._process_row(dict(row)))
+            latencies.append(time.perf_counter() - row_start)
+        elapsed = time.perf_counter() - start
+    finally:
+        app._call_llm, app.METRICS = original_llm, original_metrics
+    hits, misses = _cache_counts()
+
+    compared = program_ok = university_ok = both_ok = 0
+    for out in outputs:
+        expected = reference.get(app._row_key(out))
+        if expected is None:
+            continue
+        compared += 1
+        prog_match = out.get(LLM_FIELDS[0], "") == expected[0]
+        uni_match = out.get(LLM_FIELDS[1], "") == expected[1]
+        program_ok += prog_match
+        university_ok += uni_match
+        both_ok += prog_match and uni_match
+
+    counters = metrics.snapshot()
+    return {
+        "rows": len(rows),
+        "seconds": elapsed,
+        "rows_per_s": len(rows) / elapsed if elapsed else 0.0,
+        "p50_ms": 1000 * percentile(latencies, 50),
+        "p95_ms": 1000 * percentile(latencies, 95),
+        "cache_hit_rate": hits / (hits + misses) if hits + misses else 0.0,
+        "fast_path_fraction": counters["fast_path_rows"] / len(rows) if rows else 0.0,
+        "llm_calls": counters["llm_calls"],
+        "compared": compared,
+        "program_agreement": program_ok / compared if compared else 0.0,
+        "university_agreement": university_ok / compared if compared else 0.0,
+        "both_agreement": both_ok / compared if compared else 0.0,
+    }
+
+
+def format_report(name: str, r: Dict[str, Any]) -> str:
+    """Return a one-block, human-readable summary of a :func:`run` report."""
+    return "\n".join(
+        [
+            f"[{name}] {r['rows']} rows in {r['seconds']:.2f}s "
+            f"({r['rows_per_s']:.1f} rows/s), p50 {r['p50_ms']:.2f} ms, p95 {r['p95_ms']:.2f} ms",
+            f"  cache hit rate {r['cache_hit_rate']:.1%}, fast path {r['fast_path_fraction']:.1%}, "
+            f"LLM calls {r['llm_calls']}",
+            f"  agreement with reference ({r['compared']} rows): program "
+            f"{r['program_agreement']:.1%}, university {r['university_agreement']:.1%}, "
+            f"both {r['both_agreement']:.1%}",
+        ]
+    )
+
+
+def main() -> None:
+    """Run the requested modes over the same slice and print each report."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--data", default="../applicant_data.json.jsonl")
+    parser.add_argument("--reference", default="out.json")
+    parser.add_argument("--offset", type=int, default=0)
+    parser.add_argument("--limit", type=int, default=500)
+    parser.add_argument("--mode", choices=("stub", "model", "both"), default="stub")
+    args = parser.parse_args()
+
+    rows = load_slice(args.data, args.offset, args.limit)
+    reference = load_reference(args.reference)
+    print(f"{len(rows)} rows from {args.data} [{args.offset}:{args.offset + args.limit}]")
+    if args.mode in ("stub", "both"):
+        print(format_report("stub", run(rows, reference, call_llm=_stub_llm)))
+    if args.mode in ("model", "both"):
+        app._load_llm()  # keep model load time out of the per-row numbers
+        print(format_report("model", run(rows, reference)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+"""Prebuilt fuzzy index with ``difflib.get_close_matches`` semantics.
+
+``get_close_matches`` walks every candidate in Python on every call. The index
+below keeps candidate lengths and character counts in NumPy arrays, so difflib's own upper bounds (``real_quick_ratio`` and
+``quick_ratio``) are evaluated for all candidates in a single vectorized step.
+The exact ``SequenceMatcher.ratio`` then only runs on the few survivors, best
+bound first, until no remaining candidate can win. Results, including
+tie-breaks, match ``difflib`` exactly. The arrays (and NumPy itself) are only
+built on the first lookup that needs them, so importing and constructing an
+index stays cheap.
+"""
+
+from __future__ import annotations
+
+import difflib
+from typing import TYPE_CHECKING, Dict, Iterable, List, Tuple
+
+if TYPE_CHECKING:
+    import numpy as np
+
+# Bound the per-index memo so long CLI runs cannot grow it without limit.
+CACHE_MAX = 50_000
+
+
+class FuzzyIndex:
+    """Vectorized candidate index answering best-match lookups."""
+
+    def __init__(self, candidates: Iterable[str]) -> None:
+        self.candidates: List[str] = list(candidates)
+        self._exact = set(self.candidates)
+        self._cache: Dict[Tuple[str, float], str | None] = {}
+        self._column: Dict[str, int] = {}
+        self._lengths: np.ndarray | None = None
+        self._counts: np.ndarray | None = None
+
+    def _build(self) -> None:
+        """Build the length vector and per-candidate character-count matrix."""
+        import numpy as np
+
+        alphabet = sorted({ch for cand in self.candidates for ch in cand})
+        self._column = {ch: i for i, ch in enumerate(alphabet)}
+        counts = np.zeros((len(self.candidates), len(alphabet)), dtype=np.int32)
+        for row, cand in enumerate(self.candidates):
+            for ch in cand:
+                counts[row, self._column[ch]] += 1
+        self._counts = counts
+        self._lengths = np.array([len(c) for c in self.candidates], dtype=np.int64)
+
+    def __len__(self) -> int:
+        return len(self.candidates)
+
+    def best_match(self, name: str, cutoff: float = 0.6) -> str | None:
+        """Return the best candidate scoring ``>= cutoff``, or ``None``."""
+        if not name or not self.candidates:
+            return None
+        # An exact hit scores 1.0, which no other candidate can reach.
+        if name in self._exact:
+            return name
+        key = (name, cutoff)
+        if key in self._cache:
+            return self._cache[key]
+        if len(self._cache) >= CACHE_MAX:
+            self._cache.clear()
+        result = self._search(name, cutoff)
+        self._cache[key] = result
+        return result
+
+    def _upper_bounds(self, name: str) -> np.ndarray:
+        """Return ``quick_ratio`` for every candidate against ``name``."""
+        import numpy as np
+
+        if self._counts is None:
+            self._build()
+        query = np.zeros(self._counts.shape[1], dtype=np.int32)
+        for ch in name:
+            col = self._column.get(ch)
+            # Characters no candidate contains can never be matched.
+            if col is not None:
+                query[col] += 1
+        matches = np.minimum(self._counts, query).sum(axis=1)
+        # Same arithmetic as difflib's _calculate_ratio, so bounds agree exactly.
+        return 2.0 * matches / (self._lengths + len(name))
+
+    def _search(self, name: str, cutoff: float) -> str | None:
+        """Score only candidates whose upper bounds can reach the cutoff."""
+        import numpy as np
+
+        bounds = self._upper_bounds(name)
+        survivors = np.flatnonzero(bounds >= cutoff)
+        if survivors.size == 0:
+            return None
+
+        matcher = difflib.SequenceMatcher()
+        matcher.set_seq2(name)
+        best: Tuple[float, str] | None = None
+        # Highest upper bound first; stop once nothing left can win.
+        for row in survivors[np.argsort(-bounds[survivors], kind="stable")]:
+            # Equal scores can still win the tie-break, so only stop on "<".
+            if best is not None and bounds[row] < best[0]:
+                break
+            cand = self.candidates[row]
+            matcher.set_seq1(cand)
+            score = matcher.ratio()
+            # get_close_matches keeps the largest (score, candidate) tuple.
+            if score >= cutoff and (best is None or (score, cand) > best):
+                best = (score, cand)
+        return best[1] if best else None
@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+"""In-process background jobs for large standardization requests.
+
+A :class:`JobStore` runs submitted batches on a small thread pool and keeps
+each job's finished rows in order, so clients can poll progress or stream
+results while the batch is still running. Finished jobs are kept for a
+bounded time (``ttl``) and then dropped.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterator, List
+
+Row = Dict[str, Any]
+
+
+class Job:
+    """One submitted batch: its input, finished rows, and lifecycle state."""
+
+    def __init__(self, rows: List[Row]) -> None:
+        self.id = uuid.uuid4().hex
+        self.rows = rows
+        self.total = len(rows)
+        self.results: List[Row] = []
+        self.status = "queued"
+        self.error = ""
+        self.created = time.time()
+        self.finished: float | None = None
+        self.changed = threading.Condition()
+
+    def info(self) -> Dict[str, Any]:
+        """Return a JSON-ready status summary."""
+        with self.changed:
+            return {
+                "job_id": self.id,
+                "status": self.status,
+                "total": self.total,
+                "done": len(self.results),
+                "error": self.error,
+            }
+
+    def _set(self, **fields: Any) -> None:
+        with self.changed:
+            for name, value in fields.items():
+                setattr(self, name, value)
+            self.changed.notify_all()
+
+    def run(self, process: Callable[[Row], Row]) -> None:
+        """Process every row in order, publishing each result as it finishes."""
+        self._set(status="running")
+        try:
+            for row in self.rows:
+                out = process(row)
+                with self.changed:
+                    self.results.append(out)
+                    self.changed.notify_all()
+        except Exception as exc:
+            self._set(status="failed", error=str(exc), finished=time.time())
+            return
+        # Drop the input once processed; results hold the rows now.
+        self._set(status="done", finished=time.time(), rows=[])
+
+    def stream(self, start: int = 0, wait: bool = True, poll: float = 1.0) -> Iterator[Row]:
+        """Yield finished rows from ``start``; with ``wait``, follow until the job ends."""
+        index = start
+        while True:
+            with self.changed:
+                while wait and index >= len(self.results) and self.finished is None:
+                    self.changed.wait(timeout=poll)
+                ready = self.results[index:]
+                finished = self.finished is not None
+            yield from ready
+            index += len(ready)
+            if finished or not wait:
+                return
+
+
+class JobStore:
+    """Thread pool plus a TTL-bounded registry of jobs."""
+
+    def __init__(self, workers: int = 1, ttl: float = 3600.0) -> None:
+        self.ttl = ttl
+        self._jobs: Dict[str, Job] = {}
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="job")
+
+    def submit(self, rows: List[Row], process: Callable[[Row], Row]) -> Job:
+        """Queue ``rows`` for background processing and return the job."""
+        self.purge()
+        job = Job(rows)
+        with self._lock:
+            self._jobs[job.id] = job
+        self._pool.submit(job.run, process)
+        return job
+
+    def get(self, job_id: str) -> Job | None:
+        """Return a live or recently finished job, or ``None`` once expired."""
+        self.purge()
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def purge(self, now: float | None = None) -> None:
+        """Forget jobs that finished more than ``ttl`` seconds ago."""
+        now = time.time() if now is None else now
+        with self._lock:
+            expired = [
+                job_id
+                for job_id, job in self._jobs.items()
+                if job.finished is not None and now - job.finished > self.ttl
+            ]
+            for job_id in expired:
+                del self._jobs[job_id]
@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+"""Per-stage counters and timers for the standardizer.
+
+One :class:`Metrics` instance per process collects counters from every stage
+(rules-first fast path, LLM prompt evaluation and generation, JSON parsing,
+fuzzy matching). Pool workers :meth:`Metrics.drain` their counters after each
+row and the parent merges them, so a CLI run reports totals across workers.
+"""
+
+from __future__ import annotations
+
+import threading
+from typing import Any, Dict
+
+FIELDS = (
+    "rows",
+    "row_s",
+    "fast_path_rows",
+    "llm_calls",
+    "llm_s",
+    "prompt_tokens",
+    "completion_tokens",
+    "prompt_eval_s",
+    "generation_s",
+    "json_failures",
+    "truncated_calls",
+    "fuzzy_calls",
+    "fuzzy_s",
+)
+
+
+def _ratio(num: float, den: float) -> float:
+    """Return ``num / den`` rounded for reporting, or 0.0 when ``den`` is 0."""
+    return round(num / den, 4) if den else 0.0
+
+
+class Metrics:
+    """Thread-safe additive counters (ints) and timers (seconds)."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._values: Dict[str, float] = dict.fromkeys(FIELDS, 0)
+
+    def add(self, **deltas: float) -> None:
+        """Increment the named counters."""
+        with self._lock:
+            for name, delta in deltas.items():
+                self._values[name] += delta
+
+    def merge(self, values: Dict[str, float]) -> None:
+        """Add a snapshot (e.g. drained from a worker) into these counters."""
+        self.add(**values)
+
+    def snapshot(self) -> Dict[str, float]:
+        """Return a copy of the raw counters."""
+        with self._lock:
+            return dict(self._values)
+
+    def drain(self) -> Dict[str, float]:
+        """Return the raw counters and reset them to zero."""
+        with self._lock:
+            values = self._values
+            self._values = dict.fromkeys(FIELDS, 0)
+        return values
+
+    def report(self) -> Dict[str, Any]:
+        """Return raw counters plus derived rates for the JSON/CLI reports."""
+        v = self.snapshot()
+        return {
+            "counters": {k: round(x, 4) if isinstance(x, float) else x for k, x in v.items()},
+            "rows_per_s": _ratio(v["rows"], v["row_s"]),
+            "fast_path_fraction": _ratio(v["fast_path_rows"], v["rows"]),
+            "json_failure_rate": _ratio(v["json_failures"], v["llm_calls"]),
+            "prompt_tokens_per_s": _ratio(v["prompt_tokens"], v["prompt_eval_s"]),
+            "generation_tokens_per_s": _ratio(v["completion_tokens"], v["generation_s"]),
+            "completion_tokens_per_call": _ratio(v["completion_tokens"], v["llm_calls"]),
+            "avg_llm_ms": _ratio(1000 * v["llm_s"], v["llm_calls"]),
+            "avg_fuzzy_ms": _ratio(1000 * v["fuzzy_s"], v["fuzzy_calls"]),
+        }
+
+    def summary(self) -> str:
+        """Return a multi-line, human-readable stage breakdown."""
+        r = self.report()
+        c = r["counters"]
+        return "\n".join(
+            [
+                f"Rows: {c['rows']} in {c['row_s']:.1f}s of worker time "
+                f"({r['rows_per_s']:.2f} rows/s per worker)",
+                f"Fast path: {c['fast_path_rows']} rows ({r['fast_path_fraction']:.1%})",
+                f"LLM: {c['llm_calls']} calls, {r['avg_llm_ms']:.0f} ms avg, "
+                f"JSON failures {c['json_failures']} ({r['json_failure_rate']:.1%}), "
+                f"hit max_tokens {c['truncated_calls']}",
+                f"  prompt eval: {c['prompt_tokens']} tokens in {c['prompt_eval_s']:.1f}s "
+                f"({r['prompt_tokens_per_s']:.1f} tok/s)",
+                f"  generation: {c['completion_tokens']} tokens in {c['generation_s']:.1f}s "
+                f"({r['generation_tokens_per_s']:.1f} tok/s, "
+                f"{r['completion_tokens_per_call']:.1f} per call)",
+                f"Fuzzy match: {c['fuzzy_calls']} lookups in {c['fuzzy_s']:.3f}s "
+                f"({r['avg_fuzzy_ms']:.3f} ms avg)",
+            ]
+        )
@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+"""Local GGUF model registry: resolve, validate once, and download explicitly.
+
+Models live in one directory (``MODEL_DIR``). ``registry.json`` in that
+directory records each file's SHA-256 together with the size and mtime it was
+computed for, so a file is hashed once and later starts only ``stat`` it.
+Resolution never touches the network; :func:`download` is the separate,
+explicit step that fetches a file from the Hugging Face Hub.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from typing import Dict
+
+REGISTRY_FILE = "registry.json"
+HASH_CHUNK = 1 << 20
+
+
+class ModelNotFoundError(FileNotFoundError):
+    """Raised when no local model matches the requested file or checksum."""
+
+
+def _sha256(path: str) -> str:
+    """Hash a file in chunks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _read_registry(model_dir: str) -> Dict[str, Dict[str, object]]:
+    """Return the registry entries, or an empty registry if none exists."""
+    try:
+        with open(os.path.join(model_dir, REGISTRY_FILE), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def _write_registry(model_dir: str, entries: Dict[str, Dict[str, object]]) -> None:
+    """Atomically replace the registry file."""
+    path = os.path.join(model_dir, REGISTRY_FILE)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(entries, f, indent=2, sort_keys=True)
+    os.replace(tmp, path)
+
+
+def checksum(model_dir: str, filename: str) -> str:
+    """Return the SHA-256 of a model file, hashing only if it changed."""
+    path = os.path.join(model_dir, filename)
+    stat = os.stat(path)
+    entries = _read_registry(model_dir)
+    entry = entries.get(filename)
+    if entry and entry.get("size") == stat.st_size and entry.get("mtime") == stat.st_mtime:
+        return str(entry["sha256"])
+    digest = _sha256(path)
+    entries[filename] = {"sha256": digest, "size": stat.st_size, "mtime": stat.st_mtime}
+    _write_registry(model_dir, entries)
+    return digest
+
+
+def resolve(model_dir: str, filename: str, sha256: str = "") -> str:
+    """Return the local path of a validated model without any network access.
+
+    With ``sha256`` the model is selected by checksum: ``filename`` is tried
+    first, then every other ``*.gguf`` in ``model_dir``. Without it,
+    ``filename`` must exist.
+    """
+    names = [filename]
+    if sha256 and os.path.isdir(model_dir):
+        names += sorted(n for n in os.listdir(model_dir) if n.endswith(".gguf") and n != filename)
+    for name in names:
+        if not os.path.isfile(os.path.join(model_dir, name)):
+            continue
+        if not sha256 or checksum(model_dir, name) == sha256.lower():
+            return os.path.join(model_dir, name)
+    wanted = f"sha256 {sha256}" if sha256 else filename
+    raise ModelNotFoundError(
+        f"No local model matching {wanted} in {model_dir!r}; "
+        "run `python app.py --download-model` first."
+    )
+
+
+def download(repo_id: str, filename: str, model_dir: str, sha256: str = "") -> str:
+    """Fetch a model from the Hugging Face Hub into ``model_dir`` and register it."""
+    from huggingface_hub import hf_hub_download
+
+    os.makedirs(model_dir, exist_ok=True)
+    path = hf_hub_download(repo_id=repo_id, filename=filename, local_dir=model_dir)
+    digest = checksum(model_dir, os.path.basename(path))
+    if sha256 and digest != sha256.lower():
+        raise ValueError(f"Checksum mismatch for {path}: expected {sha256}, got {digest}")
+    return path
@@ -0,0 +1,51 @@
+"""Tests for the deterministic end-to-end pipeline benchmark."""
+
+import json
+
+import app
+import bench_pipeline
+
+
+def test_percentile_nearest_rank():
+    """Ensure percentiles use nearest rank and handle empty input."""
+    values = [float(v) for v in range(1, 21)]
+    assert bench_pipeline.percentile(values, 50) == 10.0
+    assert bench_pipeline.percentile(values, 95) == 19.0
+    assert bench_pipeline.percentile([], 95) == 0.0
+
+
+def test_stub_run_is_deterministic_and_scored(tmp_path):
+    """Ensure a stubbed run strips old answers, restores the LLM and scores agreement."""
+    rows = bench_pipeline.load_slice("sample_data.json.jsonl", 0, 3)
+    assert len(rows) == 3
+    assert all("llm-generated-program" not in row for row in rows)
+
+    reference = tmp_path / "reference.json"
+    reference.write_text(
+        json.dumps(
+            [
+                {
+                    "url": rows[0]["url"],
+                    "llm-generated-program": "Information Studies",
+                    "llm-generated-university": "McGill University",
+                },
+                {"url": rows[1]["url"], "llm-generated-program": "Wrong"},
+            ]
+        ),
+        encoding="utf-8",
+    )
+    original_llm = app._call_llm
+
+    first = bench_pipeline.run(rows, bench_pipeline.load_reference(str(reference)), bench_pipeline._stub_llm)
+    second = bench_pipeline.run(rows, bench_pipeline.load_reference(str(reference)), bench_pipeline._stub_llm)
+
+    assert app._call_llm is original_llm
+    assert first["rows"] == 3 and first["compared"] == 2
+    assert first["program_agreement"] == 0.5
+    assert first["llm_calls"] + round(first["fast_path_fraction"] * 3) == 3
+    # Both runs start from cold caches, so everything but timing repeats.
+    timing = {"seconds", "rows_per_s", "p50_ms", "p95_ms"}
+    assert {k: v for k, v in first.items() if k not in timing} == {
+        k: v for k, v in second.items() if k not in timing
+    }
+    assert "agreement with reference (2 rows)" in bench_pipeline.format_report("stub", first)
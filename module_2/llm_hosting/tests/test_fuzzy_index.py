@@ -0,0 +1,68 @@
+"""Parity tests for the prebuilt fuzzy index against ``difflib``."""
+
+import difflib
+from pathlib import Path
+
+import pytest
+
+from fuzzy_index import FuzzyIndex
+
+HERE = Path(__file__).resolve().parent.parent
+
+
+def _read(name):
+    with open(HERE / name, encoding="utf-8") as handle:
+        return [ln.strip() for ln in handle if ln.strip()]
+
+
+def _perturb(text):
+    """Yield deterministic near-misses: drops, swaps, case and suffix edits."""
+    yield text
+    yield text.lower()
+    yield text.title()
+    yield text + "s"
+    yield text[:-2]
+    for i in range(0, len(text), max(1, len(text) // 4)):
+        yield text[:i] + text[i + 1:]
+        if i + 1 < len(text):
+            yield text[:i] + text[i + 1] + text[i] + text[i + 2:]
+
+
+def _difflib_best(name, candidates, cutoff):
+    if not name or not candidates:
+        return None
+    matches = difflib.get_close_matches(name, candidates, n=1, cutoff=cutoff)
+    return matches[0] if matches else None
+
+
+@pytest.mark.parametrize(
+    "canon_file, cutoff",
+    [("canon_programs.txt", 0.84), ("canon_universities.txt", 0.86)],
+)
+def test_best_match_matches_difflib(canon_file, cutoff):
+    """Ensure every lookup returns exactly what get_close_matches returns."""
+    candidates = _read(canon_file)
+    index = FuzzyIndex(candidates)
+    queries = set()
+    for cand in candidates[::20]:
+        queries.update(_perturb(cand))
+    queries.update(["", "x", "Unknown Program", "University of Nowhere", "Mathematic"])
+    for query in sorted(queries):
+        assert index.best_match(query, cutoff=cutoff) == _difflib_best(
+            query, candidates, cutoff
+        ), query
+
+
+def test_best_match_breaks_ties_like_difflib():
+    """Ensure equal scores resolve to the same candidate as difflib."""
+    candidates = ["abcx", "abcy", "abcz"]
+    index = FuzzyIndex(candidates)
+    assert index.best_match("abcd", cutoff=0.7) == _difflib_best("abcd", candidates, 0.7)
+    # A repeated lookup is served from the memo with the same answer.
+    assert index.best_match("abcd", cutoff=0.7) == "abcz"
+
+
+def test_best_match_handles_empty_inputs():
+    """Ensure empty names and empty indexes return ``None``."""
+    assert FuzzyIndex([]).best_match("Physics") is None
+    assert FuzzyIndex(["Physics"]).best_match("") is None
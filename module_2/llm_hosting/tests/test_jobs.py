@@ -0,0 +1,95 @@
+"""Tests for the background job API and its TTL-bounded store."""
+
+import json
+import threading
+
+import app
+from jobs import JobStore
+
+
+def _fake_llm(program_text):
+    return {"standardized_program": program_text.upper(), "standardized_university": ""}
+
+
+def test_job_lifecycle_polls_and_streams_ndjson(monkeypatch):
+    """Ensure a submitted job can be polled and its rows streamed in order."""
+    monkeypatch.setattr(app, "_call_llm", _fake_llm)
+    monkeypatch.setattr(app, "JOBS", JobStore(workers=1, ttl=60))
+    client = app.app.test_client()
+    rows = [{"program": f"p{i}"} for i in range(5)]
+
+    response = client.post("/jobs", json={"rows": rows})
+    assert response.status_code == 202
+    body = response.get_json()
+    assert body["total"] == 5
+    assert response.headers["Location"] == body["status_url"]
+
+    streamed = client.get(body["results_url"])
+    assert streamed.mimetype == "application/x-ndjson"
+    out = [json.loads(line) for line in streamed.get_data(as_text=True).splitlines()]
+    assert [r["llm-generated-program"] for r in out] == [f"P{i}" for i in range(5)]
+
+    status = client.get(body["status_url"]).get_json()
+    assert status["status"] == "done" and status["done"] == 5
+    resumed = client.get(body["results_url"] + "?start=3&wait=0").get_data(as_text=True)
+    assert len(resumed.splitlines()) == 2
+
+
+def test_stream_follows_a_running_job():
+    """Ensure streaming yields rows as they finish while the job is still running."""
+    gate = threading.Event()
+
+    def slow(row):
+        if row["n"] == 1:
+            gate.wait(timeout=5)
+        return row
+
+    store = JobStore(workers=1, ttl=60)
+    job = store.submit([{"n": 0}, {"n": 1}], slow)
+    stream = job.stream(poll=0.05)
+    assert next(stream) == {"n": 0}
+    assert job.info()["status"] == "running"
+    gate.set()
+    assert list(stream) == [{"n": 1}]
+
+
+def test_failed_and_expired_jobs(monkeypatch):
+    """Ensure failures are reported and finished jobs expire after the TTL."""
+    def boom(_row):
+        raise RuntimeError("model crashed")
+
+    store = JobStore(workers=1, ttl=10)
+    job = store.submit([{"n": 0}], boom)
+    assert list(job.stream()) == []
+    assert job.info()["status"] == "failed"
+    assert job.info()["error"] == "model crashed"
+
+    store.purge(now=job.finished + 11)
+    assert store.get(job.id) is None
+    monkeypatch.setattr(app, "JOBS", store)
+    assert app.app.test_client().get(f"/jobs/{job.id}").status_code == 404
+
+
+def test_standardize_streams_ndjson_rows(monkeypatch):
+    """Ensure /standardize streams NDJSON on request and keeps JSON by default."""
+    calls = []
+
+    def fake(program_text):
+        calls.append(program_text)
+        return _fake_llm(program_text)
+
+    monkeypatch.setattr(app, "_call_llm", fake)
+    client = app.app.test_client()
+    rows = [{"program": "a"}, {"program": "b"}]
+
+    response = client.post("/standardize?stream=1", json=rows, buffered=False)
+    assert response.mimetype == "application/x-ndjson"
+    # The first line is sent before the second row is standardized.
+    assert calls == ["a"]
+    body = response.get_data(as_text=True)
+    assert [json.loads(line)["llm-generated-program"] for line in body.splitlines()] == ["A", "B"]
+
+    accept = client.post("/standardize", json=rows, headers={"Accept": "application/x-ndjson"})
+    assert accept.mimetype == "application/x-ndjson"
+    plain = client.post("/standardize", json=rows)
+    assert [r["llm-generated-program"] for r in plain.get_json()["rows"]] == ["A", "B"]
@@ -0,0 +1,40 @@
+"""Tests for grammar-constrained, bounded LLM generation."""
+
+import app
+from metrics import Metrics
+
+
+class CapturingLlama:
+    """Chat-completion stand-in that records the generation arguments."""
+
+    def __init__(self, content):
+        self.content = content
+        self.kwargs = {}
+
+    def create_chat_completion(self, **kwargs):
+        self.kwargs = kwargs
+        return {
+            "choices": [{"message": {"content": self.content}, "finish_reason": "stop"}],
+            "usage": {"prompt_tokens": 120, "completion_tokens": 20},
+        }
+
+
+def test_call_llm_uses_bounded_json_grammar(monkeypatch):
+    """Ensure generation is grammar-constrained and bounded by MAX_TOKENS."""
+    llm = CapturingLlama(
+        '{"standardized_program": "Data } Science", "standardized_university": ""}'
+    )
+    monkeypatch.setattr(app, "METRICS", Metrics())
+    monkeypatch.setattr(app, "_load_llm", lambda: llm)
+    app._call_llm("Data Science")
+
+    assert llm.kwargs["grammar"] is app._json_grammar() is not None
+    assert llm.kwargs["max_tokens"] == app.MAX_TOKENS
+    # A brace inside a value no longer truncates the parse.
+    assert app.METRICS.snapshot()["json_failures"] == 0
+
+
+def test_grammar_can_be_disabled(monkeypatch):
+    """Ensure JSON_GRAMMAR=0 restores free-text generation."""
+    monkeypatch.setattr(app, "JSON_GRAMMAR", False)
+    assert app._json_grammar() is None
@@ -0,0 +1,67 @@
+"""Tests for per-stage standardizer metrics and the /metrics endpoint."""
+
+import app
+from metrics import Metrics
+
+
+class FakeLlama:
+    """Minimal chat-completion stand-in that reports usage like llama.cpp."""
+
+    def __init__(self, content):
+        self.content = content
+
+    def create_chat_completion(self, logits_processor=None, **_kwargs):
+        for _token in range(3):
+            logits_processor([], [0.0])
+        return {
+            "choices": [{"message": {"content": self.content}}],
+            "usage": {"prompt_tokens": 120, "completion_tokens": 3},
+        }
+
+
+def test_call_llm_records_tokens_timings_and_json_failures(monkeypatch):
+    """Ensure LLM calls record token counts, phase timings and parse fallbacks."""
+    monkeypatch.setattr(app, "METRICS", Metrics())
+    monkeypatch.setattr(app, "_load_llm", lambda: FakeLlama("not json"))
+    app._call_llm("Physics, Nowhere College")
+    monkeypatch.setattr(
+        app,
+        "_load_llm",
+        lambda: FakeLlama('{"standardized_program": "Physics", "standardized_university": ""}'),
+    )
+    app._call_llm("Physics")
+
+    counters = app.METRICS.snapshot()
+    assert counters["llm_calls"] == 2
+    assert counters["prompt_tokens"] == 240
+    assert counters["completion_tokens"] == 6
+    assert counters["json_failures"] == 1
+    assert counters["prompt_eval_s"] >= 0 and counters["generation_s"] >= 0
+    assert app.METRICS.report()["json_failure_rate"] == 0.5
+
+
+def test_cli_task_drains_worker_metrics(monkeypatch):
+    """Ensure each CLI task hands its metrics to the parent and resets them."""
+    monkeypatch.setattr(app, "METRICS", Metrics())
+    row, fast_path, delta = app._cli_task((0, {"program": "Mathematics, McGill University"}))
+    assert fast_path is True
+    assert delta["rows"] == 1 and delta["fast_path_rows"] == 1
+    assert app.METRICS.snapshot()["rows"] == 0
+
+    merged = Metrics()
+    merged.merge(delta)
+    merged.merge(delta)
+    assert merged.snapshot()["rows"] == 2
+    assert "Fast path: 2 rows (100.0%)" in merged.summary()
+
+
+def test_metrics_endpoint_reports_counters(monkeypatch):
+    """Ensure serve mode exposes counters and derived rates as JSON."""
+    monkeypatch.setattr(app, "METRICS", Metrics())
+    client = app.app.test_client()
+    client.post("/standardize", json=[{"program": "Mathematics, McGill University"}])
+
+    data = client.get("/metrics").get_json()
+    assert data["counters"]["rows"] == 1
+    assert data["fast_path_fraction"] == 1.0
+
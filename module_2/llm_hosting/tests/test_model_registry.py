@@ -0,0 +1,54 @@
+"""Tests for offline model resolution and one-time checksum validation."""
+
+import hashlib
+import os
+
+import pytest
+
+import model_registry
+
+
+def _write(path, data):
+    path.write_bytes(data)
+    return hashlib.sha256(data).hexdigest()
+
+
+def test_resolve_by_filename_hashes_once(tmp_path, monkeypatch):
+    """Ensure a model is hashed on first resolve and only stat'ed afterwards."""
+    digest = _write(tmp_path / "m.gguf", b"weights")
+    calls = []
+    real_sha256 = model_registry._sha256
+    monkeypatch.setattr(
+        model_registry, "_sha256", lambda path: calls.append(path) or real_sha256(path)
+    )
+
+    path = model_registry.resolve(str(tmp_path), "m.gguf", digest)
+    assert path == os.path.join(str(tmp_path), "m.gguf")
+    assert model_registry.resolve(str(tmp_path), "m.gguf", digest) == path
+    assert len(calls) == 1
+    assert model_registry.resolve(str(tmp_path), "m.gguf") == path
+
+
+def test_resolve_selects_model_by_checksum(tmp_path):
+    """Ensure a checksum picks the matching file even under another name."""
+    _write(tmp_path / "old.gguf", b"old weights")
+    wanted = _write(tmp_path / "new.gguf", b"new weights")
+    path = model_registry.resolve(str(tmp_path), "old.gguf", wanted)
+    assert path.endswith("new.gguf")
+
+
+def test_changed_file_is_rehashed(tmp_path):
+    """Ensure a replaced file is validated again instead of trusting the registry."""
+    _write(tmp_path / "m.gguf", b"v1")
+    model_registry.checksum(str(tmp_path), "m.gguf")
+    digest = _write(tmp_path / "m.gguf", b"version two")
+    assert model_registry.checksum(str(tmp_path), "m.gguf") == digest
+
+
+def test_missing_model_fails_without_network(tmp_path):
+    """Ensure resolution reports a missing model instead of downloading it."""
+    with pytest.raises(model_registry.ModelNotFoundError, match="--download-model"):
+        model_registry.resolve(str(tmp_path), "absent.gguf")
+    _write(tmp_path / "m.gguf", b"weights")
+    with pytest.raises(model_registry.ModelNotFoundError):
+        model_registry.resolve(str(tmp_path), "m.gguf", "0" * 64)
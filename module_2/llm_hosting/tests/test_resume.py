@@ -0,0 +1,46 @@
+"""Tests for resumable CLI runs driven by the existing JSONL output."""
+
+import json
+
+import app
+
+
+def _fake_llm(program_text):
+    return {"standardized_program": program_text, "standardized_university": ""}
+
+
+def _read_jsonl(path):
+    with open(path, encoding="utf-8") as handle:
+        return [json.loads(line) for line in handle if line.strip()]
+
+
+def test_resume_skips_written_rows_and_repairs_partial_line(tmp_path, monkeypatch):
+    """Ensure a resumed run appends only missing rows after a torn write."""
+    monkeypatch.setattr(app, "_call_llm", _fake_llm)
+    rows = [
+        {"program": "A", "url": "https://x/1"},
+        {"program": "B", "overview_url": "https://x/2"},
+        {"program": "C"},
+    ]
+    in_path = tmp_path / "in.json"
+    in_path.write_text(json.dumps(rows), encoding="utf-8")
+    out_path = tmp_path / "out.jsonl"
+    first = dict(rows[0], **{"llm-generated-program": "A"})
+    out_path.write_text(json.dumps(first) + '\n{"program": "B", "ove', encoding="utf-8")
+
+    app._cli_process_file(str(in_path), str(out_path), append=False, to_stdout=False, resume=True)
+
+    written = _read_jsonl(out_path)
+    assert [r["program"] for r in written] == ["A", "B", "C"]
+
+    # A second resume finds every row (URL or hash keyed) and writes nothing.
+    app._cli_process_file(str(in_path), str(out_path), append=False, to_stdout=False, resume=True)
+    assert _read_jsonl(out_path) == written
+
+
+def test_row_key_ignores_fields_added_by_the_standardizer():
+    """Ensure hash keys match between an input row and its output row."""
+    row = {"program": "Physics", "comments": "x"}
+    out = dict(row, **{"llm-generated-program": "Physics", "degree_level": ""})
+    assert app._row_key(row) == app._row_key(out)
+    assert app._row_key({"url": "u"}) == "url:u"
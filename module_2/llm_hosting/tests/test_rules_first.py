@@ -0,0 +1,95 @@
+"""Tests for the rules-first fast path that skips the LLM."""
+
+import pytest
+
+import app
+
+
+def _no_llm(_program_text):
+    raise AssertionError("fast-path rows must not call the LLM")
+
+
+@pytest.mark.parametrize(
+    "program, expected",
+    [
+        ("Mathematics, McGill University", ("Mathematics", "McGill University")),
+        ("Physics PhD, stanford university", ("Physics", "Stanford University")),
+        (
+            "Computer Science, University of California, Davis",
+            ("Computer Science", "University of California, Davis"),
+        ),
+        ("Mathematics, McG", ("Mathematics", "McGill University")),
+        (
+            "Parks, Recreation, and Tourism Management, Clemson University",
+            ("Parks, Recreation, and Tourism Management", "Clemson University"),
+        ),
+    ],
+)
+def test_canonical_rows_skip_the_llm(monkeypatch, program, expected):
+    """Ensure clean canonical rows are resolved without calling the model."""
+    monkeypatch.setattr(app, "_call_llm", _no_llm)
+    row, fast_path = app._standardize_row({"program": program})
+    assert fast_path is True
+    assert (row["llm-generated-program"], row["llm-generated-university"]) == expected
+
+
+@pytest.mark.parametrize(
+    "program",
+    [
+        "Comp Sci, JHU",
+        "Computer Science",
+        "Mathematics, Unknown College",
+        "",
+        "Criminology, Law and Society PhD, Temple University",
+        "Microbiology, Immunology, and Pathology PhD, Stanford University",
+    ],
+)
+def test_ambiguous_rows_go_to_the_llm(monkeypatch, program):
+    """Ensure anything not matching both canonical lists reaches the model."""
+    calls = []
+
+    def fake_llm(program_text):
+        calls.append(program_text)
+        return {"standardized_program": "P", "standardized_university": "U"}
+
+    monkeypatch.setattr(app, "_call_llm", fake_llm)
+    row, fast_path = app._standardize_row({"program": program})
+    assert fast_path is False
+    assert calls == [program]
+    assert row["llm-generated-program"] == "P"
+
+
+def test_separate_university_column_only_needs_a_canonical_program(monkeypatch):
+    """Ensure rows with their own university field use the fast path."""
+    monkeypatch.setattr(app, "_call_llm", _no_llm)
+    row, fast_path = app._standardize_row(
+        {"program": "Philosophy PhD", "university": "University of Missouri"}
+    )
+    assert fast_path is True
+    assert row["llm-generated-program"] == "Philosophy"
+    assert row["llm-generated-university"] == "University of Missouri"
+
+
+@pytest.mark.parametrize(
+    "program",
+    [
+        "Education, Culture, and Society PhD",
+        "Criminology, Law and Society PhD",
+        "Microbiology, Immunology, and Pathology PhD",
+    ],
+)
+def test_separate_university_column_matches_the_whole_program(monkeypatch, program):
+    """Ensure a canonical first word does not stand in for a longer program."""
+    calls = []
+
+    def fake_llm(program_text):
+        calls.append(program_text)
+        return {"standardized_program": program, "standardized_university": ""}
+
+    monkeypatch.setattr(app, "_call_llm", fake_llm)
+    row, fast_path = app._standardize_row(
+        {"program": program, "university": "Temple University"}
+    )
+    assert fast_path is False
+    assert calls == [program]
+    assert row["llm-generated-program"] == program
@@ -0,0 +1,99 @@
+"""Tests for lazy imports, background warm-up and health/readiness routes."""
+
+import subprocess
+import sys
+import types
+from pathlib import Path
+
+import pytest
+
+import app
+
+HERE = Path(__file__).resolve().parent.parent
+
+
+@pytest.fixture()
+def client(monkeypatch):
+    """Flask test client with a fresh model state."""
+    monkeypatch.setattr(app, "MODEL_STATE", {"status": "idle", "error": ""})
+    monkeypatch.setattr(app, "_LLM", None)
+    return app.app.test_client()
+
+
+def test_import_does_not_load_heavy_dependencies():
+    """Ensure importing the app leaves llama_cpp, huggingface_hub and numpy unloaded."""
+    code = (
+        "import sys, app; "
+        "print(sorted(m for m in ('llama_cpp', 'huggingface_hub', 'numpy') if m in sys.modules))"
+    )
+    out = subprocess.run(
+        [sys.executable, "-c", code], cwd=HERE, capture_output=True, text=True, check=True
+    )
+    assert out.stdout.strip() == "[]"
+
+
+def test_readiness_tracks_model_state(client):
+    """Ensure liveness is always up while readiness waits for the model."""
+    assert client.get("/livez").status_code == 200
+    assert client.get("/").get_json() == {"ok": True, "status": "idle"}
+    assert client.get("/readyz").status_code == 503
+
+    app.MODEL_STATE["status"] = "ready"
+    response = client.get("/readyz")
+    assert response.status_code == 200
+    assert response.get_json()["ready"] is True
+
+
+def test_failed_warmup_is_reported(client, monkeypatch):
+    """Ensure a background warm-up failure surfaces through /readyz."""
+    def fail():
+        raise OSError("no network")
+
+    monkeypatch.setattr(app, "_resolve_model_path", fail)
+    monkeypatch.setattr(app, "_WORKER_MODEL_PATH", None)
+    app.start_background_warmup().join(timeout=10)
+
+    response = client.get("/readyz")
+    assert response.status_code == 503
+    assert response.get_json() == {"ready": False, "status": "error", "error": "no network"}
+
+
+def test_threads_per_worker_splits_budget(monkeypatch):
+    """Ensure the thread budget is split across workers and never drops below one."""
+    monkeypatch.setattr(app, "N_THREADS", 8)
+    assert app._threads_per_worker(1) == 8
+    assert app._threads_per_worker(3) == 2
+    assert app._threads_per_worker(12) == 1
+    assert app._threads_per_worker(0) == 8
+
+
+def test_worker_loads_model_from_parent_path(monkeypatch):
+    """Ensure a pool worker loads the parent's model path with its thread share and mmap."""
+    calls = []
+
+    class FakeLlama:
+        def __init__(self, **kwargs):
+            calls.append(kwargs)
+
+    def fail():
+        raise AssertionError("workers must not resolve the model themselves")
+
+    monkeypatch.setitem(sys.modules, "llama_cpp", types.SimpleNamespace(Llama=FakeLlama))
+    monkeypatch.setattr(app, "_resolve_model_path", fail)
+    monkeypatch.setattr(app, "MODEL_STATE", {"status": "idle", "error": ""})
+    monkeypatch.setattr(app, "_LLM", None)
+    monkeypatch.setattr(app, "_WORKER_MODEL_PATH", None)
+    monkeypatch.setattr(app, "_WORKER_THREADS", None)
+    monkeypatch.setattr(app, "N_THREADS", 8)
+    monkeypatch.setattr(app, "USE_MMAP", True)
+
+    app._init_worker("/models/parent.gguf", 2)
+    llm = app._load_llm()
+
+    assert isinstance(llm, FakeLlama)
+    assert app._load_llm() is llm
+    assert len(calls) == 1
+    assert calls[0]["model_path"] == "/models/parent.gguf"
+    assert calls[0]["n_threads"] == 2
+    assert calls[0]["use_mmap"] is True
+    assert app.MODEL_STATE["status"] == "ready"
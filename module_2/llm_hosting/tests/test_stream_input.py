@@ -0,0 +1,57 @@
+"""Tests for streaming JSON/NDJSON input and incremental JSON-array output."""
+
+import io
+import json
+
+import pytest
+
+import app
+
+ROWS = [
+    {"program": "Mathematics, McGill University", "comments": "a, ] b"},
+    {"program": "Physics PhD, Stanford University", "gpa": 3.91},
+    {"program": "Comp Sci, JHU", "tags": [1, 2, {"x": "}"}]},
+]
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        json.dumps(ROWS, indent=2),
+        "\n".join(json.dumps(r) for r in ROWS) + "\n\n",
+        json.dumps({"rows": ROWS}),
+    ],
+    ids=["array", "ndjson", "wrapped"],
+)
+def test_input_rows_stream_across_chunk_boundaries(tmp_path, monkeypatch, text):
+    """Ensure every layout yields the same rows even with tiny read chunks."""
+    monkeypatch.setattr(app, "READ_CHUNK", 5)
+    path = tmp_path / "in.json"
+    path.write_text(text, encoding="utf-8")
+    assert list(app._iter_input_rows(str(path))) == ROWS
+
+
+def test_truncated_input_raises():
+    """Ensure a cut-off array surfaces a decode error instead of dropping rows."""
+    with pytest.raises(json.JSONDecodeError):
+        list(app._iter_json_values(io.StringIO('[{"a": 1}, {"b":')))
+
+
+def test_count_input_rows_only_counts_ndjson(tmp_path):
+    """Ensure progress totals come from NDJSON and are unknown for arrays."""
+    ndjson = tmp_path / "in.jsonl"
+    ndjson.write_text("\n".join(json.dumps(r) for r in ROWS), encoding="utf-8")
+    array = tmp_path / "in.json"
+    array.write_text(json.dumps(ROWS, indent=2), encoding="utf-8")
+    assert app._count_input_rows(str(ndjson)) == 3
+    assert app._count_input_rows(str(array)) is None
+
+
+@pytest.mark.parametrize("rows", [ROWS, []])
+def test_write_json_array_matches_json_dump(tmp_path, rows):
+    """Ensure the streamed array is byte-identical to ``json.dump(indent=2)``."""
+    jsonl = tmp_path / "out.jsonl"
+    jsonl.write_text("".join(json.dumps(r) + "\n" for r in rows), encoding="utf-8")
+    sink = io.StringIO()
+    app._write_json_array(str(jsonl), sink)
+    assert sink.getvalue() == json.dumps(rows, ensure_ascii=False, indent=2)
@@ -0,0 +1,34 @@
+"""Tests for the unordered, buffered CLI output mode."""
+
+import json
+
+import app
+
+
+def test_unordered_rows_carry_their_input_index(tmp_path, monkeypatch):
+    """Ensure every row records its input position so order can be restored."""
+    monkeypatch.setattr(
+        app,
+        "_call_llm",
+        lambda text: {"standardized_program": text, "standardized_university": ""},
+    )
+    rows = [{"program": f"P{i}"} for i in range(5)]
+    in_path = tmp_path / "in.json"
+    in_path.write_text(json.dumps(rows), encoding="utf-8")
+    out_path = tmp_path / "out.jsonl"
+
+    app._cli_process_file(str(in_path), str(out_path), append=False, to_stdout=False, unordered=True)
+
+    with open(out_path, encoding="utf-8") as handle:
+        written = [json.loads(line) for line in handle]
+    restored = sorted(written, key=lambda r: r["row_index"])
+    assert [r["program"] for r in restored] == [r["program"] for r in rows]
+    assert [r["row_index"] for r in restored] == list(range(5))
+
+
+def test_unordered_chunksize_scales_with_input_and_is_capped():
+    """Ensure chunk sizes give each worker several chunks without exceeding the cap."""
+    assert app._unordered_chunksize(10, 4) == 1
+    assert app._unordered_chunksize(400, 4) == 25
+    assert app._unordered_chunksize(40_000, 4) == app.MAX_CHUNKSIZE
+    assert app._unordered_chunksize(None, 4) == max(1, app.MAX_CHUNKSIZE // 4)
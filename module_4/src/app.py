@@ -7,16 +7,22 @@ refresh operations, and background pull workflows.
 import load_data as ld
 import query_data as qd
 import scrape as sd
+import standardize as st
 import subprocess
 import sys
 import os
 import inspect
+import threading
 
 import psycopg
 
 from flask import Flask, render_template, get_flashed_messages, request, jsonify
 LAST_RESULTS = []
 PULL_DATA_PROCESS = None
+# long-lived connection whose prepared catalog statements are reused across requests
+QUERY_CONNECTION = None
+QUERY_LOCK = threading.Lock()
+CATALOG_PARAMS = ("term", "status", "degree")
 
 
 # check if pull data subprocess is running
@@ -42,9 +48,24 @@ def start_pull_worker():
         [sys.executable, __file__, "--run-pull-job"],
     )
 
+# start a separate background process to standardize newly loaded rows
+def start_standardize_worker(sourcefile):
+    """Start LLM standardization of a pull's rows in a background subprocess.
+
+    :param sourcefile: JSON file written by the pull job.
+    :type sourcefile: str
+    """
+    subprocess.Popen(
+        [sys.executable, __file__, "--run-standardize-job", sourcefile],
+    )
+
 # run pull data, calling scrape, save and looad
 def run_pull_job():
-    """Scrape records, write a JSON payload, and load new rows into PostgreSQL."""
+    """Scrape records, write a JSON payload, and load new rows into PostgreSQL.
+
+    When ``LLM_STANDARDIZER_URL`` is set, the new rows are then handed to a
+    separate standardization process so the pull itself finishes right away.
+    """
     rows = sd.scrape_data(
         "https://www.thegradcafe.com/survey/",
         max_pages=5,
@@ -52,6 +73,8 @@ def run_pull_job():
     new_cleaned_file = "new_only.json"
     sd.save_data(rows, new_cleaned_file)
     ld.load(new_cleaned_file)
+    if rows and st.standardizer_url():
+        start_standardize_worker(new_cleaned_file)
 
 # clear cached results allowing for next request to re-run queries
 def perform_update_analysis():
@@ -80,6 +103,49 @@ def get_db_connection():
         user="postgres",
     )
 
+# return the shared connection used for prepared catalog queries
+def get_query_connection():
+    """Return the long-lived connection for prepared catalog queries.
+
+    Prepared statements belong to one server session, so reusing the same
+    connection lets later requests skip parsing and planning. A closed or
+    broken connection is replaced on the next call.
+
+    :return: Open PostgreSQL connection in autocommit mode.
+    """
+    global QUERY_CONNECTION
+    if QUERY_CONNECTION is None or QUERY_CONNECTION.closed:
+        QUERY_CONNECTION = get_db_connection()
+        QUERY_CONNECTION.autocommit = True
+    return QUERY_CONNECTION
+
+# read catalog parameters from the request query string
+def catalog_overrides():
+    """Return the catalog parameters given in the request query string.
+
+    :return: Non-empty ``term``/``status``/``degree`` values and repeated ``school`` values.
+    :rtype: dict
+    """
+    overrides = {name: request.args.get(name, "").strip() for name in CATALOG_PARAMS}
+    overrides = {name: value for name, value in overrides.items() if value}
+    schools = [school.strip() for school in request.args.getlist("school") if school.strip()]
+    if schools:
+        overrides["schools"] = schools
+    return overrides
+
+# run the parameterized catalog on the shared connection
+def run_catalog(overrides):
+    """Run every catalog query for the given parameters as prepared statements.
+
+    :param overrides: Parameter overrides from :func:`catalog_overrides`.
+    :type overrides: dict
+    :return: ``(key, label, prefix, value)`` for every catalog entry.
+    :rtype: list[tuple]
+    """
+    with QUERY_LOCK:
+        with get_query_connection().cursor() as cur:
+            return qd.run_catalog(cur, overrides)
+
 # Connect URL route '/' to index.html
 def index():
     """Render the analysis page with cached or freshly computed query results.
@@ -90,39 +156,62 @@ def index():
     skip_queries = request.args.get("skip_queries") == "1"
     messages = get_flashed_messages()
     results = LAST_RESULTS
+    overrides = catalog_overrides()
 
     # open connection, get all the query results and pass the results and flashed status message variables
     # get the latest query only if the skip query flag is not set
     # LAST_RESULTS keeps a cache of the previous query to avoid a blank page
-    if skip_queries:
+    # explicit parameters run the prepared catalog and bypass the default-results cache
+    if overrides and not skip_queries:
+        try:
+            results = [(label, prefix, value) for _key, label, prefix, value in run_catalog(overrides)]
+        except ValueError as exc:
+            messages = [*messages, str(exc)]
+            results = [(label, prefix, None) for label, prefix, _query in qd.QUERIES]
+    elif skip_queries:
         if LAST_RESULTS:
             results = LAST_RESULTS
         else:
             # Preserve page structure without hitting the database.
             results = [(label, prefix, None) for label, prefix, _query in qd.QUERIES]
     elif not LAST_RESULTS:
-        with get_db_connection() as connection:
-            with connection.cursor() as cur:
-                for label, prefix, query in qd.QUERIES:
-                    cur.execute(query)
-                    row = cur.fetchone()
-                    # handle query result which has multiple outputs on one line
-                    if row and len(row) > 1:
-                        value = f"GPA: {row[0]}, GRE: {row[1]}, GRE V: {row[2]}, GRE AW: {row[3]}"
-                    else:
-                        value = row[0] if row else None
-                    results.append((label, prefix, value))
-                    #print result to console
-                    print(f"{label}: {prefix}{value if row else None}")
+        # the default parameters run through the same prepared catalog
+        results = [(label, prefix, value) for _key, label, prefix, value in run_catalog({})]
+        for label, prefix, value in results:
+            #print result to console
+            print(f"{label}: {prefix}{value}")
         LAST_RESULTS = results  # cache query results
     return render_template(
         'index.html',
         results=results,
         messages=messages,
         skip_queries=skip_queries,
+        params={**qd.DEFAULT_PARAMS, **overrides},
     )
 
 
+# JSON API over the parameterized query catalog
+def analysis_api():
+    """Return catalog results for the requested parameters as JSON.
+
+    Accepts ``term``, ``status``, ``degree`` and repeated ``school`` query
+    parameters; omitted ones use the catalog defaults.
+
+    :return: JSON payload and HTTP status (400 for unrecognized parameters).
+    """
+    overrides = catalog_overrides()
+    try:
+        params = qd.resolve_params(overrides)
+        rows = run_catalog(overrides)
+    except ValueError as exc:
+        return jsonify({"ok": False, "error": str(exc)}), 400
+    results = [
+        {"key": key, "label": label, "prefix": prefix, "value": value}
+        for key, label, prefix, value in rows
+    ]
+    return jsonify({"ok": True, "params": params, "results": results}), 200
+
+
 # Connect URL route 'pull-data' to scrape, clean, save to json and load any new records into database
 def pull_data():
     """Handle the pull-data endpoint and launch the background worker if idle.
@@ -156,6 +245,7 @@ def register_routes(flask_app):
     flask_app.add_url_rule("/analysis", endpoint="analysis", view_func=index, methods=["GET"])
     flask_app.add_url_rule("/pull-data", endpoint="pull_data", view_func=pull_data, methods=["POST"])
     flask_app.add_url_rule("/update-analysis", endpoint="update_analysis", view_func=update_analysis, methods=["POST"])
+    flask_app.add_url_rule("/api/analysis", endpoint="analysis_api", view_func=analysis_api, methods=["GET"])
 
 # build new Flask app
 def create_app():
@@ -177,10 +267,14 @@ if __name__ == "__main__":
     if "--run-pull-job" in sys.argv:
         run_pull_job()
         raise SystemExit(0)
+    if "--run-standardize-job" in sys.argv:
+        st.run_standardize_job(sys.argv[sys.argv.index("--run-standardize-job") + 1])
+        raise SystemExit(0)
 
-    # load initial cleaned file into db, resetting db as a clean start
+    # load initial cleaned file into db; unchanged files and rows are skipped,
+    # --reset drops the table for a clean start
     initial_cleaned_file = "llm_extend_applicant_data.json"
-    ld.load(initial_cleaned_file, reset=True)
+    ld.load(initial_cleaned_file, reset="--reset" in sys.argv, incremental=True)
 
     # Start the web application on local network
     app.run(host='0.0.0.0', port=8080, debug=True)
@@ -0,0 +1,106 @@
+"""Benchmark scalar and columnar record cleaning over a saved crawl.
+
+Cleans every record of ``llm_extend_applicant_data.json`` row by row with
+``load_data.clean_record`` and column by column with ``load_data.clean_batch``,
+checks that both produce identical rows (including the unparseable dates they
+report), and prints the best time and rows/s of each.
+
+Usage::
+
+    python bench_clean.py [--data PATH] [--repeat 5] [--scale 1]
+"""
+
+import argparse
+import json
+import os
+import time
+
+import load_data as ld
+
+DEFAULT_DATA = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "..", "..", "module_2", "llm_extend_applicant_data.json"
+)
+
+
+def clean_scalar(ids, records, bad_dates):
+    """Clean a batch one record at a time.
+
+    :param ids: ``p_id`` values aligned with ``records``.
+    :param records: Raw records.
+    :param bad_dates: List collecting unparseable dates.
+    :return: Cleaned rows.
+    :rtype: list[tuple]
+    """
+    return [ld.clean_record(p_id, record, bad_dates) for p_id, record in zip(ids, records)]
+
+
+def best_time(clean, ids, records, repeat):
+    """Return the fastest of ``repeat`` cold-cache runs and the last run's output.
+
+    :param clean: ``clean_scalar`` or ``load_data.clean_batch``.
+    :param ids: ``p_id`` values aligned with ``records``.
+    :param records: Raw records.
+    :param repeat: Number of timed runs.
+    :type repeat: int
+    :return: ``(seconds, rows, bad_dates)``.
+    :rtype: tuple[float, list[tuple], list[str]]
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        ld.parse_date.cache_clear()
+        bad_dates = []
+        start = time.perf_counter()
+        rows = clean(ids, records, bad_dates)
+        best = min(best, time.perf_counter() - start)
+    return best, rows, bad_dates
+
+
+def run(records, repeat=5):
+    """Time both cleaning paths over ``records`` and compare their output.
+
+    :param records: Raw records.
+    :type records: list[dict]
+    :param repeat: Timed runs per path.
+    :type repeat: int
+    :return: Row count, seconds and rows/s per path, and whether outputs match.
+    :rtype: dict
+    """
+    ids = list(range(1, len(records) + 1))
+    scalar_seconds, scalar_rows, scalar_bad = best_time(clean_scalar, ids, records, repeat)
+    batch_seconds, batch_rows, batch_bad = best_time(ld.clean_batch, ids, records, repeat)
+    return {
+        "rows": len(records),
+        "scalar_seconds": scalar_seconds,
+        "batch_seconds": batch_seconds,
+        "scalar_rows_per_s": len(records) / scalar_seconds if scalar_seconds else 0.0,
+        "batch_rows_per_s": len(records) / batch_seconds if batch_seconds else 0.0,
+        "identical": scalar_rows == batch_rows and scalar_bad == batch_bad,
+    }
+
+
+def main(argv=None):
+    """Run the benchmark and print a short report.
+
+    :param argv: Command-line arguments; defaults to ``sys.argv[1:]``.
+    :type argv: list[str] | None
+    :return: Benchmark report from :func:`run`.
+    :rtype: dict
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--data", default=DEFAULT_DATA)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--scale", type=int, default=1, help="repeat the input this many times")
+    args = parser.parse_args(argv)
+
+    with open(args.data, encoding="utf-8") as handle:
+        records = json.load(handle) * args.scale
+    report = run(records, args.repeat)
+    print(f"{report['rows']} records from {args.data}")
+    print(f"  scalar  : {report['scalar_seconds']:.3f}s ({report['scalar_rows_per_s']:.0f} rows/s)")
+    print(f"  columnar: {report['batch_seconds']:.3f}s ({report['batch_rows_per_s']:.0f} rows/s)")
+    print(f"  identical output: {report['identical']}")
+    return report
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,69 @@
 """Utilities to clean parsed fields and load JSON records into PostgreSQL."""
 
+import functools
+import hashlib
 import json
+import os
 import re
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import ExitStack
+from datetime import datetime
+from itertools import repeat
 import psycopg
 
+# small-int codes for the normalized filter columns; unknown non-empty text maps to 0
+SEASON_CODES = {"spring": 1, "summer": 2, "fall": 3, "winter": 4}
+STATUS_CODES = {"accepted": 1, "rejected": 2, "interview": 3, "wait listed": 4}
+CITIZENSHIP_CODES = {"american": 1, "international": 2, "other": 3}
+UNKNOWN_CODE = 0
+
+# canonical university / program lists shared with the module_2 standardizer
+CANON_DIR = os.getenv(
+    "CANON_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "module_2", "llm_hosting"),
+)
+CANON_UNIS_PATH = os.path.join(CANON_DIR, "canon_universities.txt")
+CANON_PROGS_PATH = os.path.join(CANON_DIR, "canon_programs.txt")
+
+# opt-in: range-partition applicantData by term_year (needs PostgreSQL 11+)
+PARTITIONED = os.getenv("APPLICANT_PARTITIONED", "0") == "1"
+
+# p_id values come from a sequence; each nextval reserves a block of this many ids
+P_ID_SEQUENCE = "applicantdata_p_id_seq"
+P_ID_BLOCK = 1000
+
+# parallel loading: worker processes and records cleaned and copied per shard
+LOAD_WORKERS = int(os.getenv("LOAD_WORKERS", "1"))
+LOAD_SHARD_SIZE = int(os.getenv("LOAD_SHARD_SIZE", "20000"))
+
+# applicantData columns filled from each cleaned record, in row order
+LOAD_COLUMNS = (
+    "p_id", "program", "comments", "date_added", "url", "status", "term",
+    "us_or_international", "gpa", "gre", "gre_v", "gre_aw", "degree",
+    "llm_generated_program", "llm_generated_university", "record_hash",
+    "term_season", "term_year", "status_code", "citizenship_code",
+)
+# SQL types of LOAD_COLUMNS, as declared on applicantData
+LOAD_COLUMN_TYPES = (
+    "INTEGER", "TEXT", "TEXT", "DATE", "TEXT", "TEXT", "TEXT",
+    "TEXT", "FLOAT", "FLOAT", "FLOAT", "FLOAT", "TEXT",
+    "TEXT", "TEXT", "TEXT",
+    "SMALLINT", "SMALLINT", "SMALLINT", "SMALLINT",
+)
+TERM_YEAR_INDEX = LOAD_COLUMNS.index("term_year")
+LLM_PROGRAM_INDEX = LOAD_COLUMNS.index("llm_generated_program")
+LLM_UNIVERSITY_INDEX = LOAD_COLUMNS.index("llm_generated_university")
+
+# database connection reused by one worker process across its shards
+_WORKER_CONNECTION = None
+
+# scraped date_added text such as "January 10, 2025"
+DATE_FORMAT = "%B %d, %Y"
+
+TERM_RE = re.compile(r"\b(spring|summer|fall|winter)\b", re.IGNORECASE)
+YEAR_RE = re.compile(r"\b(\d{4})\b")
+
 # clean null bytes
 def clean_text(value):
     """Return a text value with null bytes removed.
@@ -29,20 +89,568 @@ def parse_number(value):
     match = re.search(r"[-+]?\d*\.?\d+", str(value))
     return float(match.group(0)) if match else None
 
-# open and load json file into db schema
-def load(sourcefile, reset=False):
-    """Load applicant records from JSON into the ``applicantData`` table.
+# parse date_added text; only a few thousand distinct strings occur, so memoize
+@functools.lru_cache(maxsize=8192)
+def parse_date(value):
+    """Return the date of a ``Month DD, YYYY`` string.
+
+    :param value: Cleaned ``date_added`` text.
+    :type value: str | None
+    :return: The parsed date, or ``None`` when the value is blank or invalid.
+    :rtype: datetime.date | None
+    """
+    if not value or not value.strip():
+        return None
+    try:
+        return datetime.strptime(value.strip(), DATE_FORMAT).date()
+    except ValueError:
+        return None
+
+# split free-text term such as "Fall 2026" into integer season and year
+def parse_term(value):
+    """Return the season code and year of a term string.
+
+    :param value: Term text such as ``"Fall 2026"``.
+    :return: ``(season, year)``; either part is ``None`` when absent.
+    :rtype: tuple[int | None, int | None]
+    """
+    if not value:
+        return None, None
+    season = TERM_RE.search(str(value))
+    year = YEAR_RE.search(str(value))
+    return (
+        SEASON_CODES[season.group(1).lower()] if season else None,
+        int(year.group(1)) if year else None,
+    )
+
+# map status / citizenship text to its small-int code
+def encode(value, codes):
+    """Return the code of a case-insensitive label.
+
+    :param value: Label text such as ``"Accepted"``.
+    :param codes: Lower-case label to code mapping.
+    :type codes: dict[str, int]
+    :return: The code, ``UNKNOWN_CODE`` for other text, or ``None`` when missing.
+    :rtype: int | None
+    """
+    if value is None:
+        return None
+    return codes.get(" ".join(str(value).lower().split()), UNKNOWN_CODE)
+
+# SQL versions of parse_term / encode for rows stored before the code columns existed
+def normalized_codes_sql():
+    """Return ``SET`` assignments deriving the four code columns from their text.
+
+    They follow :func:`parse_term` and :func:`encode`, so backfilled rows get
+    the same codes a fresh load would store.
+
+    :return: Comma-separated ``column = expression`` list.
+    :rtype: str
+    """
+    seasons = "|".join(SEASON_CODES)
+    season_cases = " ".join(f"WHEN '{label}' THEN {code:d}" for label, code in SEASON_CODES.items())
+
+    def code(column, codes):
+        cases = " ".join(f"WHEN '{label}' THEN {value:d}" for label, value in codes.items())
+        label = f"btrim(regexp_replace(lower({column}), '\\s+', ' ', 'g'))"
+        return f"CASE WHEN {column} IS NOT NULL THEN COALESCE(CASE {label} {cases} END, {UNKNOWN_CODE:d}) END"
+
+    return ",\n".join(
+        (
+            f"term_season = CASE lower(substring(term FROM '(?i)\\y({seasons})\\y')) {season_cases} END",
+            "term_year = substring(term FROM '\\y(\\d{4})\\y')::smallint",
+            f"status_code = {code('status', STATUS_CODES)}",
+            f"citizenship_code = {code('us_or_international', CITIZENSHIP_CODES)}",
+        )
+    )
+
+# read one canonical name per line
+def read_canon(path):
+    """Return the distinct non-empty lines of a canonical names file.
+
+    :param path: Path to a canon ``.txt`` file.
+    :type path: str
+    :return: Names in file order, or an empty list if the file is missing.
+    :rtype: list[str]
+    """
+    if not os.path.exists(path):
+        return []
+    with open(path, encoding="utf-8") as handle:
+        names = [line.strip() for line in handle]
+    return list(dict.fromkeys(name for name in names if name))
 
-    Supports both JSON arrays and newline-delimited JSON input.
+# create and seed the university / program dimension tables
+def create_dimensions(cur):
+    """Create the ``university``/``program`` tables and seed them from the canon lists.
+
+    Seeding is idempotent; names already present keep their ids. Trigram
+    indexes back ad-hoc ``ILIKE`` searches over the names.
+
+    :param cur: Open database cursor.
+    :return: ``None``
+    """
+    cur.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm;")
+    for table, path in (("university", CANON_UNIS_PATH), ("program", CANON_PROGS_PATH)):
+        cur.execute(
+            f"""
+            CREATE TABLE IF NOT EXISTS {table} (
+                id SERIAL PRIMARY KEY,
+                name TEXT NOT NULL UNIQUE
+            );
+            """
+        )
+        cur.execute(
+            f"""
+            CREATE INDEX IF NOT EXISTS {table}_name_trgm_idx
+            ON {table} USING gin (name gin_trgm_ops);
+            """
+        )
+        cur.executemany(
+            f"INSERT INTO {table} (name) VALUES (%s) ON CONFLICT (name) DO NOTHING;",
+            [(name,) for name in read_canon(path)],
+        )
+
+# check whether applicantData was created as a partitioned table
+def is_partitioned(cur):
+    """Return whether ``applicantData`` exists as a partitioned table.
+
+    :param cur: Open database cursor.
+    :return: ``True`` for a partitioned table.
+    :rtype: bool
+    """
+    cur.execute(
+        "SELECT relkind = 'p' FROM pg_class WHERE oid = to_regclass('applicantdata');"
+    )
+    row = cur.fetchone()
+    return bool(row and row[0])
+
+# create one range partition per term year present in a load
+def create_year_partitions(cur, years):
+    """Create any missing ``applicantData`` partitions for the given term years.
+
+    Each partition holds exactly one year. Rows without a year go to
+    ``applicantdata_default``.
+
+    :param cur: Open database cursor.
+    :param years: Term years of the rows about to be inserted.
+    :type years: Iterable[int | None]
+    :return: ``None``
+    """
+    for year in sorted({year for year in years if year is not None}):
+        cur.execute(
+            f"""
+            CREATE TABLE IF NOT EXISTS applicantdata_y{year:d}
+            PARTITION OF applicantData FOR VALUES FROM ({year:d}) TO ({year + 1:d});
+            """
+        )
+
+# a partitioned table cannot enforce UNIQUE (url), so its loads skip known urls here
+def drop_known_urls(cur, ids, records, digests=None):
+    """Drop records whose URL is already stored or repeated earlier in the batch.
+
+    Takes a transaction-level advisory lock first, so concurrent loads into a
+    partitioned table check and insert URLs one at a time. Records without a
+    URL are always kept, as ``UNIQUE (url)`` keeps them on a plain table.
+
+    :param cur: Open database cursor.
+    :param ids: Reserved ``p_id`` values, aligned with ``records``.
+    :type ids: list[int]
+    :param records: Raw records to load.
+    :type records: list[dict]
+    :param digests: Record hashes aligned with ``records``, or ``None``.
+    :type digests: list[str] | None
+    :return: ``(ids, records, digests)`` of the records left to insert.
+    :rtype: tuple[list[int], list[dict], list[str] | None]
+    """
+    cur.execute("SELECT pg_advisory_xact_lock(hashtext('applicantdata_url'));")
+    urls = [clean_text(record.get("url")) for record in records]
+    cur.execute(
+        "SELECT url FROM applicantData WHERE url = ANY(%s);",
+        ([url for url in urls if url is not None],),
+    )
+    seen = {url for (url,) in cur.fetchall()}
+    keep = []
+    for index, url in enumerate(urls):
+        if url is None or url not in seen:
+            keep.append(index)
+            if url is not None:
+                seen.add(url)
+    return (
+        [ids[index] for index in keep],
+        [records[index] for index in keep],
+        None if digests is None else [digests[index] for index in keep],
+    )
+
+# create the block-allocating p_id sequence once per table
+def create_p_id_sequence(cur):
+    """Create the ``p_id`` sequence if missing, starting after any existing ids.
+
+    The sequence advances by ``P_ID_BLOCK`` and is owned by
+    ``applicantData.p_id``, so it is dropped together with the table.
+
+    :param cur: Open database cursor.
+    :return: ``None``
+    """
+    cur.execute(
+        f"""
+        DO $$
+        BEGIN
+            IF to_regclass('{P_ID_SEQUENCE}') IS NULL THEN
+                CREATE SEQUENCE {P_ID_SEQUENCE}
+                    INCREMENT BY {P_ID_BLOCK:d} OWNED BY applicantData.p_id;
+                PERFORM setval('{P_ID_SEQUENCE}', COALESCE(MAX(p_id), 0) + 1, false)
+                FROM applicantData;
+            END IF;
+        END $$;
+        """
+    )
+
+# reserve ids for a load without scanning the table
+def reserve_p_ids(cur, count):
+    """Return ``count`` unused ``p_id`` values, one ``nextval`` per block.
+
+    Sequence values are never handed out twice, so concurrent loads get
+    disjoint blocks. Unused ids of a block are left as gaps.
+
+    :param cur: Open database cursor.
+    :param count: Number of ids needed.
+    :type count: int
+    :return: Ids in ascending order.
+    :rtype: list[int]
+    """
+    ids = []
+    while len(ids) < count:
+        cur.execute(f"SELECT nextval('{P_ID_SEQUENCE}');")
+        start = cur.fetchone()[0]
+        ids.extend(range(start, start + min(P_ID_BLOCK, count - len(ids))))
+    return ids
+
+# fingerprint a raw record so incremental loads can tell whether it changed
+def record_hash(record):
+    """Return a stable hash of a raw record's content.
+
+    :param record: Raw record as read from JSON.
+    :type record: dict
+    :return: Hex digest, independent of key order.
+    :rtype: str
+    """
+    text = json.dumps(record, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+
+# hash a whole source file so an unchanged file is not parsed again
+def file_hash(sourcefile):
+    """Return the SHA-256 of a file's bytes.
 
     :param sourcefile: Path to the source JSON file.
     :type sourcefile: str
-    :param reset: Whether to drop and recreate the table before loading.
-    :type reset: bool
+    :return: Hex digest.
+    :rtype: str
+    """
+    with open(sourcefile, "rb") as handle:
+        return hashlib.file_digest(handle, "sha256").hexdigest()
+
+# clean one raw record into a row of LOAD_COLUMNS
+def clean_record(p_id, record, bad_dates=None, digest=None):
+    """Return the cleaned ``LOAD_COLUMNS`` values of one scraped record.
+
+    This is the scalar reference for :func:`clean_batch`, which loads use.
+
+    :param p_id: Id reserved for the row.
+    :type p_id: int
+    :param record: Raw record as read from JSON.
+    :type record: dict
+    :param bad_dates: Optional list collecting ``date_added`` text that could
+        not be parsed; such rows are kept with a ``NULL`` date.
+    :type bad_dates: list[str] | None
+    :param digest: :func:`record_hash` of the record, stored for incremental loads.
+    :type digest: str | None
+    :return: Column values in ``LOAD_COLUMNS`` order.
+    :rtype: tuple
+    """
+    date_text = clean_text(record.get("date_added"))
+    date_added = parse_date(date_text)
+    if date_added is None and date_text and date_text.strip() and bad_dates is not None:
+        bad_dates.append(date_text)
+    term = clean_text(record.get("semester_year_start"))
+    status = clean_text(record.get("applicant_status"))
+    citizenship = clean_text(record.get("citizenship"))
+    return (
+        p_id,
+        clean_text(record.get("program")),
+        clean_text(record.get("comments")),
+        date_added,
+        clean_text(record.get("url")),
+        status,
+        term,
+        citizenship,
+        parse_number(record.get("gpa")),
+        parse_number(record.get("gre")),
+        parse_number(record.get("gre_v")),
+        parse_number(record.get("gre_aw")),
+        clean_text(record.get("masters_or_phd")),
+        clean_text(record.get("llm-generated-program")),
+        clean_text(record.get("llm-generated-university")),
+        digest,
+        *parse_term(term),
+        encode(status, STATUS_CODES),
+        encode(citizenship, CITIZENSHIP_CODES),
+    )
+
+# apply a scalar cleaner once per distinct value of a column
+def map_distinct(func, column):
+    """Return ``[func(value) for value in column]``, calling ``func`` once per distinct value.
+
+    Values are keyed by type as well, so ``1``, ``1.0`` and ``True`` stay apart,
+    and floats also by their ``repr``, so ``-0.0`` and ``0.0`` do too.
+
+    :param func: Scalar cleaning function.
+    :param column: Values of one field across a batch.
+    :type column: list
+    :return: Cleaned values in column order.
+    :rtype: list
+    """
+    try:
+        cache = dict.fromkeys(column)
+    except TypeError:  # lists / objects in the JSON are unhashable
+        return [func(value) for value in column]
+    if any(key.__class__ in (int, float, bool) for key in cache):
+        return map_distinct(
+            lambda key: func(key[-1]),
+            [
+                (float, repr(value), value) if value.__class__ is float else (value.__class__, value)
+                for value in column
+            ],
+        )
+    for key in cache:
+        cache[key] = func(key)
+    return list(map(cache.__getitem__, column))
+
+# strip null bytes from a whole text column, skipping clean_text for plain strings
+def clean_text_column(column):
+    """Return ``[clean_text(value) for value in column]``.
+
+    :param column: Values of one text field across a batch.
+    :type column: list
+    :return: Cleaned values in column order.
+    :rtype: list[str | None]
+    """
+    return [
+        value if value.__class__ is str and "\x00" not in value else clean_text(value)
+        for value in column
+    ]
+
+# clean a batch of records column by column
+def clean_batch(ids, records, bad_dates=None, digests=None):
+    """Return the same rows as :func:`clean_record`, computed per column.
+
+    Free-text columns are cleaned in one pass each. Low-cardinality columns
+    (numbers, dates, terms, codes) are parsed once per distinct value.
+
+    :param ids: Reserved ``p_id`` values, aligned with ``records``.
+    :type ids: list[int]
+    :param records: Raw records as read from JSON.
+    :type records: list[dict]
+    :param bad_dates: Optional list collecting unparseable ``date_added`` text.
+    :type bad_dates: list[str] | None
+    :param digests: Record hashes aligned with ``records``, if known.
+    :type digests: list[str] | None
+    :return: One ``LOAD_COLUMNS`` tuple per record.
+    :rtype: list[tuple]
+    """
+    def text(field):
+        return clean_text_column([record.get(field) for record in records])
+
+    def number(field):
+        return map_distinct(parse_number, [record.get(field) for record in records])
+
+    date_texts = map_distinct(clean_text, [record.get("date_added") for record in records])
+    dates = map_distinct(parse_date, date_texts)
+    if bad_dates is not None:
+        bad_dates.extend(
+            date_text
+            for date_text, date_added in zip(date_texts, dates)
+            if date_added is None and date_text and date_text.strip()
+        )
+    terms = map_distinct(clean_text, [record.get("semester_year_start") for record in records])
+    seasons, years = zip(*map_distinct(parse_term, terms)) if records else ((), ())
+    statuses = map_distinct(clean_text, [record.get("applicant_status") for record in records])
+    citizenships = map_distinct(clean_text, [record.get("citizenship") for record in records])
+    return list(
+        zip(
+            ids,
+            text("program"),
+            text("comments"),
+            dates,
+            text("url"),
+            statuses,
+            terms,
+            citizenships,
+            number("gpa"),
+            number("gre"),
+            number("gre_v"),
+            number("gre_aw"),
+            map_distinct(clean_text, [record.get("masters_or_phd") for record in records]),
+            text("llm-generated-program"),
+            text("llm-generated-university"),
+            digests if digests is not None else repeat(None),
+            seasons,
+            years,
+            map_distinct(lambda value: encode(value, STATUS_CODES), statuses),
+            map_distinct(lambda value: encode(value, CITIZENSHIP_CODES), citizenships),
+        )
+    )
+
+# report rows whose date could not be parsed without failing the load
+def report_bad_dates(bad_dates):
+    """Print how many ``date_added`` values were unparseable, with a sample.
+
+    :param bad_dates: Unparseable ``date_added`` strings.
+    :type bad_dates: list[str]
     :return: ``None``
     """
+    if bad_dates:
+        sample = ", ".join(repr(value) for value in sorted(set(bad_dates))[:5])
+        print(f"Stored {len(bad_dates)} unparseable date_added values as NULL: {sample}")
 
-    # open source file, detect whether it is JSON array or line delimited JSON and load into records
+# open (once per worker process) the connection used for shard COPYs
+def worker_connection():
+    """Return this process's autocommit connection, reconnecting if it was closed.
+
+    :return: Open database connection.
+    :rtype: psycopg.Connection
+    """
+    global _WORKER_CONNECTION
+    if _WORKER_CONNECTION is None or _WORKER_CONNECTION.closed:
+        _WORKER_CONNECTION = psycopg.connect(
+            dbname="studentCourses",
+            user="postgres",
+            autocommit=True,
+        )
+    return _WORKER_CONNECTION
+
+# clean one shard and stream it into the staging table
+def copy_shard(staging, ids, records, digests=None):
+    """Clean a shard of records and ``COPY`` it into a staging table.
+
+    Runs in a worker process of :func:`load_sharded`.
+
+    :param staging: Name of the staging table.
+    :type staging: str
+    :param ids: Reserved ``p_id`` values, aligned with ``records``.
+    :type ids: list[int]
+    :param records: Raw records of this shard.
+    :type records: list[dict]
+    :param digests: Record hashes aligned with ``records``, if known.
+    :type digests: list[str] | None
+    :return: Term years present in the shard and its unparseable dates.
+    :rtype: tuple[set[int | None], list[str]]
+    """
+    bad_dates = []
+    rows = clean_batch(ids, records, bad_dates, digests)
+    with worker_connection().cursor() as cur:
+        with cur.copy(f"COPY {staging} ({', '.join(LOAD_COLUMNS)}) FROM STDIN") as copy:
+            for row in rows:
+                copy.write_row(row)
+    return {row[TERM_YEAR_INDEX] for row in rows}, bad_dates
+
+# drop a staging table over its own autocommit connection
+def drop_staging(staging):
+    """Drop a staging table of :func:`load_sharded`.
+
+    Called only after the load's connection has committed or rolled back:
+    until then its merge holds a lock on the table and the drop would wait
+    on it forever.
+
+    :param staging: Name of the staging table.
+    :type staging: str
+    :return: ``None``
+    """
+    with psycopg.connect(
+        dbname="studentCourses",
+        user="postgres",
+        autocommit=True,
+    ) as staging_connection:
+        with staging_connection.cursor() as cur:
+            cur.execute(f"DROP TABLE IF EXISTS {staging};")
+
+# load large inputs through a process pool, a staging table and one merge
+def load_sharded(connection, cleanup, ids, records, digests, workers, partitioned, conflict_key):
+    """Clean and copy shards in parallel, then merge them in one statement.
+
+    The unlogged staging table is created over a separate autocommit
+    connection, so the workers can see it while ``connection`` keeps its
+    transaction open. The merge therefore commits together with the rest of
+    the load (a reset or the deletes of an incremental load), and a failure
+    rolls all of it back. The merge resolves the dimension keys and skips
+    duplicate URLs exactly like the row-by-row path. The drop of the staging
+    table is registered on ``cleanup``, which must close after ``connection``.
+
+    :param connection: Open connection holding the load's uncommitted work.
+    :param cleanup: Exit stack entered before ``connection`` was opened.
+    :type cleanup: contextlib.ExitStack
+    :param ids: Reserved ``p_id`` values, aligned with ``records``.
+    :type ids: list[int]
+    :param records: Raw records to load.
+    :type records: list[dict]
+    :param digests: Record hashes aligned with ``records``, or ``None``.
+    :type digests: list[str] | None
+    :param workers: Number of worker processes.
+    :type workers: int
+    :param partitioned: Whether ``applicantData`` is partitioned by term year.
+    :type partitioned: bool
+    :param conflict_key: Columns of the url uniqueness key.
+    :type conflict_key: str
+    :return: Unparseable ``date_added`` strings of all shards.
+    :rtype: list[str]
+    """
+    staging = f"applicantdata_staging_{uuid.uuid4().hex}"
+    columns = ", ".join(LOAD_COLUMNS)
+    typed = ", ".join(f"{column} {kind}" for column, kind in zip(LOAD_COLUMNS, LOAD_COLUMN_TYPES))
+    selected = ", ".join(f"s.{column}" for column in LOAD_COLUMNS)
+    with psycopg.connect(
+        dbname="studentCourses",
+        user="postgres",
+        autocommit=True,
+    ) as staging_connection:
+        with staging_connection.cursor() as cur:
+            cur.execute(f"CREATE UNLOGGED TABLE {staging} ({typed});")
+    cleanup.callback(drop_staging, staging)
+    starts = range(0, len(records), LOAD_SHARD_SIZE)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        shards = list(pool.map(
+            copy_shard,
+            repeat(staging),
+            (ids[start:start + LOAD_SHARD_SIZE] for start in starts),
+            (records[start:start + LOAD_SHARD_SIZE] for start in starts),
+            (digests and digests[start:start + LOAD_SHARD_SIZE] for start in starts),
+        ))
+        years = set().union(*(shard_years for shard_years, _ in shards))
+        bad_dates = [value for _, shard_dates in shards for value in shard_dates]
+    with connection.cursor() as cur:
+        if partitioned:
+            create_year_partitions(cur, years)
+        cur.execute(
+            f"""
+            INSERT INTO applicantData ({columns}, program_id, university_id)
+            SELECT {selected}, p.id, u.id
+            FROM {staging} AS s
+            LEFT JOIN program AS p ON p.name = s.llm_generated_program
+            LEFT JOIN university AS u ON u.name = s.llm_generated_university
+            ORDER BY s.p_id
+            ON CONFLICT ({conflict_key}) DO NOTHING;
+            """
+        )
+    return bad_dates
+
+# open source file, detect whether it is JSON array or line delimited JSON and load into records
+def read_records(sourcefile):
+    """Return the records of a JSON array or newline-delimited JSON file.
+
+    :param sourcefile: Path to the source JSON file.
+    :type sourcefile: str
+    :return: Parsed records in file order.
+    :rtype: list[dict]
+    """
     records = []
     with open(sourcefile, encoding="utf-8") as handle:
         first_char = ""
@@ -66,20 +674,115 @@ def load(sourcefile, reset=False):
                 if not line:
                     continue
                 records.append(json.loads(line))
+    return records
 
-    # open connection
-    with psycopg.connect(
+# decide which records an incremental load has to write
+def diff_records(cur, records):
+    """Compare records with the stored rows of the same URL.
+
+    A URL repeated in the file counts once, with its last record. Records
+    without a URL cannot be matched to a row by URL; they count as unchanged
+    when a URL-less row with the same :func:`record_hash` is stored, and as new
+    otherwise.
+
+    :param cur: Open database cursor.
+    :param records: Raw records from the source file.
+    :type records: list[dict]
+    :return: ``(new, changed, changed_ids)``: ``(record, digest)`` pairs with
+        an unknown URL or content, pairs whose :func:`record_hash` differs from
+        the stored one, and the stored ``p_id`` of each changed record.
+    :rtype: tuple[list[tuple[dict, str]], list[tuple[dict, str]], list[int]]
+    """
+    latest, unkeyed = {}, []
+    for record in records:
+        url = clean_text(record.get("url"))
+        if url is None:
+            unkeyed.append((record, record_hash(record)))
+        else:
+            latest[url] = record
+    cur.execute(
+        "SELECT url, record_hash, p_id FROM applicantData WHERE url = ANY(%s);",
+        (list(latest),),
+    )
+    stored = {url: (digest, p_id) for url, digest, p_id in cur.fetchall()}
+    cur.execute(
+        "SELECT record_hash FROM applicantData WHERE url IS NULL AND record_hash = ANY(%s);",
+        ([digest for _, digest in unkeyed],),
+    )
+    stored_unkeyed = {digest for (digest,) in cur.fetchall()}
+    new = [(record, digest) for record, digest in unkeyed if digest not in stored_unkeyed]
+    changed, changed_ids = [], []
+    for url, record in latest.items():
+        digest = record_hash(record)
+        if url not in stored:
+            new.append((record, digest))
+        elif stored[url][0] != digest:
+            changed.append((record, digest))
+            changed_ids.append(stored[url][1])
+    return new, changed, changed_ids
+
+# open and load json file into db schema
+def load(sourcefile, reset=False, workers=None, incremental=False):
+    """Load applicant records from JSON into the ``applicantData`` table.
+
+    Supports both JSON arrays and newline-delimited JSON input. With
+    ``PARTITIONED`` a new table is range-partitioned by ``term_year`` and the
+    partitions for the loaded years are created before inserting.
+
+    :param sourcefile: Path to the source JSON file.
+    :type sourcefile: str
+    :param reset: Whether to drop and recreate the table before loading.
+    :type reset: bool
+    :param workers: Worker processes for inputs larger than one shard;
+        defaults to ``LOAD_WORKERS``. With more than one, see :func:`load_sharded`.
+    :type workers: int | None
+    :param incremental: Skip the load when the file is unchanged since its last
+        incremental load; otherwise write only new and changed records.
+    :type incremental: bool
+    :return: ``None``
+    """
+    workers = LOAD_WORKERS if workers is None else workers
+    content_hash = file_hash(sourcefile) if incremental else None
+
+    # open connection; cleanup (a sharded load's staging table) runs after it commits
+    with ExitStack() as cleanup, psycopg.connect(
         dbname="studentCourses",
         user="postgres",
     ) as connection:
         with connection.cursor() as cur:
+            # content hash of each file as of its last incremental load
+            cur.execute(
+                """
+                CREATE TABLE IF NOT EXISTS load_state (
+                    sourcefile TEXT PRIMARY KEY,
+                    content_hash TEXT NOT NULL,
+                    loaded_at TIMESTAMPTZ NOT NULL DEFAULT now()
+                );
+                """
+            )
             if reset:
                 cur.execute("DROP TABLE IF EXISTS applicantData")
-            # create table with required schema
+                cur.execute("DELETE FROM load_state;")
+            elif incremental:
+                # the stored hash only counts while the table it was loaded into exists
+                cur.execute(
+                    """
+                    SELECT content_hash FROM load_state
+                    WHERE sourcefile = %s AND to_regclass('applicantdata') IS NOT NULL;
+                    """,
+                    (sourcefile,),
+                )
+                if cur.fetchone() == (content_hash,):
+                    print(f"{sourcefile} is unchanged since its last load; skipped.")
+                    return
+            records = read_records(sourcefile)
+            create_dimensions(cur)
+            # create table with required schema; a partitioned table cannot have
+            # a primary key without the partition key, so p_id is indexed below
             cur.execute(
-                """
+                f"""
                 CREATE TABLE IF NOT EXISTS applicantData (
-                    p_id INTEGER PRIMARY KEY,
+                    p_id INTEGER {"NOT NULL" if PARTITIONED else "PRIMARY KEY"},
                     program TEXT,
                     comments TEXT,
                     date_added DATE,
@@ -93,62 +796,169 @@ def load(sourcefile, reset=False):
                     gre_aw FLOAT,
                     degree TEXT,
                     llm_generated_program TEXT,
-                    llm_generated_university TEXT
-                );
+                    llm_generated_university TEXT,
+                    record_hash TEXT,
+                    term_season SMALLINT,
+                    term_year SMALLINT,
+                    status_code SMALLINT,
+                    citizenship_code SMALLINT,
+                    program_id INTEGER REFERENCES program (id),
+                    university_id INTEGER REFERENCES university (id)
+                ) {"PARTITION BY RANGE (term_year)" if PARTITIONED else ""};
                 """
             )
-            # create unique index on url to avoid duplicates in database
+            partitioned = PARTITIONED and is_partitioned(cur)
+            if PARTITIONED and not partitioned:
+                print("applicantData already exists unpartitioned; reload with reset=True to partition.")
+            if partitioned:
+                cur.execute(
+                    """
+                    CREATE TABLE IF NOT EXISTS applicantdata_default
+                    PARTITION OF applicantData DEFAULT;
+                    """
+                )
+                cur.execute("CREATE INDEX IF NOT EXISTS applicantdata_p_id_idx ON applicantData (p_id);")
+            # tables created before the normalized columns existed gain them here,
+            # with codes derived for the rows they already hold
             cur.execute(
+                f"""
+                DO $$
+                BEGIN
+                    IF NOT EXISTS (
+                        SELECT 1 FROM information_schema.columns
+                        WHERE table_schema = current_schema()
+                          AND table_name = 'applicantdata' AND column_name = 'term_season'
+                    ) THEN
+                        ALTER TABLE applicantData
+                            ADD COLUMN term_season SMALLINT,
+                            ADD COLUMN term_year SMALLINT,
+                            ADD COLUMN status_code SMALLINT,
+                            ADD COLUMN citizenship_code SMALLINT;
+                        UPDATE applicantData SET {normalized_codes_sql()};
+                    END IF;
+                END $$;
                 """
+            )
+            # add the remaining columns to tables created before they existed
+            cur.execute(
+                """
+                ALTER TABLE applicantData
+                    ADD COLUMN IF NOT EXISTS term_season SMALLINT,
+                    ADD COLUMN IF NOT EXISTS term_year SMALLINT,
+                    ADD COLUMN IF NOT EXISTS status_code SMALLINT,
+                    ADD COLUMN IF NOT EXISTS citizenship_code SMALLINT,
+                    ADD COLUMN IF NOT EXISTS program_id INTEGER REFERENCES program (id),
+                    ADD COLUMN IF NOT EXISTS university_id INTEGER REFERENCES university (id),
+                    ADD COLUMN IF NOT EXISTS record_hash TEXT;
+                """
+            )
+            # composite indexes serving the term/status/citizenship filters in QUERIES;
+            # gpa is included so the GPA averages can be answered from the index alone
+            cur.execute(
+                """
+                CREATE INDEX IF NOT EXISTS applicantdata_term_status_idx
+                ON applicantData (term_year, term_season, status_code, citizenship_code)
+                INCLUDE (gpa);
+                """
+            )
+            cur.execute(
+                """
+                CREATE INDEX IF NOT EXISTS applicantdata_year_status_idx
+                ON applicantData (term_year, status_code);
+                """
+            )
+            # school queries join the small dimension tables to these integer keys
+            cur.execute(
+                """
+                CREATE INDEX IF NOT EXISTS applicantdata_university_program_idx
+                ON applicantData (university_id, program_id);
+                """
+            )
+            # trigram index for ad-hoc substring search over the raw program text
+            cur.execute(
+                """
+                CREATE INDEX IF NOT EXISTS applicantdata_program_trgm_idx
+                ON applicantData USING gin (program gin_trgm_ops);
+                """
+            )
+            # create unique index on url to avoid duplicates in database; unique
+            # indexes on a partitioned table must include term_year, so there
+            # drop_known_urls dedupes on url and this index serves its lookups
+            conflict_key = "url, term_year" if partitioned else "url"
+            cur.execute(
+                f"""
                 CREATE UNIQUE INDEX IF NOT EXISTS applicantdata_url_key
-                ON applicantData (url);
+                ON applicantData ({conflict_key});
                 """
             )
-            # find next available p_id
-            cur.execute("SELECT COALESCE(MAX(p_id), 0) FROM applicantData;")
-            max_id = cur.fetchone()[0]
-
-            # clean data for load into db and create list of tuples
-            rows = []
-            for idx, record in enumerate(records, start=max_id + 1):
-                rows.append(
-                    (
-                        idx,
-                        clean_text(record.get("program")),
-                        clean_text(record.get("comments")),
-                        clean_text(record.get("date_added")),
-                        clean_text(record.get("url")),
-                        clean_text(record.get("applicant_status")),
-                        clean_text(record.get("semester_year_start")),
-                        clean_text(record.get("citizenship")),
-                        parse_number(record.get("gpa")),
-                        parse_number(record.get("gre")),
-                        parse_number(record.get("gre_v")),
-                        parse_number(record.get("gre_aw")),
-                        clean_text(record.get("masters_or_phd")),
-                        clean_text(record.get("llm-generated-program")),
-                        clean_text(record.get("llm-generated-university")),
-                    )
+            # reserve p_id values from the sequence
+            create_p_id_sequence(cur)
+            if incremental:
+                # changed records are replaced under their existing p_id
+                total = len(records)
+                new, changed, changed_ids = diff_records(cur, records)
+                if changed_ids:
+                    cur.execute("DELETE FROM applicantData WHERE p_id = ANY(%s);", (changed_ids,))
+                records = [record for record, _ in changed + new]
+                digests = [digest for _, digest in changed + new]
+                ids = changed_ids + reserve_p_ids(cur, len(new))
+                print(
+                    f"{len(new)} new, {len(changed)} changed and "
+                    f"{total - len(records)} unchanged or repeated records in {sourcefile}."
                 )
-            # insert each row into the table
-            cur.executemany(
-                """
-                INSERT INTO applicantData (
-                    p_id, program, comments, date_added, url, status, term,
-                    us_or_international, gpa, gre, gre_v, gre_aw, degree,
-                    llm_generated_program, llm_generated_university
+            else:
+                digests = None
+                ids = reserve_p_ids(cur, len(records))
+
+            if partitioned:
+                ids, records, digests = drop_known_urls(cur, ids, records, digests)
+
+            if workers > 1 and len(records) > LOAD_SHARD_SIZE:
+                bad_dates = load_sharded(
+                    connection, cleanup, ids, records, digests, workers, partitioned, conflict_key
                 )
-                /* value placeholders for each tuple */
-                /* converts date string to valid format or null if empty */
-                VALUES (
-                    %s, %s, %s,
-                    to_date(NULLIF(%s, ''), 'Month DD, YYYY'),
-                    %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s
+            else:
+                # clean data for load into db and create list of tuples; the canonical
+                # names are repeated for the program_id / university_id lookups
+                bad_dates = []
+                cleaned = clean_batch(ids, records, bad_dates, digests)
+                years = {row[TERM_YEAR_INDEX] for row in cleaned}
+                rows = [(*row, row[LLM_PROGRAM_INDEX], row[LLM_UNIVERSITY_INDEX]) for row in cleaned]
+                if partitioned:
+                    create_year_partitions(cur, years)
+                # insert each row into the table
+                cur.executemany(
+                    f"""
+                    INSERT INTO applicantData (
+                        p_id, program, comments, date_added, url, status, term,
+                        us_or_international, gpa, gre, gre_v, gre_aw, degree,
+                        llm_generated_program, llm_generated_university, record_hash,
+                        term_season, term_year, status_code, citizenship_code,
+                        program_id, university_id
+                    )
+                    /* value placeholders for each tuple; date_added arrives as a date */
+                    VALUES (
+                        %s, %s, %s, %s,
+                        %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s,
+                        %s, %s, %s, %s,
+                        /* foreign keys resolved by exact canonical name */
+                        (SELECT id FROM program WHERE name = %s),
+                        (SELECT id FROM university WHERE name = %s)
+                    )
+                    /* skip ids where one already exists */
+                    ON CONFLICT ({conflict_key}) DO NOTHING;
+                    """,
+                    rows,
+                )
+            if incremental:
+                cur.execute(
+                    """
+                    INSERT INTO load_state (sourcefile, content_hash) VALUES (%s, %s)
+                    ON CONFLICT (sourcefile)
+                    DO UPDATE SET content_hash = EXCLUDED.content_hash, loaded_at = now();
+                    """,
+                    (sourcefile, content_hash),
                 )
-                /* skip ids where one already exists */
-                ON CONFLICT (url) DO NOTHING;
-                """,
-                rows,
-            )
 
-    print(f"Loaded {len(rows)} records into applicantData from {sourcefile}.")
+    report_bad_dates(bad_dates)
+    print(f"Loaded {len(records)} records into applicantData from {sourcefile}.")
@@ -1,25 +1,41 @@
 """SQL query definitions used by the analytics view and CLI test output.
 
-The ``QUERIES`` constant provides ordered prompt text, output prefixes, and
-SQL statements consumed by the Flask UI and standalone execution path.
+``CATALOG`` holds each analysis query once, written against named parameters
+(term, status, degree and schools). ``run_catalog`` executes them as
+server-side prepared statements for any parameter set; labels and prefixes
+name the term, status, degree and schools actually queried when they differ
+from the defaults. ``QUERIES``
+provides the ordered prompt text, output prefixes and SQL rendered with the
+default parameters, consumed by the snapshot tools and standalone execution path.
+Term, status and citizenship filters use the small-int columns populated by
+``load_data`` so they can be answered from the composite indexes. The LLM
+school queries (7a, 8a) match names in the small ``program``/``university``
+dimension tables, filter on the resulting integer keys and fall back to the
+LLM text only for rows that have no key.
 """
 
 import psycopg
 
+from load_data import CITIZENSHIP_CODES, STATUS_CODES, parse_term
+
+REJECTED = STATUS_CODES["rejected"]
+AMERICAN = CITIZENSHIP_CODES["american"]
+INTERNATIONAL = CITIZENSHIP_CODES["international"]
+OTHER = CITIZENSHIP_CODES["other"]
+
 
 QUERY_1 = """
 SELECT COUNT(*) AS count_fall_2026
 FROM applicantData
-WHERE term = 'Fall 2026';
+WHERE term_year = %(term_year)s
+  AND term_season = %(term_season)s;
 """
 
-QUERY_2 = """
+QUERY_2 = f"""
 SELECT ROUND(
     100.0 * SUM(
         CASE
-            WHEN us_or_international IS NOT NULL
-             AND us_or_international NOT ILIKE 'American'
-             AND us_or_international NOT ILIKE 'Other'
+            WHEN citizenship_code NOT IN ({AMERICAN}, {OTHER})
             THEN 1
             ELSE 0
         END
@@ -39,100 +55,89 @@ SELECT
 FROM applicantData;
 """
 
-QUERY_4 = """
+QUERY_4 = f"""
 SELECT ROUND(AVG(gpa)::numeric, 2) AS avg_gpa_american_fall_2026
 FROM applicantData
-WHERE term = 'Fall 2026'
-  AND us_or_international ILIKE 'American'
+WHERE term_year = %(term_year)s
+  AND term_season = %(term_season)s
+  AND citizenship_code = {AMERICAN}
   AND gpa IS NOT NULL;
 """
 
 QUERY_5 = """
 SELECT ROUND(
-    100.0 * SUM(CASE WHEN status ILIKE 'Accepted' THEN 1 ELSE 0 END)
+    100.0 * SUM(CASE WHEN status_code = %(status_code)s THEN 1 ELSE 0 END)
     / NULLIF(COUNT(*), 0),
     2
 ) AS pct_accepted_fall_2026
 FROM applicantData
-WHERE term = 'Fall 2026';
+WHERE term_year = %(term_year)s
+  AND term_season = %(term_season)s;
 """
 
 QUERY_6 = """
 SELECT ROUND(AVG(gpa)::numeric, 2) AS avg_gpa_fall_2026_accepted
 FROM applicantData
-WHERE term = 'Fall 2026'
-  AND status ILIKE 'Accepted'
+WHERE term_year = %(term_year)s
+  AND term_season = %(term_season)s
+  AND status_code = %(status_code)s
   AND gpa IS NOT NULL;
 """
 
 QUERY_7 = """
 SELECT COUNT(*) AS count_jhu_ms_cs
 FROM applicantData
-WHERE degree ILIKE 'Masters%'
-  AND program ILIKE '%Computer Science%'
-  AND (
-      program ILIKE '%Johns Hopkins%'
-      OR program ILIKE '%JHU%'
-  );
+WHERE degree ILIKE %(degree_pattern)s
+  AND program ILIKE '%%Computer Science%%'
+  AND program ILIKE ANY(%(school_patterns)s);
 """
 
 QUERY_7a = """
 SELECT COUNT(*) AS count_jhu_ms_cs_llm
 FROM applicantData
-WHERE degree ILIKE 'Masters%'
-  AND llm_generated_program ILIKE '%Computer Science%'
-  AND (
-      llm_generated_university ILIKE '%Johns Hopkins%'
-      OR llm_generated_university ILIKE '%JHU%'
-  );
+WHERE degree ILIKE %(degree_pattern)s
+  AND (program_id IN (SELECT id FROM program WHERE name ILIKE '%%Computer Science%%')
+       OR (program_id IS NULL AND llm_generated_program ILIKE '%%Computer Science%%'))
+  AND (university_id IN (SELECT id FROM university WHERE name ILIKE ANY(%(school_patterns)s))
+       OR (university_id IS NULL AND llm_generated_university ILIKE ANY(%(school_patterns)s)));
 """
 
 QUERY_8 = """
 SELECT COUNT(*) AS count_cs_phd_2026_acceptances_schools
 FROM applicantData
-WHERE term ILIKE '%2026%'
-  AND status ILIKE 'Accepted'
-  AND degree ILIKE 'PhD%'
-  AND program ILIKE '%Computer Science%'
-  AND (
-      program ILIKE '%Georgetown University%'
-      OR program ILIKE '%MIT%'
-      OR program ILIKE '%Massachusetts Institute of Technology%'
-      OR program ILIKE '%Stanford University%'
-      OR program ILIKE '%Carnegie Mellon University%'
-  );
+WHERE term_year = %(term_year)s
+  AND status_code = %(status_code)s
+  AND degree ILIKE %(degree_pattern)s
+  AND program ILIKE '%%Computer Science%%'
+  AND program ILIKE ANY(%(school_patterns)s);
 """
 
 QUERY_8a = """
 SELECT COUNT(*) AS count_cs_phd_2026_acceptances_schools_llm
 FROM applicantData
-WHERE term ILIKE '%2026%'
-  AND status ILIKE 'Accepted'
-  AND degree ILIKE 'PhD%'
-  AND llm_generated_program ILIKE '%Computer Science%'
-  AND (
-      llm_generated_university ILIKE '%Georgetown University%'
-      OR llm_generated_university ILIKE '%MIT%'
-      OR llm_generated_university ILIKE '%Massachusetts Institute of Technology%'
-      OR llm_generated_university ILIKE '%Stanford University%'
-      OR llm_generated_university ILIKE '%Carnegie Mellon University%'
-  );
+WHERE term_year = %(term_year)s
+  AND status_code = %(status_code)s
+  AND degree ILIKE %(degree_pattern)s
+  AND (program_id IN (SELECT id FROM program WHERE name ILIKE '%%Computer Science%%')
+       OR (program_id IS NULL AND llm_generated_program ILIKE '%%Computer Science%%'))
+  AND (university_id IN (SELECT id FROM university WHERE name ILIKE ANY(%(school_patterns)s))
+       OR (university_id IS NULL AND llm_generated_university ILIKE ANY(%(school_patterns)s)));
 """
 
-QUERY_9 = """
+QUERY_9 = f"""
 SELECT COUNT(*) AS count_engineering_rejected
 FROM applicantData
-WHERE term ILIKE '%2026%'
-  AND status ILIKE 'Rejected'
+WHERE term_year = %(term_year)s
+  AND status_code = {REJECTED}
 ;
 """
 
-QUERY_10 = """
+QUERY_10 = f"""
 SELECT ROUND(
     100.0 * SUM(
-        CASE 
-            WHEN status ILIKE 'Rejected'
-             AND us_or_international NOT ILIKE 'International'
+        CASE
+            WHEN status_code = {REJECTED}
+             AND citizenship_code <> {INTERNATIONAL}
             THEN 1
             ELSE 0
         END
@@ -140,44 +145,249 @@ SELECT ROUND(
     2
 ) AS pct_international_rejected_fall_2026
 FROM applicantData
-WHERE term = 'Fall 2026';
+WHERE term_year = %(term_year)s
+  AND term_season = %(term_season)s;
 """
 
-# list of queries
-QUERIES = [
-    (
-        "1. How many entries do you have in your database who have applied for Fall 2026?",
-        "Answer: Applicant count: ",
-        QUERY_1,
-    ),
-    ("2. What percentage of entries are from international students (not American or Other) (to two decimal places)?",
-     "Answer: Percent International: ",
-     QUERY_2),
-    ("3. What is the average GPA, GRE, GRE V, and GRE AW of applicants who provide these metrics?",
-     "Answer: ",
-     QUERY_3),
-    ("4. What is their average GPA of American students in Fall 2026?)", "Answer: Average GPA American: ", QUERY_4),
-    ("5. What percent of entries for Fall 2026 are Acceptances (to two decimal places)?", "Answer: Acceptance"
-                                                                                          " percent: ", QUERY_5),
-    ("6. What is the average GPA of applicants who applied for Fall 2026 who are Acceptances?", "Answer: Average"
-                                                                                                " GPA Acceptance: ",
-     QUERY_6),
-    ("7. How many entries are from applicants who applied to JHU for a masters degrees in Computer Science?",
-     "Answer: JHU CS Masters Applicants: ", QUERY_7),
-    ("7a. Number of applicants who applied to JHU for MS Computer Science degrees (LLM)",
-     "Answer: JHU CS Masters Applicants (LLM): ",
-     QUERY_7a),
-    ("8. How many entries from 2026 are acceptances from applicants who applied to Georgetown University, MIT,"
-     " Stanford University, or Carnegie Mellon University for a PhD in Computer Science?",
-     "Answer: 2026 Acceptances for CS PhD at Georgetown, Stanford and Carnegie Mellon: ", QUERY_8),
-    ("8a. Number of 2026 acceptances for CS PhD at Georgetown, MIT, Stanford, Carnegie Mellon (LLM)",
-     "Answer: 2026 Acceptances for CS PhD at Georgetown, Stanford and Carnegie Mellon (LLM): ", QUERY_8a),
-    ("9. Number of rejected engineering applicants for Fall 2026", "Answer: Count of rejected Engineering applicants"
-                                                                   " for Fall 2026: ", QUERY_9),
-    ("10. Percent of rejected international engineering applicants for Fall 2026",
-     "Answer: Percent of rejected international engineering applicants for Fall 2026: ", QUERY_10)
+
+# request parameters and their defaults; degree and schools also default per query
+DEFAULT_PARAMS = {"term": "Fall 2026", "status": "Accepted"}
+JHU_SCHOOLS = ["Johns Hopkins", "JHU"]
+TOP_CS_SCHOOLS = [
+    "Georgetown University",
+    "MIT",
+    "Massachusetts Institute of Technology",
+    "Stanford University",
+    "Carnegie Mellon University",
+]
+TOP_CS_LABEL = "Georgetown University, MIT, Stanford University, or Carnegie Mellon University"
+
+# catalog of (key, label, prefix, sql, per-query defaults); labels may use {term} and {year}.
+# "named" gives the label and prefix used once status, degree or schools are overridden,
+# which may also use {status}, {degree} and {school} (school_label names the default schools)
+CATALOG = [
+    ("q1", "1. How many entries do you have in your database who have applied for {term}?",
+     "Answer: Applicant count: ", QUERY_1, {}),
+    ("q2", "2. What percentage of entries are from international students (not American or Other)"
+           " (to two decimal places)?",
+     "Answer: Percent International: ", QUERY_2, {}),
+    ("q3", "3. What is the average GPA, GRE, GRE V, and GRE AW of applicants who provide these metrics?",
+     "Answer: ", QUERY_3, {}),
+    ("q4", "4. What is their average GPA of American students in {term}?)",
+     "Answer: Average GPA American: ", QUERY_4, {}),
+    ("q5", "5. What percent of entries for {term} are Acceptances (to two decimal places)?",
+     "Answer: Acceptance percent: ", QUERY_5,
+     {"named": ("5. What percent of entries for {term} are {status} (to two decimal places)?",
+                "Answer: {status} percent: ")}),
+    ("q6", "6. What is the average GPA of applicants who applied for {term} who are Acceptances?",
+     "Answer: Average GPA Acceptance: ", QUERY_6,
+     {"named": ("6. What is the average GPA of applicants who applied for {term} who are {status}?",
+                "Answer: Average GPA {status}: ")}),
+    ("q7", "7. How many entries are from applicants who applied to JHU for a masters degrees in Computer Science?",
+     "Answer: JHU CS Masters Applicants: ", QUERY_7,
+     {"degree": "Masters", "schools": JHU_SCHOOLS, "school_label": "JHU",
+      "named": ("7. How many entries are from applicants who applied to {school} for a {degree} degree"
+                " in Computer Science?",
+                "Answer: {school} CS {degree} Applicants: ")}),
+    ("q7a", "7a. Number of applicants who applied to JHU for MS Computer Science degrees (LLM)",
+     "Answer: JHU CS Masters Applicants (LLM): ", QUERY_7a,
+     {"degree": "Masters", "schools": JHU_SCHOOLS, "school_label": "JHU",
+      "named": ("7a. Number of applicants who applied to {school} for {degree} Computer Science degrees (LLM)",
+                "Answer: {school} CS {degree} Applicants (LLM): ")}),
+    ("q8", "8. How many entries from {year} are acceptances from applicants who applied to Georgetown University,"
+           " MIT, Stanford University, or Carnegie Mellon University for a PhD in Computer Science?",
+     "Answer: {year} Acceptances for CS PhD at Georgetown, Stanford and Carnegie Mellon: ", QUERY_8,
+     {"degree": "PhD", "schools": TOP_CS_SCHOOLS, "school_label": TOP_CS_LABEL,
+      "named": ("8. How many entries from {year} are {status} applicants who applied to {school}"
+                " for a {degree} in Computer Science?",
+                "Answer: {year} {status} for CS {degree} at {school}: ")}),
+    ("q8a", "8a. Number of {year} acceptances for CS PhD at Georgetown, MIT, Stanford, Carnegie Mellon (LLM)",
+     "Answer: {year} Acceptances for CS PhD at Georgetown, Stanford and Carnegie Mellon (LLM): ", QUERY_8a,
+     {"degree": "PhD", "schools": TOP_CS_SCHOOLS, "school_label": TOP_CS_LABEL,
+      "named": ("8a. Number of {year} {status} applicants for CS {degree} at {school} (LLM)",
+                "Answer: {year} {status} for CS {degree} at {school} (LLM): ")}),
+    ("q9", "9. Number of rejected engineering applicants for {term}",
+     "Answer: Count of rejected Engineering applicants for {term}: ", QUERY_9, {}),
+    ("q10", "10. Percent of rejected international engineering applicants for {term}",
+     "Answer: Percent of rejected international engineering applicants for {term}: ", QUERY_10, {}),
 ]
 
+
+# escape LIKE wildcards in user-supplied text
+def like_escape(value):
+    """Return ``value`` with ``LIKE`` wildcards escaped so it matches literally.
+
+    :param value: Raw text.
+    :type value: str
+    :return: Escaped text.
+    :rtype: str
+    """
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+# merge request overrides into the defaults and validate them
+def resolve_params(overrides=None):
+    """Return the effective catalog parameters.
+
+    :param overrides: Any of ``term``, ``status``, ``degree`` (text) and ``schools`` (list).
+    :type overrides: dict | None
+    :return: Defaults updated with the non-empty overrides.
+    :rtype: dict
+    :raises ValueError: If the term or status is not recognized.
+    """
+    params = dict(DEFAULT_PARAMS)
+    params.update({name: value for name, value in (overrides or {}).items() if value})
+    season, year = parse_term(params["term"])
+    if season is None or year is None:
+        raise ValueError(f"Unrecognized term {params['term']!r}; expected e.g. 'Fall 2026'.")
+    if " ".join(params["status"].lower().split()) not in STATUS_CODES:
+        raise ValueError(f"Unrecognized status {params['status']!r}.")
+    return params
+
+
+# turn effective parameters into the SQL placeholders one query uses
+def bind_params(params, query_defaults):
+    """Return the SQL parameter values for one catalog query.
+
+    ``degree`` and ``schools`` overrides replace the defaults of every school
+    query (7 through 8a), so the JHU and the top CS school questions both ask
+    about the requested schools.
+
+    :param params: Effective parameters from :func:`resolve_params`.
+    :type params: dict
+    :param query_defaults: The query's own ``degree``/``schools`` defaults.
+    :type query_defaults: dict
+    :return: Values for the ``%(name)s`` placeholders.
+    :rtype: dict
+    """
+    merged = {**query_defaults, **params}
+    season, year = parse_term(merged["term"])
+    return {
+        "term_season": season,
+        "term_year": year,
+        "status_code": STATUS_CODES[" ".join(merged["status"].lower().split())],
+        "degree_pattern": like_escape(merged.get("degree", "")) + "%",
+        "school_patterns": [f"%{like_escape(school)}%" for school in merged.get("schools", [])],
+    }
+
+
+# render one constant as a SQL literal for the default QUERIES text
+def sql_literal(value):
+    """Return ``value`` written as a SQL literal.
+
+    :param value: Integer, string or list of strings.
+    :return: SQL literal text.
+    :rtype: str
+    """
+    if isinstance(value, list):
+        return "ARRAY[" + ", ".join(sql_literal(item) for item in value) + "]::text[]"
+    if isinstance(value, str):
+        return "'" + value.replace("'", "''") + "'"
+    return str(value)
+
+
+# name the effective parameters in one query's label and prefix
+def label_values(params, query_defaults):
+    """Return the values filling a catalog entry's label and prefix templates.
+
+    :param params: Effective parameters from :func:`resolve_params`.
+    :type params: dict
+    :param query_defaults: The query's own ``degree``/``schools``/``school_label`` defaults.
+    :type query_defaults: dict
+    :return: ``term``, ``year``, ``status``, ``degree`` and ``school`` text.
+    :rtype: dict
+    """
+    merged = {**query_defaults, **params}
+    schools = params.get("schools")
+    return {
+        "term": merged["term"],
+        "year": parse_term(merged["term"])[1],
+        "status": merged["status"],
+        "degree": merged.get("degree", ""),
+        "school": " or ".join(schools) if schools else merged.get("school_label", ""),
+    }
+
+
+# expand the catalog for one parameter set
+def catalog_queries(params):
+    """Return ``(key, label, prefix, sql, sql_params)`` for every catalog entry.
+
+    Labels keep their original wording for the default status, degree and
+    schools; once any of those is overridden, each query switches to its
+    ``named`` text so the label states what was actually queried.
+
+    :param params: Effective parameters from :func:`resolve_params`.
+    :type params: dict
+    :return: Catalog entries with labels formatted and parameters bound.
+    :rtype: list[tuple]
+    """
+    named = (
+        " ".join(params["status"].lower().split()) != DEFAULT_PARAMS["status"].lower()
+        or "degree" in params
+        or "schools" in params
+    )
+    entries = []
+    for key, label, prefix, query, defaults in CATALOG:
+        if named:
+            label, prefix = defaults.get("named", (label, prefix))
+        display = label_values(params, defaults)
+        entries.append(
+            (key, label.format(**display), prefix.format(**display), query, bind_params(params, defaults))
+        )
+    return entries
+
+
+# format a fetched row the way the analysis page shows it
+def format_result(row):
+    """Return the display value of a query result row.
+
+    :param row: Fetched row or ``None``.
+    :type row: tuple | None
+    :return: Combined text for the four-metric row, else the first column.
+    """
+    if row and len(row) > 1:
+        return f"GPA: {row[0]}, GRE: {row[1]}, GRE V: {row[2]}, GRE AW: {row[3]}"
+    return row[0] if row else None
+
+
+# execute every catalog query as a prepared statement
+def run_catalog(cur, overrides=None):
+    """Run the catalog for a parameter set using server-side prepared statements.
+
+    Each query text is prepared once per connection and then reused with new
+    parameter values, so a long-lived connection skips parsing and planning.
+
+    :param cur: Open database cursor.
+    :param overrides: Parameter overrides passed to :func:`resolve_params`.
+    :type overrides: dict | None
+    :return: ``(key, label, prefix, value)`` for every catalog entry.
+    :rtype: list[tuple]
+    """
+    results = []
+    for key, label, prefix, query, sql_params in catalog_queries(resolve_params(overrides)):
+        cur.execute(query, sql_params, prepare=True)
+        results.append((key, label, prefix, format_result(cur.fetchone())))
+    return results
+
+
+# render the catalog as plain SQL text for one parameter set
+def render_queries(overrides=None):
+    """Return ``(label, prefix, sql)`` with every parameter written as a literal.
+
+    :param overrides: Parameter overrides passed to :func:`resolve_params`.
+    :type overrides: dict | None
+    :return: Catalog entries whose SQL runs without bound parameters.
+    :rtype: list[tuple[str, str, str]]
+    """
+    return [
+        (label, prefix, query % {name: sql_literal(value) for name, value in sql_params.items()})
+        for _key, label, prefix, query, sql_params in catalog_queries(resolve_params(overrides))
+    ]
+
+
+# list of queries rendered with the default parameters
+QUERIES = render_queries()
+
 # connect to database and print query results - used for testing purposes
 if __name__ == "__main__":
     with psycopg.connect(
@@ -187,9 +397,4 @@ if __name__ == "__main__":
         with connection.cursor() as cur:
             for label, prefix, query in QUERIES:
                 cur.execute(query)
-                result = cur.fetchone()
-                if result and len(result) > 1:
-                    value = f"GPA: {result[0]}, GRE: {result[1]}, GRE V: {result[2]}, GRE AW: {result[3]}"
-                else:
-                    value = result[0] if result else None
-                print(f"{label}: {prefix}{value if result else None}")
+                print(f"{label}: {prefix}{format_result(cur.fetchone())}")
@@ -0,0 +1,276 @@
+"""Parquet snapshots of the analysis tables for offline analytics.
+
+``export`` copies ``applicantData`` and the ``program``/``university``
+dimension tables out of PostgreSQL into one Parquet file each. ``query`` opens
+a snapshot in DuckDB, where each file is exposed as a view named after its
+table, and runs ``QUERIES`` against it with no database server. ``verify`` runs
+the same queries on PostgreSQL and on a snapshot and reports any answer that
+differs.
+
+Usage::
+
+    python snapshot.py export DIR
+    python snapshot.py query DIR [--term "Spring 2026"] [--status Accepted] [--degree PhD] [--school MIT]
+    python snapshot.py verify DIR
+"""
+
+import argparse
+import os
+import re
+import tempfile
+from decimal import Decimal
+
+import duckdb
+import psycopg
+
+import query_data as qd
+
+# snapshot tables and their columns with DuckDB types, matching the PostgreSQL schema
+SNAPSHOT_TABLES = {
+    "applicantData": (
+        ("p_id", "INTEGER"),
+        ("program", "VARCHAR"),
+        ("comments", "VARCHAR"),
+        ("date_added", "DATE"),
+        ("url", "VARCHAR"),
+        ("status", "VARCHAR"),
+        ("term", "VARCHAR"),
+        ("us_or_international", "VARCHAR"),
+        ("gpa", "DOUBLE"),
+        ("gre", "DOUBLE"),
+        ("gre_v", "DOUBLE"),
+        ("gre_aw", "DOUBLE"),
+        ("degree", "VARCHAR"),
+        ("llm_generated_program", "VARCHAR"),
+        ("llm_generated_university", "VARCHAR"),
+        ("record_hash", "VARCHAR"),
+        ("term_season", "SMALLINT"),
+        ("term_year", "SMALLINT"),
+        ("status_code", "SMALLINT"),
+        ("citizenship_code", "SMALLINT"),
+        ("program_id", "INTEGER"),
+        ("university_id", "INTEGER"),
+    ),
+    "program": (("id", "INTEGER"), ("name", "VARCHAR")),
+    "university": (("id", "INTEGER"), ("name", "VARCHAR")),
+}
+
+STRING_LITERAL = r"'(?:[^']|'')*'"
+ILIKE_LITERAL_RE = re.compile(rf"ILIKE ({STRING_LITERAL})")
+NUMERIC_CAST_RE = re.compile(r"(\w+\([^()]*\))::numeric")
+PERCENT_RE = re.compile(r"(100\.0 \*.*?/ NULLIF\(COUNT\(\*\), 0\))", re.DOTALL)
+ILIKE_ANY_RE = re.compile(r"([\w.]+) ILIKE ANY\(ARRAY\[(.*?)\]::text\[\]\)", re.DOTALL)
+
+
+def snapshot_path(directory, table):
+    """Return the Parquet file of one table in a snapshot directory.
+
+    :param directory: Snapshot directory.
+    :type directory: str
+    :param table: Table name from ``SNAPSHOT_TABLES``.
+    :type table: str
+    :return: File path.
+    :rtype: str
+    """
+    return os.path.join(directory, f"{table.lower()}.parquet")
+
+
+def quote(value):
+    """Return ``value`` as a single-quoted SQL string literal.
+
+    :param value: Text such as a file path.
+    :type value: str
+    :return: SQL literal.
+    :rtype: str
+    """
+    return "'" + value.replace("'", "''") + "'"
+
+
+def export_snapshot(directory):
+    """Write every ``SNAPSHOT_TABLES`` table from PostgreSQL to Parquet.
+
+    Each table is streamed out with ``COPY ... TO STDOUT`` as CSV into a
+    temporary file, which DuckDB reads with explicit column types and writes
+    as Parquet.
+
+    :param directory: Snapshot directory; created if missing.
+    :type directory: str
+    :return: Row count per table.
+    :rtype: dict[str, int]
+    """
+    os.makedirs(directory, exist_ok=True)
+    counts = {}
+    with psycopg.connect(
+        dbname="studentCourses",
+        user="postgres",
+    ) as connection, duckdb.connect() as con, tempfile.TemporaryDirectory() as scratch:
+        with connection.cursor() as cur:
+            for table, columns in SNAPSHOT_TABLES.items():
+                names = ", ".join(name for name, _ in columns)
+                csv_path = os.path.join(scratch, f"{table.lower()}.csv")
+                with open(csv_path, "wb") as handle:
+                    with cur.copy(
+                        f"COPY (SELECT {names} FROM {table} ORDER BY 1) TO STDOUT WITH (FORMAT csv)"
+                    ) as copy:
+                        for data in copy:
+                            handle.write(data)
+                types = ", ".join(f"{quote(name)}: {quote(kind)}" for name, kind in columns)
+                # unquoted empty fields are NULL and quoted ones empty strings, as PostgreSQL writes them
+                con.execute(
+                    f"""
+                    COPY (
+                        SELECT * FROM read_csv({quote(csv_path)}, header = false,
+                                               allow_quoted_nulls = false, columns = {{{types}}})
+                    ) TO {quote(snapshot_path(directory, table))} (FORMAT parquet);
+                    """
+                )
+                counts[table] = con.execute(
+                    f"SELECT COUNT(*) FROM read_parquet({quote(snapshot_path(directory, table))});"
+                ).fetchone()[0]
+    return counts
+
+
+def open_snapshot(directory):
+    """Open a snapshot in an in-memory DuckDB database.
+
+    :param directory: Snapshot directory written by :func:`export_snapshot`.
+    :type directory: str
+    :return: Connection with one view per snapshot table.
+    :rtype: duckdb.DuckDBPyConnection
+    """
+    con = duckdb.connect()
+    for table in SNAPSHOT_TABLES:
+        con.execute(
+            f"CREATE VIEW {table} AS SELECT * FROM read_parquet({quote(snapshot_path(directory, table))});"
+        )
+    return con
+
+
+def to_duckdb(sql):
+    """Rewrite rendered PostgreSQL query text for DuckDB.
+
+    DuckDB needs an explicit ``ESCAPE`` to honour the backslash escapes from
+    ``query_data.like_escape``, and has no ``ILIKE ANY(array)``, which is
+    expanded into ``OR`` terms. A bare ``::numeric`` is ``DECIMAL(18,3)`` in
+    DuckDB and would round averages to three places before ``ROUND``, so the
+    cast is rewritten to keep the 15 significant digits PostgreSQL keeps when
+    converting a ``double precision`` to ``numeric``. DuckDB divides decimals
+    in ``double`` too, so a percentage such as 201 of 20000 (1.005) would round
+    to 1.0 instead of PostgreSQL's 1.01; the quotient gets the same cast.
+
+    :param sql: Query text from ``query_data.render_queries``.
+    :type sql: str
+    :return: Equivalent DuckDB query text.
+    :rtype: str
+    """
+    sql = ILIKE_LITERAL_RE.sub(lambda match: f"ILIKE {match.group(1)} ESCAPE '\\'", sql)
+    sql = NUMERIC_CAST_RE.sub(r"CAST(printf('%.15g', \1) AS DECIMAL(38,15))", sql)
+    sql = PERCENT_RE.sub(r"CAST(printf('%.15g', \1) AS DECIMAL(38,15))", sql)
+
+    def expand(match):
+        column, patterns = match.group(1), re.findall(STRING_LITERAL, match.group(2))
+        terms = [f"{column} ILIKE {pattern} ESCAPE '\\'" for pattern in patterns]
+        return "(" + " OR ".join(terms) + ")" if terms else "FALSE"
+
+    return ILIKE_ANY_RE.sub(expand, sql)
+
+
+def run_queries(con, overrides=None):
+    """Run the rendered ``QUERIES`` against an open snapshot.
+
+    :param con: Connection from :func:`open_snapshot`.
+    :param overrides: Parameter overrides passed to ``query_data.resolve_params``.
+    :type overrides: dict | None
+    :return: ``(label, prefix, value)`` per query.
+    :rtype: list[tuple]
+    """
+    return [
+        (label, prefix, qd.format_result(con.execute(to_duckdb(query)).fetchone()))
+        for label, prefix, query in qd.render_queries(overrides)
+    ]
+
+
+def normalize(row):
+    """Return a row with numbers rounded to two places for comparison.
+
+    PostgreSQL answers the rounded averages as ``numeric`` and DuckDB as
+    ``DECIMAL`` or ``DOUBLE``, so values are compared as rounded floats.
+
+    :param row: Fetched row or ``None``.
+    :type row: tuple | None
+    :return: Comparable row.
+    :rtype: tuple | None
+    """
+    if row is None:
+        return None
+    return tuple(
+        round(float(value), 2) if isinstance(value, (Decimal, float)) else value for value in row
+    )
+
+
+def verify(cur, con, overrides=None):
+    """Compare the answers of PostgreSQL and a snapshot for every query.
+
+    :param cur: Open PostgreSQL cursor.
+    :param con: Connection from :func:`open_snapshot`.
+    :param overrides: Parameter overrides passed to ``query_data.resolve_params``.
+    :type overrides: dict | None
+    :return: ``(label, postgres_row, snapshot_row)`` for each differing query.
+    :rtype: list[tuple]
+    """
+    mismatches = []
+    for label, _prefix, query in qd.render_queries(overrides):
+        cur.execute(query)
+        expected = normalize(cur.fetchone())
+        actual = normalize(con.execute(to_duckdb(query)).fetchone())
+        if expected != actual:
+            mismatches.append((label, expected, actual))
+    return mismatches
+
+
+def main(argv=None):
+    """Run the ``export``, ``query`` or ``verify`` command.
+
+    :param argv: Command-line arguments; defaults to ``sys.argv[1:]``.
+    :type argv: list[str] | None
+    :return: Process exit code; ``1`` when ``verify`` finds differences.
+    :rtype: int
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("command", choices=("export", "query", "verify"))
+    parser.add_argument("directory")
+    parser.add_argument("--term")
+    parser.add_argument("--status")
+    parser.add_argument("--degree")
+    parser.add_argument("--school", action="append", dest="schools")
+    args = parser.parse_args(argv)
+    overrides = {
+        name: getattr(args, name)
+        for name in ("term", "status", "degree", "schools")
+        if getattr(args, name)
+    }
+
+    if args.command == "export":
+        for table, count in export_snapshot(args.directory).items():
+            print(f"Wrote {count} {table} rows to {snapshot_path(args.directory, table)}.")
+        return 0
+
+    with open_snapshot(args.directory) as con:
+        if args.command == "query":
+            for label, prefix, value in run_queries(con, overrides):
+                print(f"{label}: {prefix}{value}")
+            return 0
+        with psycopg.connect(
+            dbname="studentCourses",
+            user="postgres",
+        ) as connection:
+            with connection.cursor() as cur:
+                mismatches = verify(cur, con, overrides)
+    for label, expected, actual in mismatches:
+        print(f"MISMATCH {label}: PostgreSQL {expected} != snapshot {actual}")
+    print(f"{len(qd.QUERIES) - len(mismatches)} of {len(qd.QUERIES)} queries match.")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,190 @@
+"""Backfill LLM-standardized program and university names for new rows.
+
+Freshly scraped rows are loaded with empty ``llm_generated_program`` and
+``llm_generated_university`` columns. This stage reads those rows back, sends
+each distinct ``program`` string once to the module_2 standardizer service
+(``LLM_STANDARDIZER_URL``), and writes the answers back with one bulk UPDATE
+per batch. It runs in its own background process after a pull completes.
+"""
+
+import json
+import os
+
+import psycopg
+import urllib3
+
+BATCH_SIZE = int(os.getenv("LLM_BATCH_SIZE", "64"))
+TIMEOUT_SECONDS = float(os.getenv("LLM_TIMEOUT", "600"))
+
+
+def standardizer_url():
+    """Return the configured standardizer base URL, or ``""`` when disabled.
+
+    :return: Base URL without a trailing slash.
+    :rtype: str
+    """
+    return os.getenv("LLM_STANDARDIZER_URL", "").strip().rstrip("/")
+
+
+# read the urls of the rows written by the last pull
+def read_urls(sourcefile):
+    """Return the non-empty ``url`` values from a saved JSON array.
+
+    :param sourcefile: Path to the JSON file written by ``save_data``.
+    :type sourcefile: str
+    :return: Row URLs in file order.
+    :rtype: list[str]
+    """
+    with open(sourcefile, encoding="utf-8") as handle:
+        records = json.load(handle)
+    return [record["url"] for record in records if record.get("url")]
+
+
+# group rows still missing llm output by their raw program text
+def pending_programs(cur, urls):
+    """Map each distinct program text to the ids of rows still missing LLM output.
+
+    :param cur: Open database cursor.
+    :param urls: Only rows with one of these URLs are considered.
+    :type urls: list[str]
+    :return: Program text mapped to the ``p_id`` values sharing it.
+    :rtype: dict[str, list[int]]
+    """
+    cur.execute(
+        """
+        SELECT p_id, program FROM applicantData
+        WHERE url = ANY(%s)
+          AND (COALESCE(llm_generated_program, '') = ''
+               OR COALESCE(llm_generated_university, '') = '')
+        ORDER BY p_id;
+        """,
+        (urls,),
+    )
+    groups = {}
+    for p_id, program in cur.fetchall():
+        groups.setdefault(program or "", []).append(p_id)
+    return groups
+
+
+# send one batch to the standardizer and read its NDJSON lines back
+def standardize_batch(http, base_url, programs):
+    """Standardize program strings via the service's streamed ``/standardize``.
+
+    :param http: ``urllib3.PoolManager`` used for the request.
+    :param base_url: Standardizer base URL.
+    :type base_url: str
+    :param programs: Raw program strings, each sent once.
+    :type programs: list[str]
+    :return: ``(program, university)`` answers in input order.
+    :rtype: list[tuple[str, str]]
+    """
+    response = http.request(
+        "POST",
+        f"{base_url}/standardize?stream=1",
+        body=json.dumps({"rows": [{"program": p} for p in programs]}),
+        headers={"Content-Type": "application/json", "Accept": "application/x-ndjson"},
+        timeout=TIMEOUT_SECONDS,
+        preload_content=False,
+    )
+    try:
+        if response.status != 200:
+            raise RuntimeError(f"Standardizer returned HTTP {response.status}")
+        answers = []
+        for line in response:
+            if line.strip():
+                row = json.loads(line)
+                answers.append(
+                    (
+                        row.get("llm-generated-program") or "",
+                        row.get("llm-generated-university") or "",
+                    )
+                )
+    finally:
+        response.release_conn()
+    if len(answers) != len(programs):
+        raise RuntimeError(f"Standardizer returned {len(answers)} rows for {len(programs)}")
+    return answers
+
+
+# write one batch of answers back in a single statement
+def update_rows(cur, groups, programs, answers):
+    """Bulk-update the LLM columns and dimension keys for every row sharing each program text.
+
+    :param cur: Open database cursor.
+    :param groups: Program text mapped to ``p_id`` values.
+    :type groups: dict[str, list[int]]
+    :param programs: Program strings of this batch.
+    :type programs: list[str]
+    :param answers: ``(program, university)`` answers aligned with ``programs``.
+    :type answers: list[tuple[str, str]]
+    :return: Number of rows updated.
+    :rtype: int
+    """
+    ids, llm_programs, llm_universities = [], [], []
+    for program, (llm_program, llm_university) in zip(programs, answers):
+        for p_id in groups[program]:
+            ids.append(p_id)
+            llm_programs.append(llm_program)
+            llm_universities.append(llm_university)
+    cur.execute(
+        """
+        UPDATE applicantData AS a
+        SET llm_generated_program = v.program,
+            llm_generated_university = v.university,
+            program_id = (SELECT id FROM program WHERE name = v.program),
+            university_id = (SELECT id FROM university WHERE name = v.university)
+        FROM unnest(%s::int[], %s::text[], %s::text[]) AS v(p_id, program, university)
+        WHERE a.p_id = v.p_id;
+        """,
+        (ids, llm_programs, llm_universities),
+    )
+    return len(ids)
+
+
+def standardize_new_rows(urls, base_url=None, batch_size=BATCH_SIZE):
+    """Fill the LLM columns of the given rows in batches.
+
+    Each batch is committed as soon as it is written, so analysis queries
+    see results while later batches are still being standardized.
+
+    :param urls: URLs of the newly loaded rows.
+    :type urls: list[str]
+    :param base_url: Standardizer base URL; defaults to ``LLM_STANDARDIZER_URL``.
+    :type base_url: str | None
+    :param batch_size: Distinct program strings sent per request.
+    :type batch_size: int
+    :return: Number of rows updated.
+    :rtype: int
+    """
+    base_url = base_url or standardizer_url()
+    if not base_url or not urls:
+        return 0
+
+    http = urllib3.PoolManager()
+    updated = 0
+    with psycopg.connect(
+        dbname="studentCourses",
+        user="postgres",
+    ) as connection:
+        with connection.cursor() as cur:
+            groups = pending_programs(cur, urls)
+            programs = list(groups)
+            for start in range(0, len(programs), batch_size):
+                batch = programs[start:start + batch_size]
+                answers = standardize_batch(http, base_url, batch)
+                updated += update_rows(cur, groups, batch, answers)
+                connection.commit()
+
+    print(f"Standardized {updated} rows via {base_url}.")
+    return updated
+
+
+def run_standardize_job(sourcefile):
+    """Standardize the rows listed in a pull's output file.
+
+    :param sourcefile: Path to the JSON file written by the pull job.
+    :type sourcefile: str
+    :return: Number of rows updated.
+    :rtype: int
+    """
+    return standardize_new_rows(read_urls(sourcefile))
@@ -86,6 +86,31 @@ def test_run_pull_job_calls_dependencies(monkeypatch):
     assert captured["loaded"] == "new_only.json"
 
 
+@pytest.mark.integration
+def test_run_pull_job_starts_standardize_worker(monkeypatch):
+    """Ensure new rows are handed to a standardize subprocess when configured."""
+    # test run_pull_job launches the standardize worker only when enabled and rows exist
+    captured = []
+
+    def fake_popen(args):
+        captured.append(args)
+
+    monkeypatch.setattr(flask_app_module.sd, "scrape_data", lambda *_args, **_kwargs: [{"row": 1}])
+    monkeypatch.setattr(flask_app_module.sd, "save_data", lambda *_args, **_kwargs: None)
+    monkeypatch.setattr(flask_app_module.ld, "load", lambda *_args, **_kwargs: None)
+    monkeypatch.setattr(flask_app_module.subprocess, "Popen", fake_popen)
+
+    monkeypatch.delenv("LLM_STANDARDIZER_URL", raising=False)
+    flask_app_module.run_pull_job()
+    assert captured == []
+
+    monkeypatch.setenv("LLM_STANDARDIZER_URL", "http://localhost:8000")
+    flask_app_module.run_pull_job()
+    assert captured == [
+        [sys.executable, flask_app_module.__file__, "--run-standardize-job", "new_only.json"]
+    ]
+
+
 @pytest.mark.integration
 def test_perform_update_analysis_clears_cache():
     """Ensure analysis cache reset empties stored results."""
@@ -179,25 +204,21 @@ def test_index_uses_cached_results_when_skip_queries(monkeypatch):
 
 
 @pytest.mark.integration
-def test_index_queries_and_formats_results(monkeypatch):
-    """Ensure index view executes queries and formats row variants correctly."""
-    # test index executes queries and formats results for multi, single, and None rows
+def test_index_queries_and_formats_results(monkeypatch, capsys):
+    """Ensure index view runs the default catalog and formats row variants correctly."""
+    # test index runs the prepared catalog, formats multi, single, and None rows, and caches them
     flask_app_module.LAST_RESULTS = []
-
-    fake_queries = [
-        ("Multi", "Answer: ", "SELECT multi"),
-        ("Single", "Answer: ", "SELECT single"),
-        ("None", "Answer: ", "SELECT none"),
-    ]
+    calls = []
 
     class FakeCursor:
         def __init__(self):
             self._result = None
 
-        def execute(self, query):
-            if "multi" in query:
+        def execute(self, query, params=None, prepare=None):
+            calls.append((params, prepare))
+            if "AS avg_gpa," in query:
                 self._result = ("3.85", "327.50", "163.50", "4.25")
-            elif "single" in query:
+            elif "AS pct_international\n" in query:
                 self._result = ("50.00",)
             else:
                 self._result = None
@@ -212,30 +233,127 @@ def test_index_queries_and_formats_results(monkeypatch):
             return False
 
     class FakeConnection:
+        closed = False
+
         def cursor(self):
             return FakeCursor()
 
+    def fake_render_template(_name, **context):
+        return context
+
+    monkeypatch.setattr(flask_app_module, "QUERY_CONNECTION", FakeConnection())
+    monkeypatch.setattr(flask_app_module, "render_template", fake_render_template)
+
+    app = flask_app_module.create_app()
+    with app.test_request_context("/analysis"):
+        context = flask_app_module.index()
+
+    results = context["results"]
+    assert [label for label, _prefix, _value in results] == [
+        label for label, _prefix, _query in flask_app_module.qd.QUERIES
+    ]
+    assert results[1][2] == "50.00"
+    assert results[2][2] == "GPA: 3.85, GRE: 327.50, GRE V: 163.50, GRE AW: 4.25"
+    assert results[0][2] is None
+    assert all(prepare is True for _params, prepare in calls)
+    assert flask_app_module.LAST_RESULTS == results
+    assert "Answer: Percent International: 50.00" in capsys.readouterr().out
+
+
+@pytest.mark.integration
+def test_get_query_connection_reuses_open_connection(monkeypatch):
+    """Ensure the prepared-statement connection is reused until it closes."""
+    # test get_query_connection opens once, reuses, and reopens after close
+    class FakeConnection:
+        def __init__(self):
+            self.closed = False
+            self.autocommit = False
+
+    opened = []
+
+    def fake_get_db_connection():
+        opened.append(FakeConnection())
+        return opened[-1]
+
+    monkeypatch.setattr(flask_app_module, "QUERY_CONNECTION", None)
+    monkeypatch.setattr(flask_app_module, "get_db_connection", fake_get_db_connection)
+
+    first = flask_app_module.get_query_connection()
+    assert first.autocommit is True
+    assert flask_app_module.get_query_connection() is first
+    first.closed = True
+    assert flask_app_module.get_query_connection() is not first
+    assert len(opened) == 2
+
+
+@pytest.mark.integration
+def test_index_and_api_run_parameterized_catalog(monkeypatch):
+    """Ensure query-string parameters run the prepared catalog on the page and API."""
+    # test index/API pass term, status, degree, and repeated school params to the catalog
+    calls = []
+
+    class FakeCursor:
+        def execute(self, query, params=None, prepare=None):
+            calls.append((params, prepare))
+
+        def fetchone(self):
+            return (5,)
+
         def __enter__(self):
             return self
 
         def __exit__(self, exc_type, exc, tb):
             return False
 
+    class FakeConnection:
+        closed = False
+
+        def cursor(self):
+            return FakeCursor()
+
     def fake_render_template(_name, **context):
         return context
 
-    monkeypatch.setattr(flask_app_module.qd, "QUERIES", fake_queries)
-    monkeypatch.setattr(flask_app_module, "get_db_connection", lambda: FakeConnection())
+    monkeypatch.setattr(flask_app_module, "QUERY_CONNECTION", FakeConnection())
     monkeypatch.setattr(flask_app_module, "render_template", fake_render_template)
+    flask_app_module.LAST_RESULTS = [("cached", "Answer: ", "value")]
 
     app = flask_app_module.create_app()
-    with app.test_request_context("/analysis"):
+    query = "/analysis?term=Spring+2025&degree=PhD&school=Stanford+University&school=+&status="
+    with app.test_request_context(query):
         context = flask_app_module.index()
 
-    results = context["results"]
-    assert results[0][2] == "GPA: 3.85, GRE: 327.50, GRE V: 163.50, GRE AW: 4.25"
-    assert results[1][2] == "50.00"
-    assert results[2][2] is None
+    assert context["results"][0] == (
+        "1. How many entries do you have in your database who have applied for Spring 2025?",
+        "Answer: Applicant count: ",
+        5,
+    )
+    assert context["params"]["schools"] == ["Stanford University"]
+    assert calls[6][0]["school_patterns"] == ["%Stanford University%"]
+    assert calls[8][0]["school_patterns"] == ["%Stanford University%"]
+    # labels name the schools and degree actually queried
+    assert context["results"][6][1] == "Answer: Stanford University CS PhD Applicants: "
+    assert "applied to Stanford University for a PhD" in context["results"][8][0]
+    assert all(prepare is True for _params, prepare in calls)
+    assert flask_app_module.LAST_RESULTS == [("cached", "Answer: ", "value")]
+
+    with app.test_request_context("/analysis?term=someday"):
+        context = flask_app_module.index()
+    assert "Unrecognized term 'someday'" in context["messages"][0]
+    assert all(value is None for _label, _prefix, value in context["results"])
+
+    client = app.test_client()
+    response = client.get("/api/analysis", query_string={"status": "Rejected"})
+    assert response.status_code == 200
+    body = response.get_json()
+    assert body["ok"] is True
+    assert body["params"] == {"term": "Fall 2026", "status": "Rejected"}
+    assert [item["key"] for item in body["results"]][:3] == ["q1", "q2", "q3"]
+    assert body["results"][0]["value"] == 5
+
+    bad = client.get("/api/analysis", query_string={"status": "Pending"})
+    assert bad.status_code == 400
+    assert bad.get_json()["ok"] is False
 
 
 @pytest.mark.integration
@@ -298,6 +416,7 @@ def test_create_app_registers_routes():
     assert "/analysis" in routes
     assert "/pull-data" in routes
     assert "/update-analysis" in routes
+    assert "/api/analysis" in routes
 
 
 @pytest.mark.integration
@@ -337,6 +456,26 @@ def test_main_run_pull_job_branch(monkeypatch):
     assert captured["loaded"][0] == "new_only.json"
 
 
+@pytest.mark.integration
+def test_main_run_standardize_job_branch(monkeypatch):
+    """Ensure ``app`` main module executes standardize-job branch and exits cleanly."""
+    # test __main__ run-standardize-job branch passes the source file and exits
+    fake_standardize = types.ModuleType("standardize")
+    captured = {}
+
+    def fake_run_standardize_job(sourcefile):
+        captured["sourcefile"] = sourcefile
+
+    fake_standardize.run_standardize_job = fake_run_standardize_job
+    monkeypatch.setitem(sys.modules, "standardize", fake_standardize)
+    monkeypatch.setattr(sys, "argv", ["app.py", "--run-standardize-job", "new_only.json"])
+
+    with pytest.raises(SystemExit):
+        runpy.run_module("app", run_name="__main__")
+
+    assert captured["sourcefile"] == "new_only.json"
+
+
 @pytest.mark.integration
 def test_main_default_branch_runs_load_and_server(monkeypatch):
     """Ensure default main branch loads seed data and starts Flask server."""
@@ -348,8 +487,8 @@ def test_main_default_branch_runs_load_and_server(monkeypatch):
 
     captured = {"loaded": None, "run": None}
 
-    def fake_load(sourcefile, reset=False):
-        captured["loaded"] = (sourcefile, reset)
+    def fake_load(sourcefile, reset=False, incremental=False):
+        captured["loaded"] = (sourcefile, reset, incremental)
 
     def fake_run(self, host=None, port=None, debug=None):
         captured["run"] = (host, port, debug)
@@ -364,5 +503,5 @@ def test_main_default_branch_runs_load_and_server(monkeypatch):
 
     runpy.run_module("app", run_name="__main__")
 
-    assert captured["loaded"] == ("llm_extend_applicant_data.json", True)
+    assert captured["loaded"] == ("llm_extend_applicant_data.json", False, True)
     assert captured["run"] == ("0.0.0.0", 8080, True)
@@ -0,0 +1,46 @@
+"""Tests for the scalar vs columnar cleaning benchmark."""
+
+import json
+import runpy
+import sys
+
+import pytest
+
+import bench_clean
+
+
+@pytest.mark.integration
+def test_bench_clean_reports_identical_output(tmp_path, capsys):
+    """Ensure the benchmark times both paths and confirms identical rows."""
+    # test run/main over a small saved crawl
+    data = tmp_path / "crawl.json"
+    data.write_text(
+        json.dumps(
+            [
+                {"program": "CS, U", "url": "u1", "gpa": "3.90", "date_added": "January 10, 2025"},
+                {"program": "DS, V", "url": "u2", "gpa": "3.80", "date_added": "not a date"},
+            ]
+        ),
+        encoding="utf-8",
+    )
+
+    report = bench_clean.main(["--data", str(data), "--repeat", "2", "--scale", "3"])
+
+    assert report["rows"] == 6
+    assert report["identical"] is True
+    assert report["scalar_rows_per_s"] > 0 and report["batch_rows_per_s"] > 0
+    assert "identical output: True" in capsys.readouterr().out
+    assert bench_clean.run([], repeat=1)["scalar_rows_per_s"] == 0.0
+
+
+@pytest.mark.integration
+def test_bench_clean_main_module(tmp_path, monkeypatch, capsys):
+    """Ensure the module runs as a script."""
+    # test __main__ parses sys.argv
+    data = tmp_path / "crawl.json"
+    data.write_text(json.dumps([{"program": "CS, U"}]), encoding="utf-8")
+    monkeypatch.setattr(sys, "argv", ["bench_clean.py", "--data", str(data), "--repeat", "1"])
+
+    runpy.run_module("bench_clean", run_name="__main__")
+
+    assert "1 records from" in capsys.readouterr().out
@@ -13,7 +13,9 @@ def app():
     flask_app.config["TESTING"] = True
     flask_app_module.PULL_DATA_PROCESS = None
     flask_app_module.LAST_RESULTS = []
+    flask_app_module.QUERY_CONNECTION = None
     yield flask_app
+    flask_app_module.QUERY_CONNECTION = None
 
 
 @pytest.fixture()
@@ -86,7 +88,7 @@ def test_end_to_end_pull_update_render_flow(client, monkeypatch):
             self._result = None
 
         # sets tuple results for SQL query
-        def execute(self, query):
+        def execute(self, query, params=None, prepare=None):
             if "AS pct_international_rejected_fall_2026" in query:
                 self._result = ("12.34",)
             elif "COUNT(*) AS count_fall_2026" in query:
@@ -128,6 +130,8 @@ def test_end_to_end_pull_update_render_flow(client, monkeypatch):
 
     # mock database connection
     class FakeConnection:
+        closed = False
+
         def cursor(self):
             return FakeCursor()
 
@@ -1,7 +1,9 @@
 """Integration tests for JSON loading and value normalization helpers."""
 
 import io
+import json
 import builtins
+import datetime
 
 import pytest
 
@@ -19,6 +21,122 @@ def test_clean_text_and_parse_number():
     assert load_data_module.parse_number("No number") is None
 
 
+@pytest.mark.integration
+def test_parse_term_and_encode_codes():
+    """Ensure term text splits into season/year and labels map to small-int codes."""
+    # test parse_term and encode for known, unknown, and missing values
+    fall = load_data_module.SEASON_CODES["fall"]
+    assert load_data_module.parse_term("Fall 2026") == (fall, 2026)
+    assert load_data_module.parse_term("fall  2026") == (fall, 2026)
+    assert load_data_module.parse_term("2025") == (None, 2025)
+    assert load_data_module.parse_term("") == (None, None)
+    assert load_data_module.parse_term(None) == (None, None)
+
+    codes = load_data_module.STATUS_CODES
+    assert load_data_module.encode("Wait  Listed", codes) == codes["wait listed"]
+    assert load_data_module.encode("Withdrawn", codes) == load_data_module.UNKNOWN_CODE
+    assert load_data_module.encode(None, codes) is None
+
+
+@pytest.mark.integration
+def test_normalized_codes_sql_mirrors_parse_term_and_encode():
+    """Ensure the backfill expressions use the same code maps and patterns as the loader."""
+    # test every season/status/citizenship label appears with its code, unknowns map to 0
+    sql = load_data_module.normalized_codes_sql()
+    assert "(?i)\\y(spring|summer|fall|winter)\\y" in sql
+    assert "term_year = substring(term FROM '\\y(\\d{4})\\y')::smallint" in sql
+    for codes in (load_data_module.SEASON_CODES, load_data_module.STATUS_CODES,
+                  load_data_module.CITIZENSHIP_CODES):
+        for label, code in codes.items():
+            assert f"WHEN '{label}' THEN {code}" in sql
+    assert "CASE WHEN status IS NOT NULL THEN COALESCE(" in sql
+    assert "END, 0) END" in sql
+
+
+@pytest.mark.integration
+def test_parse_date_is_memoized_and_tolerant():
+    """Ensure dates parse in Python, bad ones become None, and repeats hit the cache."""
+    # test valid, blank and invalid date_added values and the memo
+    load_data_module.parse_date.cache_clear()
+    assert load_data_module.parse_date("January 10, 2025") == datetime.date(2025, 1, 10)
+    assert load_data_module.parse_date(" february 2, 2025 ") == datetime.date(2025, 2, 2)
+    assert load_data_module.parse_date("January 10, 2025") == datetime.date(2025, 1, 10)
+    assert load_data_module.parse_date.cache_info().hits == 1
+    assert load_data_module.parse_date("") is None
+    assert load_data_module.parse_date("   ") is None
+    assert load_data_module.parse_date(None) is None
+    assert load_data_module.parse_date("February 30, 2025") is None
+    assert load_data_module.parse_date("10/01/2025") is None
+
+    bad_dates = []
+    row = load_data_module.clean_record(7, {"date_added": "soon", "url": "u"}, bad_dates)
+    assert row[3] is None
+    assert bad_dates == ["soon"]
+    load_data_module.clean_record(8, {"date_added": " "}, bad_dates)
+    assert bad_dates == ["soon"]
+
+
+@pytest.mark.integration
+def test_read_canon_and_seed_dimensions(tmp_path, monkeypatch):
+    """Ensure canon files seed both dimension tables with distinct names."""
+    # test read_canon skips blanks/duplicates and create_dimensions seeds both tables
+    unis = tmp_path / "canon_universities.txt"
+    unis.write_text("Johns Hopkins University\n\nStanford University\nJohns Hopkins University\n", encoding="utf-8")
+    monkeypatch.setattr(load_data_module, "CANON_UNIS_PATH", str(unis))
+    monkeypatch.setattr(load_data_module, "CANON_PROGS_PATH", str(tmp_path / "missing.txt"))
+
+    assert load_data_module.read_canon(str(unis)) == ["Johns Hopkins University", "Stanford University"]
+    assert load_data_module.read_canon(str(tmp_path / "missing.txt")) == []
+
+    class FakeCursor:
+        def __init__(self):
+            self.executed = []
+            self.seeded = {}
+
+        def execute(self, query):
+            self.executed.append(" ".join(query.split()))
+
+        def executemany(self, query, rows):
+            self.seeded[query.split()[2]] = list(rows)
+
+    cursor = FakeCursor()
+    load_data_module.create_dimensions(cursor)
+
+    assert cursor.executed[0] == "CREATE EXTENSION IF NOT EXISTS pg_trgm;"
+    assert any("university_name_trgm_idx" in query for query in cursor.executed)
+    assert cursor.seeded == {
+        "university": [("Johns Hopkins University",), ("Stanford University",)],
+        "program": [],
+    }
+
+
+@pytest.mark.integration
+def test_reserve_p_ids_takes_one_nextval_per_block(monkeypatch):
+    """Ensure ids come from the sequence in blocks, not from a MAX scan."""
+    # test ids span several blocks and the sequence starts after existing ids
+    class FakeCursor:
+        def __init__(self):
+            self.executed = []
+            self.next_values = iter([1, 4, 7])
+
+        def execute(self, query):
+            self.executed.append(" ".join(query.split()))
+
+        def fetchone(self):
+            return (next(self.next_values),)
+
+    monkeypatch.setattr(load_data_module, "P_ID_BLOCK", 3)
+    cursor = FakeCursor()
+
+    assert load_data_module.reserve_p_ids(cursor, 7) == [1, 2, 3, 4, 5, 6, 7]
+    assert cursor.executed == ["SELECT nextval('applicantdata_p_id_seq');"] * 3
+    assert load_data_module.reserve_p_ids(cursor, 0) == []
+
+    load_data_module.create_p_id_sequence(cursor)
+    assert "INCREMENT BY 3 OWNED BY applicantData.p_id" in cursor.executed[-1]
+    assert "COALESCE(MAX(p_id), 0) + 1, false" in cursor.executed[-1]
+
+
 @pytest.mark.integration
 def test_load_reads_json_array_and_resets_table(monkeypatch, capsys):
     """Ensure array JSON input loads rows and reset mode recreates state."""
@@ -74,14 +192,27 @@ def test_load_reads_json_array_and_resets_table(monkeypatch, capsys):
         def __exit__(self, exc_type, exc, tb):
             return False
 
+    fake_connection = FakeConnection()
+
     monkeypatch.setattr(builtins, "open", fake_open)
-    monkeypatch.setattr(load_data_module.psycopg, "connect", lambda **_kwargs: FakeConnection())
+    monkeypatch.setattr(load_data_module.psycopg, "connect", lambda **_kwargs: fake_connection)
 
     load_data_module.load("fake.json", reset=True)
 
     captured = capsys.readouterr().out
     assert "Loaded 2 records into applicantData from fake.json." in captured
 
+    # normalized season, year, status and citizenship codes follow the text columns,
+    # then the canonical names used to resolve program_id / university_id
+    cursor = fake_connection.cursor_obj
+    assert cursor.rows[0][-6:] == (3, 2026, 1, 2, "CS", "U")
+    assert cursor.rows[1][-6:] == (3, 2026, 2, 1, "DS", "V")
+    assert any("applicantdata_term_status_idx" in query for query in cursor.executed)
+    assert any("applicantdata_university_program_idx" in query for query in cursor.executed)
+    backfill = next(query for query in cursor.executed if query.startswith("DO $$") and "term_season" in query)
+    assert "column_name = 'term_season'" in backfill
+    assert "UPDATE applicantData SET term_season = CASE" in backfill
+
 
 @pytest.mark.integration
 def test_load_reads_json_lines_and_skips_blank_lines(monkeypatch):
@@ -108,7 +239,7 @@ def test_load_reads_json_lines_and_skips_blank_lines(monkeypatch):
             self.rows = list(rows)
 
         def fetchone(self):
-            return (0,)
+            return (1,)
 
         def __enter__(self):
             return self
@@ -188,3 +319,392 @@ def test_load_handles_empty_file(monkeypatch):
     load_data_module.load("empty.json")
 
     assert fake_connection.cursor_obj.rows == []
+
+
+@pytest.mark.integration
+def test_load_partitions_by_term_year(monkeypatch, capsys):
+    """Ensure partitioned mode creates the year partitions before inserting."""
+    # test partitioned load creates default and per-year partitions and still dedupes on url alone
+    json_content = """
+    [
+      {"program": "CS, U", "url": "u1", "semester_year_start": "Fall 2026"},
+      {"program": "DS, V", "url": "u2", "semester_year_start": "Spring 2025"},
+      {"program": "EE, W", "url": "u3", "semester_year_start": ""},
+      {"program": "DS, V", "url": "u2", "semester_year_start": "Fall 2026"},
+      {"program": "ME, X", "semester_year_start": "Fall 2026"},
+      {"program": "ME, Y", "semester_year_start": "Fall 2026"}
+    ]
+    """
+
+    def fake_open(_path, encoding=None):
+        return io.StringIO(json_content)
+
+    class FakeCursor:
+        def __init__(self, partitioned):
+            self.partitioned = partitioned
+            self.executed = []
+            self.params = []
+            self.insert = None
+            self.rows = None
+
+        def execute(self, query, params=None):
+            self.executed.append(" ".join(query.split()))
+            self.params.append(params)
+
+        def executemany(self, query, rows):
+            self.insert = " ".join(query.split())
+            self.rows = list(rows)
+
+        def fetchone(self):
+            if "relkind" in self.executed[-1]:
+                return (self.partitioned,)
+            return (0,)
+
+        def fetchall(self):
+            # u3 is already stored under another term year
+            return [("u3",)]
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, exc_type, exc, tb):
+            return False
+
+    class FakeConnection:
+        def __init__(self, partitioned):
+            self.cursor_obj = FakeCursor(partitioned)
+
+        def cursor(self):
+            return self.cursor_obj
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, exc_type, exc, tb):
+            return False
+
+    monkeypatch.setattr(builtins, "open", fake_open)
+    monkeypatch.setattr(load_data_module, "PARTITIONED", True)
+
+    fake_connection = FakeConnection(True)
+    monkeypatch.setattr(load_data_module.psycopg, "connect", lambda **_kwargs: fake_connection)
+    load_data_module.load("fake.json", reset=True)
+
+    cursor = fake_connection.cursor_obj
+    assert any("PARTITION BY RANGE (term_year)" in query for query in cursor.executed)
+    assert any("PARTITION OF applicantData DEFAULT" in query for query in cursor.executed)
+    partitions = [query for query in cursor.executed if "FOR VALUES FROM" in query]
+    assert len(partitions) == 2
+    assert "applicantdata_y2025" in partitions[0] and "FROM (2025) TO (2026)" in partitions[0]
+    assert "applicantdata_y2026" in partitions[1]
+    assert "ON CONFLICT (url, term_year) DO NOTHING" in cursor.insert
+    assert not any("NULLS NOT DISTINCT" in query for query in cursor.executed)
+    # known and repeated urls are dropped before inserting, url-less rows are all kept
+    lookup = cursor.executed.index("SELECT url FROM applicantData WHERE url = ANY(%s);")
+    assert "pg_advisory_xact_lock" in cursor.executed[lookup - 1]
+    assert cursor.params[lookup] == (["u1", "u2", "u3", "u2"],)
+    assert [(row[4], row[17]) for row in cursor.rows] == [
+        ("u1", 2026), ("u2", 2025), (None, 2026), (None, 2026)
+    ]
+
+    # a table that already exists unpartitioned keeps the plain url key
+    fake_connection = FakeConnection(False)
+    monkeypatch.setattr(load_data_module.psycopg, "connect", lambda **_kwargs: fake_connection)
+    load_data_module.load("fake.json")
+
+    cursor = fake_connection.cursor_obj
+    assert "reload with reset=True to partition" in capsys.readouterr().out
+    assert not any("FOR VALUES FROM" in query for query in cursor.executed)
+    assert "ON CONFLICT (url) DO NOTHING" in cursor.insert
+    assert len(cursor.rows) == 6
+
+
+@pytest.mark.integration
+def test_load_sharded_copies_shards_then_merges_once(monkeypatch, capsys):
+    """Ensure parallel mode copies each shard to staging and merges in one statement."""
+    # test shards are cleaned by workers, copied into staging, merged, and staging dropped
+    json_content = """
+    [
+      {"program": "CS, U", "url": "u1", "date_added": "January 10, 2025",
+       "semester_year_start": "Fall 2026", "gpa": "GPA 3.90"},
+      {"program": "DS, V", "url": "u2", "semester_year_start": "Spring 2025"},
+      {"program": "EE, W", "url": "u3", "date_added": "Febtember 31, 2025"}
+    ]
+    """
+
+    def fake_open(_path, encoding=None):
+        return io.StringIO(json_content)
+
+    class FakeCopy:
+        def __init__(self, cursor):
+            self.cursor = cursor
+
+        def write_row(self, row):
+            self.cursor.copied.append(row)
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, exc_type, exc, tb):
+            return False
+
+    class FakeCursor:
+        def __init__(self, fail_merge):
+            self.fail_merge = fail_merge
+            self.executed = []
+            self.copied = []
+            self.copies = []
+
+        def execute(self, query, params=None):
+            query = " ".join(query.split())
+            self.executed.append(query)
+            if self.fail_merge and query.startswith("INSERT INTO applicantData"):
+                raise RuntimeError("merge failed")
+
+        def executemany(self, _query, _rows):
+            return None
+
+        def fetchone(self):
+            return (1,)
+
+        def fetchall(self):
+            return []
+
+        def copy(self, statement):
+            self.copies.append(statement)
+            return FakeCopy(self)
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, exc_type, exc, tb):
+            return False
+
+    class FakeConnection:
+        def __init__(self, cursor, autocommit=False):
+            self.cursor_obj = cursor
+            self.autocommit = autocommit
+            self.closed = False
+
+        def cursor(self):
+            return self.cursor_obj
+
+        # like psycopg, a transactional connection commits or rolls back as its block exits
+        def __exit__(self, exc_type, exc, tb):
+            if not self.autocommit:
+                self.cursor_obj.executed.append("COMMIT" if exc_type is None else "ROLLBACK")
+            return False
+
+        def __enter__(self):
+            return self
+
+    def fake_connect(cursor):
+        def connect(**kwargs):
+            connects.append(kwargs)
+            return FakeConnection(cursor, kwargs.get("autocommit", False))
+        return connect
+
+    class InlinePool:
+        def __init__(self, max_workers):
+            self.max_workers = max_workers
+
+        def map(self, func, *iterables):
+            return map(func, *iterables)
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, exc_type, exc, tb):
+            return False
+
+    monkeypatch.setattr(builtins, "open", fake_open)
+    monkeypatch.setattr(load_data_module, "ProcessPoolExecutor", InlinePool)
+    monkeypatch.setattr(load_data_module, "LOAD_SHARD_SIZE", 2)
+    monkeypatch.setattr(load_data_module, "PARTITIONED", True)
+    monkeypatch.setattr(load_data_module, "_WORKER_CONNECTION", None)
+
+    cursor = FakeCursor(fail_merge=False)
+    connects = []
+    monkeypatch.setattr(load_data_module.psycopg, "connect", fake_connect(cursor))
+    load_data_module.load("fake.json", reset=True, workers=2)
+
+    captured = capsys.readouterr().out
+    assert "Stored 1 unparseable date_added values as NULL: 'Febtember 31, 2025'" in captured
+    assert "Loaded 3 records into applicantData from fake.json." in captured
+    # two shards over the same reused worker connection, rows cleaned as in the serial path
+    assert len(cursor.copies) == 2
+    assert cursor.copies[0].startswith("COPY applicantdata_staging_")
+    assert [row[0] for row in cursor.copied] == [1, 2, 3]
+    assert cursor.copied[0][3] == datetime.date(2025, 1, 10)
+    assert cursor.copied[0][8] == 3.9
+    assert cursor.copied[0][16:18] == (3, 2026)
+    staging = cursor.copies[0].split()[1]
+    create = next(query for query in cursor.executed if query.startswith(f"CREATE UNLOGGED TABLE {staging}"))
+    assert "(p_id INTEGER, program TEXT, comments TEXT, date_added DATE," in create
+    assert "applicantData" not in create
+    assert sum("FOR VALUES FROM" in query for query in cursor.executed) == 2
+    merge = next(query for query in cursor.executed if query.startswith("INSERT INTO applicantData"))
+    assert f"FROM {staging} AS s" in merge
+    assert "to_date" not in merge
+    assert "ON CONFLICT (url, term_year) DO NOTHING" in merge
+    # the reset and the merge commit together, and only then is the staging table
+    # dropped, since the merge's lock on it lasts until the commit
+    assert cursor.executed.count("COMMIT") == 1
+    assert cursor.executed[-2:] == ["COMMIT", f"DROP TABLE IF EXISTS {staging};"]
+    # the load's own connection stays transactional; staging uses separate autocommit ones
+    assert "autocommit" not in connects[0]
+    assert all(kwargs["autocommit"] is True for kwargs in connects[1:])
+
+    # a failed merge rolls back before the staging table is dropped
+    cursor = FakeCursor(fail_merge=True)
+    monkeypatch.setattr(load_data_module.psycopg, "connect", fake_connect(cursor))
+    with pytest.raises(RuntimeError, match="merge failed"):
+        load_data_module.load("fake.json", reset=True, workers=2)
+    assert "COMMIT" not in cursor.executed
+    assert cursor.executed[-2] == "ROLLBACK"
+    assert cursor.executed[-1].startswith("DROP TABLE IF EXISTS applicantdata_staging_")
+
+
+@pytest.mark.integration
+def test_clean_batch_matches_clean_record():
+    """Ensure the columnar cleaner returns exactly the scalar rows."""
+    # test mixed JSON types, null bytes, unhashable values, bad dates and empty batches
+    records = [
+        {"program": "CS\x00, U", "comments": None, "date_added": "January 10, 2025",
+         "url": "u1", "applicant_status": "Accepted", "semester_year_start": "Fall 2026",
+         "citizenship": "International", "gpa": "GPA 3.90", "gre": 330, "gre_v": 165.0,
+         "gre_aw": True, "masters_or_phd": "PhD", "llm-generated-program": "CS"},
+        {"program": 7, "comments": ["a", "b"], "date_added": "soon", "url": "u2",
+         "applicant_status": "Wait  listed", "semester_year_start": "Spring 2025",
+         "citizenship": "Other", "gpa": 1, "gre": 1.0, "gre_v": "", "gre_aw": None},
+        {"program": "CS\x00, U", "date_added": "soon", "applicant_status": "Accepted",
+         "gpa": "GPA 3.90", "gre": True, "gre_v": {"x": 1}},
+    ]
+    ids = [10, 11, 12]
+    scalar_bad, batch_bad = [], []
+
+    expected = [
+        load_data_module.clean_record(p_id, record, scalar_bad)
+        for p_id, record in zip(ids, records)
+    ]
+    assert load_data_module.clean_batch(ids, records, batch_bad) == expected
+    assert batch_bad == scalar_bad == ["soon", "soon"]
+    assert load_data_module.clean_batch([], []) == []
+
+    # -0.0 == 0.0, so compare reprs to be sure neither sign is cached for the other
+    signed = [{"gpa": 0.0, "gre": -0.0}, {"gpa": -0.0, "gre": 0.0}, {"gpa": "-0", "gre": 0}]
+    expected = [load_data_module.clean_record(p_id, record) for p_id, record in zip(ids, signed)]
+    assert repr(load_data_module.clean_batch(ids, signed)) == repr(expected)
+    assert repr([row[8] for row in expected]) == "[0.0, -0.0, -0.0]"
+
+
+@pytest.mark.integration
+def test_incremental_load_skips_unchanged_file_and_rows(tmp_path, capsys, monkeypatch):
+    """Ensure incremental loads skip an unchanged file and write only new or changed rows."""
+    # test file-hash skip, per-record diff with p_id reuse, and the recorded state
+    u1 = {"program": "CS, U", "url": "u1", "gpa": "3.90"}
+    u2 = {"program": "DS, V", "url": "u2", "gpa": "3.80"}
+    u3 = {"program": "EE, W", "url": "u3", "gpa": "3.70"}
+    source = tmp_path / "seed.json"
+    source.write_text(json.dumps([u1, u2, u3]), encoding="utf-8")
+    content_hash = load_data_module.file_hash(str(source))
+
+    class FakeCursor:
+        def __init__(self, state, stored):
+            self.state = state
+            self.stored = stored
+            self.executed = []
+            self.rows = None
+
+        def execute(self, query, params=None):
+            self.executed.append((" ".join(query.split()), params))
+
+        def executemany(self, query, rows):
+            if "applicantData" in query:
+                self.rows = list(rows)
+
+        def fetchone(self):
+            query = self.executed[-1][0]
+            if "FROM load_state" in query:
+                assert "to_regclass('applicantdata') IS NOT NULL" in query
+                return self.state if self.table_exists else None
+            return (100,)
+
+        def fetchall(self):
+            if "url IS NULL" in self.executed[-1][0]:
+                return self.unkeyed
+            return self.stored
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, exc_type, exc, tb):
+            return False
+
+    class FakeConnection:
+        def __init__(self, state=None, stored=(), unkeyed=(), table_exists=True):
+            self.cursor_obj = FakeCursor(state, list(stored))
+            self.cursor_obj.unkeyed = list(unkeyed)
+            self.cursor_obj.table_exists = table_exists
+
+        def cursor(self):
+            return self.cursor_obj
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, exc_type, exc, tb):
+            return False
+
+    def run(connection, **kwargs):
+        monkeypatch.setattr(load_data_module.psycopg, "connect", lambda **_kwargs: connection)
+        load_data_module.load(str(source), incremental=True, **kwargs)
+        return connection.cursor_obj
+
+    # the file is unchanged since the last incremental load: nothing is read or written
+    cursor = run(FakeConnection(state=(content_hash,)))
+    assert "is unchanged since its last load; skipped." in capsys.readouterr().out
+    assert cursor.rows is None
+    assert not any("applicantData" in query for query, _ in cursor.executed)
+
+    # the same hash no longer skips once applicantData was dropped outside a reset
+    cursor = run(FakeConnection(state=(content_hash,), table_exists=False))
+    assert "3 new, 0 changed and 0 unchanged or repeated records" in capsys.readouterr().out
+    assert [row[4] for row in cursor.rows] == ["u1", "u2", "u3"]
+
+    # u1 is stored unchanged, u2 changed under p_id 7, u3 is new
+    stored = [("u1", load_data_module.record_hash(u1), 5), ("u2", "stale", 7)]
+    cursor = run(FakeConnection(state=("older",), stored=stored))
+    assert "1 new, 1 changed and 1 unchanged or repeated records" in capsys.readouterr().out
+    assert ("DELETE FROM applicantData WHERE p_id = ANY(%s);", ([7],)) in cursor.executed
+    assert [(row[0], row[4]) for row in cursor.rows] == [(7, "u2"), (100, "u3")]
+    assert cursor.rows[1][15] == load_data_module.record_hash(u3)
+    assert cursor.executed[-1][1] == (str(source), content_hash)
+    assert "ON CONFLICT (sourcefile)" in cursor.executed[-1][0]
+
+    # url-less records match stored rows by hash; a repeated url counts once, with its last record
+    bare = {"program": "ME, X", "gpa": "3.10"}
+    edited = {"program": "ME, Y"}
+    u2_again = dict(u2, gpa="3.85")
+    source.write_text(json.dumps([u1, bare, u2, edited, u2_again]), encoding="utf-8")
+    stored = [("u1", load_data_module.record_hash(u1), 5), ("u2", load_data_module.record_hash(u2), 7)]
+    cursor = run(FakeConnection(state=("older",), stored=stored,
+                                unkeyed=[(load_data_module.record_hash(bare),)]))
+    assert "1 new, 1 changed and 3 unchanged or repeated records" in capsys.readouterr().out
+    lookup = [params for query, params in cursor.executed if "url IS NULL" in query]
+    assert lookup == [([load_data_module.record_hash(bare), load_data_module.record_hash(edited)],)]
+    assert ("SELECT url, record_hash, p_id FROM applicantData WHERE url = ANY(%s);", (["u1", "u2"],)) \
+        in cursor.executed
+    assert [(row[0], row[1], row[8]) for row in cursor.rows] == [(7, "DS, V", 3.85), (100, "ME, Y", None)]
+
+    # a stored row that matches the repeated url's last record is left alone
+    stored = [("u1", load_data_module.record_hash(u1), 5), ("u2", load_data_module.record_hash(u2_again), 7)]
+    cursor = run(FakeConnection(state=("older",), stored=stored,
+                                unkeyed=[(load_data_module.record_hash(bare),)]))
+    assert "1 new, 0 changed and 4 unchanged or repeated records" in capsys.readouterr().out
+    source.write_text(json.dumps([u1, u2, u3]), encoding="utf-8")
+
+    # a reset clears the recorded state instead of checking it, then reloads everything
+    cursor = run(FakeConnection(state=(content_hash,)), reset=True)
+    assert ("DELETE FROM load_state;", None) in cursor.executed
+    assert [row[4] for row in cursor.rows] == ["u1", "u2", "u3"]
@@ -6,6 +6,7 @@ import types
 
 import pytest
 
+import load_data as load_data_module
 import query_data as query_data_module
 
 
@@ -21,6 +22,89 @@ def test_queries_list_contains_expected_items():
         assert "SELECT" in query
 
 
+@pytest.mark.integration
+def test_queries_filter_on_normalized_columns():
+    """Ensure term/status/citizenship filters use the indexed small-int columns."""
+    # test no query falls back to free-text term, status, or citizenship predicates
+    for _label, _prefix, query in query_data_module.QUERIES:
+        assert "term =" not in query and "term ILIKE" not in query
+        assert "status ILIKE" not in query
+        assert "us_or_international" not in query
+    default_q1 = query_data_module.QUERIES[0][2]
+    assert "term_year = 2026" in default_q1
+    assert f"term_season = {load_data_module.SEASON_CODES['fall']}" in default_q1
+
+    # LLM school queries filter on dimension ids and use the text only for unmatched rows
+    for query in (query_data_module.QUERY_7a, query_data_module.QUERY_8a):
+        assert "JOIN" not in query and "COALESCE" not in query
+        assert "university_id IN (SELECT id FROM university WHERE name ILIKE ANY" in query
+        assert "university_id IS NULL AND llm_generated_university ILIKE ANY" in query
+        assert "program_id IN (SELECT id FROM program WHERE name ILIKE" in query
+
+
+@pytest.mark.integration
+def test_resolve_and_bind_catalog_params():
+    """Ensure overrides are validated and bound to the SQL placeholders."""
+    # test defaults, overrides, LIKE escaping, and rejection of unknown term/status
+    assert query_data_module.resolve_params() == {"term": "Fall 2026", "status": "Accepted"}
+    params = query_data_module.resolve_params(
+        {"term": "Spring 2025", "status": "", "degree": "PhD", "schools": ["100%_U"]}
+    )
+    assert params == {"term": "Spring 2025", "status": "Accepted", "degree": "PhD", "schools": ["100%_U"]}
+    bound = query_data_module.bind_params(params, {"degree": "Masters", "schools": ["JHU"]})
+    assert bound == {
+        "term_season": load_data_module.SEASON_CODES["spring"],
+        "term_year": 2025,
+        "status_code": load_data_module.STATUS_CODES["accepted"],
+        "degree_pattern": "PhD%",
+        "school_patterns": ["%100\\%\\_U%"],
+    }
+    with pytest.raises(ValueError, match="term"):
+        query_data_module.resolve_params({"term": "2026"})
+    with pytest.raises(ValueError, match="status"):
+        query_data_module.resolve_params({"status": "Pending"})
+    assert query_data_module.sql_literal(["O'Brien", "x"]) == "ARRAY['O''Brien', 'x']::text[]"
+
+
+@pytest.mark.integration
+def test_run_catalog_executes_prepared_statements():
+    """Ensure the catalog runs every query as a prepared statement with bound parameters."""
+    # test run_catalog passes parameters and prepare=True, and formats results
+    class FakeCursor:
+        def __init__(self):
+            self.calls = []
+
+        def execute(self, query, params=None, prepare=None):
+            self.calls.append((query, params, prepare))
+
+        def fetchone(self):
+            query = self.calls[-1][0]
+            if "AS avg_gpa," in query:
+                return ("3.85", "327.50", "163.50", "4.25")
+            return None if "count_fall_2026" in query else (7,)
+
+    cursor = FakeCursor()
+    results = query_data_module.run_catalog(cursor, {"term": "Spring 2025"})
+
+    assert len(results) == len(query_data_module.CATALOG) == len(query_data_module.QUERIES)
+    assert all(prepare is True for _query, _params, prepare in cursor.calls)
+    assert cursor.calls[0][1]["term_year"] == 2025
+    assert results[0] == (
+        "q1",
+        "1. How many entries do you have in your database who have applied for Spring 2025?",
+        "Answer: Applicant count: ",
+        None,
+    )
+    assert results[2][3] == "GPA: 3.85, GRE: 327.50, GRE V: 163.50, GRE AW: 4.25"
+    assert results[8][1].startswith("8. How many entries from 2025")
+    assert results[9][3] == 7
+    # default status keeps the original wording; an overridden one is named
+    assert results[4][2] == "Answer: Acceptance percent: "
+    rejected = query_data_module.run_catalog(FakeCursor(), {"status": "Rejected"})
+    assert rejected[4][1] == "5. What percent of entries for Fall 2026 are Rejected (to two decimal places)?"
+    assert rejected[5][2] == "Answer: Average GPA Rejected: "
+
+
 @pytest.mark.integration
 def test_main_executes_queries_and_formats_output(monkeypatch, capsys):
     """Ensure standalone query runner prints expected formatted output values."""
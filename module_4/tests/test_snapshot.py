@@ -0,0 +1,259 @@
+"""Tests for Parquet snapshots and running the analysis queries on them."""
+
+import runpy
+import sys
+from decimal import Decimal
+
+import duckdb
+import pytest
+
+import query_data as query_data_module
+import snapshot as snapshot_module
+
+TABLE_CSV = {
+    "applicantData": (
+        '1,"Computer Science, Johns Hopkins University","",2025-01-10,u1,Accepted,Fall 2026,'
+        "American,3.9,330,165,4.5,Masters,Computer Science,Johns Hopkins University,,3,2026,1,1,1,1\n"
+        '2,"Computer Science, Stanford University",,2025-02-02,u2,Accepted,Fall 2026,'
+        "International,3.7,,,,PhD,Computer Science,Stanford University,,3,2026,1,2,1,2\n"
+        '3,"Mechanical Engineering, MIT",,,u3,Rejected,Fall 2026,International,3.2,,,,Masters,'
+        "Mechanical Engineering,Massachusetts Institute of Technology,,3,2026,2,2,,\n"
+    ),
+    "program": "1,Computer Science\n",
+    "university": "1,Johns Hopkins University\n2,Stanford University\n",
+}
+
+# PostgreSQL answers for the default parameters, in QUERIES order
+POSTGRES_ROWS = [
+    (3,),
+    (Decimal("66.67"),),
+    (Decimal("3.60"), Decimal("330.00"), Decimal("165.00"), Decimal("4.50")),
+    (Decimal("3.90"),),
+    (Decimal("66.67"),),
+    (Decimal("3.80"),),
+    (1,),
+    (1,),
+    (1,),
+    (1,),
+    (1,),
+    (Decimal("0.00"),),
+]
+
+
+class FakeCopy:
+    """``COPY ... TO STDOUT`` stream of one table's CSV."""
+
+    def __init__(self, statement):
+        table = statement.split(" FROM ")[1].split()[0]
+        self.chunks = [TABLE_CSV[table].encode("utf-8")]
+
+    def __iter__(self):
+        return iter(self.chunks)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+class FakeCursor:
+    """PostgreSQL cursor stand-in for exports and canned query answers."""
+
+    def __init__(self, rows=()):
+        self.rows = list(rows)
+        self.executed = []
+
+    def copy(self, statement):
+        return FakeCopy(statement)
+
+    def execute(self, query):
+        self.executed.append(query)
+
+    def fetchone(self):
+        return self.rows.pop(0)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+class FakeConnection:
+    """Connection stand-in returning one shared cursor."""
+
+    def __init__(self, rows=()):
+        self.cursor_obj = FakeCursor(rows)
+
+    def cursor(self):
+        return self.cursor_obj
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+def empty_tables():
+    """Return a DuckDB connection with empty tables shaped like a snapshot."""
+    con = duckdb.connect()
+    for table, columns in snapshot_module.SNAPSHOT_TABLES.items():
+        con.execute(f"CREATE TABLE {table} ({', '.join(f'{name} {kind}' for name, kind in columns)});")
+    return con
+
+
+@pytest.fixture
+def snapshot_dir(tmp_path, monkeypatch):
+    """Export the fake tables into a snapshot directory."""
+    monkeypatch.setattr(snapshot_module.psycopg, "connect", lambda **_kwargs: FakeConnection())
+    directory = tmp_path / "snap"
+    counts = snapshot_module.export_snapshot(str(directory))
+    assert counts == {"applicantData": 3, "program": 1, "university": 2}
+    return str(directory)
+
+
+@pytest.mark.integration
+def test_snapshot_round_trips_types_and_nulls(snapshot_dir):
+    """Ensure exported Parquet keeps column types, NULLs and empty strings apart."""
+    # test types and PostgreSQL CSV null semantics survive the export
+    with snapshot_module.open_snapshot(snapshot_dir) as con:
+        rows = con.execute(
+            "SELECT p_id, comments, date_added, gpa, gre, term_year, program_id "
+            "FROM applicantData ORDER BY p_id"
+        ).fetchall()
+    assert str(rows[0][2]) == "2025-01-10"
+    assert rows[0][1] == "" and rows[1][1] is None
+    assert rows[0][3:6] == (3.9, 330.0, 2026)
+    assert rows[2][2] is None and rows[2][4] is None and rows[2][6] is None
+
+
+@pytest.mark.integration
+def test_run_queries_on_snapshot_matches_postgres(snapshot_dir):
+    """Ensure every query runs on the snapshot and agrees with the SQL answers."""
+    # test translated queries, overrides, and the PostgreSQL comparison
+    with snapshot_module.open_snapshot(snapshot_dir) as con:
+        results = snapshot_module.run_queries(con)
+        assert [label for label, _prefix, _value in results] == [
+            label for label, _prefix, _query in query_data_module.QUERIES
+        ]
+        values = [value for _label, _prefix, value in results]
+        assert values[0] == 3
+        assert values[2] == "GPA: 3.60, GRE: 330.00, GRE V: 165.00, GRE AW: 4.50"
+        assert values[6:10] == [1, 1, 1, 1]
+
+        stanford = snapshot_module.run_queries(con, {"schools": ["Stanford"]})
+        assert stanford[6][2] == 0 and stanford[8][2] == 1
+
+        cursor = FakeCursor(POSTGRES_ROWS)
+        assert snapshot_module.verify(cursor, con) == []
+        assert cursor.executed == [query for _label, _prefix, query in query_data_module.QUERIES]
+
+        wrong = list(POSTGRES_ROWS)
+        wrong[0] = (4,)
+        mismatches = snapshot_module.verify(FakeCursor(wrong), con)
+    assert mismatches == [(query_data_module.QUERIES[0][0], (4,), (3,))]
+
+
+@pytest.mark.integration
+def test_llm_queries_count_rows_with_non_canonical_names():
+    """Ensure 7a/8a still count rows whose LLM names have no dimension key."""
+    # test canonical rows matched on ids and a non-canonical row matched on its text
+    con = empty_tables()
+    con.execute("INSERT INTO program VALUES (1, 'Computer Science');")
+    con.execute("INSERT INTO university VALUES (1, 'Stanford University');")
+    con.execute(
+        "INSERT INTO applicantData (p_id, degree, term_year, status_code, llm_generated_program,"
+        " llm_generated_university, program_id, university_id) VALUES"
+        " (1, 'PhD', 2026, 1, 'Computer Science', 'Stanford University', 1, 1),"
+        " (2, 'PhD', 2026, 1, 'Computer Science (PhD)', 'Stanford University, CA', NULL, NULL),"
+        " (3, 'PhD', 2026, 1, 'CS', 'Stanford', 1, 1),"
+        " (4, 'PhD', 2026, 1, 'Computer Science', 'Stanford University', 1, NULL);"
+    )
+    results = {label[:3]: value for label, _prefix, value in snapshot_module.run_queries(con)}
+    con.close()
+    assert results["8a."] == 4
+    assert results["7a."] == 0
+
+
+@pytest.mark.integration
+def test_averages_round_like_postgres():
+    """Ensure averages ending in .xx45 round to two places once, as PostgreSQL does."""
+    # test 3.2445 rounds to 3.24 (not 3.245 then 3.25) and 327.445 keeps PostgreSQL's 15 digits
+    con = empty_tables()
+    con.execute(
+        "INSERT INTO applicantData (p_id, gpa, gre, term_season, term_year, status_code,"
+        " citizenship_code) VALUES (1, 3.245, 327.44, 3, 2026, 1, 1), (2, 3.244, 327.45, 3, 2026, 1, 1);"
+    )
+    results = snapshot_module.run_queries(con)
+    con.close()
+    assert results[2][2].startswith("GPA: 3.24, GRE: 327.45,")
+    assert results[3][2] == Decimal("3.24")
+    assert results[5][2] == Decimal("3.24")
+
+
+@pytest.mark.integration
+def test_percentages_round_like_postgres():
+    """Ensure percentages on a half-cent boundary round up, as PostgreSQL's numeric does."""
+    # test 201 of 20000 rows (1.005 percent) gives 1.01 in queries 2, 5 and 10, not the double's 1.0
+    con = empty_tables()
+    con.execute(
+        "INSERT INTO applicantData (p_id, term_season, term_year, status_code, citizenship_code)"
+        " SELECT i, 3, 2026, CASE WHEN i <= 201 THEN 1 WHEN i <= 402 THEN 2 ELSE 3 END,"
+        " CASE WHEN i <= 201 THEN 2 ELSE 1 END FROM range(1, 20001) AS r(i);"
+    )
+    results = snapshot_module.run_queries(con)
+    con.close()
+    assert [results[index][2] for index in (1, 4, 11)] == [Decimal("1.01")] * 3
+
+
+@pytest.mark.integration
+def test_to_duckdb_rewrites_ilike():
+    """Ensure ILIKE patterns get an escape character and ANY arrays are expanded."""
+    # test escaped literals, array expansion, and an empty school list
+    sql = (
+        "WHERE degree ILIKE 'Ph\\_D%' AND program ILIKE ANY(ARRAY['%A''s%', '%B%']::text[]) "
+        "AND u.name ILIKE ANY(ARRAY[]::text[]) "
+        "AND a.uni ILIKE ANY(ARRAY['%C%']::text[])"
+    )
+    assert snapshot_module.to_duckdb(sql) == (
+        "WHERE degree ILIKE 'Ph\\_D%' ESCAPE '\\' AND "
+        "(program ILIKE '%A''s%' ESCAPE '\\' OR program ILIKE '%B%' ESCAPE '\\') AND FALSE AND "
+        "(a.uni ILIKE '%C%' ESCAPE '\\')"
+    )
+    assert snapshot_module.normalize(None) is None
+    assert snapshot_module.to_duckdb("SELECT ROUND(AVG(gpa)::numeric, 2)") == (
+        "SELECT ROUND(CAST(printf('%.15g', AVG(gpa)) AS DECIMAL(38,15)), 2)"
+    )
+
+
+@pytest.mark.integration
+def test_main_commands(tmp_path, monkeypatch, capsys):
+    """Ensure the export, query and verify commands print results and exit codes."""
+    # test CLI export, query with overrides, verify success/failure, and __main__
+    directory = str(tmp_path / "snap")
+    monkeypatch.setattr(snapshot_module.psycopg, "connect", lambda **_kwargs: FakeConnection())
+    assert snapshot_module.main(["export", directory]) == 0
+    assert "Wrote 3 applicantData rows to" in capsys.readouterr().out
+
+    assert snapshot_module.main(["query", directory, "--term", "Fall 2026", "--school", "JHU"]) == 0
+    assert "Answer: Applicant count: 3" in capsys.readouterr().out
+
+    monkeypatch.setattr(
+        snapshot_module.psycopg, "connect", lambda **_kwargs: FakeConnection(POSTGRES_ROWS)
+    )
+    assert snapshot_module.main(["verify", directory]) == 0
+    assert "12 of 12 queries match." in capsys.readouterr().out
+
+    wrong = list(POSTGRES_ROWS)
+    wrong[3] = (Decimal("3.10"),)
+    monkeypatch.setattr(snapshot_module.psycopg, "connect", lambda **_kwargs: FakeConnection(wrong))
+    assert snapshot_module.main(["verify", directory]) == 1
+    out = capsys.readouterr().out
+    assert "MISMATCH 4." in out and "11 of 12 queries match." in out
+
+    monkeypatch.setattr(sys, "argv", ["snapshot.py", "query", directory])
+    with pytest.raises(SystemExit) as exit_info:
+        runpy.run_module("snapshot", run_name="__main__")
+    assert exit_info.value.code == 0
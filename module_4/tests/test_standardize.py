@@ -0,0 +1,161 @@
+"""Tests for the background LLM standardization stage of the pull pipeline."""
+
+import json
+
+import pytest
+
+import standardize as standardize_module
+
+
+class FakeResponse:
+    """Streamed HTTP response yielding NDJSON lines."""
+
+    def __init__(self, lines, status=200):
+        self.lines = lines
+        self.status = status
+        self.released = False
+
+    def __iter__(self):
+        return iter(self.lines)
+
+    def release_conn(self):
+        self.released = True
+
+
+class FakeHttp:
+    """PoolManager stand-in that answers each program with its upper-case form."""
+
+    def __init__(self, status=200, drop=0):
+        self.requests = []
+        self.status = status
+        self.drop = drop
+        self.responses = []
+
+    def request(self, method, url, body=None, headers=None, timeout=None, preload_content=True):
+        self.requests.append((method, url, json.loads(body), headers))
+        rows = json.loads(body)["rows"]
+        lines = [
+            json.dumps(
+                {
+                    "program": row["program"],
+                    "llm-generated-program": row["program"].upper(),
+                    "llm-generated-university": "Uni",
+                }
+            ).encode() + b"\n"
+            for row in rows[self.drop:]
+        ]
+        response = FakeResponse(lines + [b"\n"], self.status)
+        self.responses.append(response)
+        return response
+
+
+class FakeCursor:
+    """Cursor recording statements and returning pending rows for the SELECT."""
+
+    def __init__(self, pending):
+        self.pending = pending
+        self.executed = []
+
+    def execute(self, query, params=None):
+        self.executed.append((" ".join(query.split()), params))
+
+    def fetchall(self):
+        return self.pending
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+class FakeConnection:
+    """Connection counting per-batch commits."""
+
+    def __init__(self, cursor):
+        self.cursor_obj = cursor
+        self.commits = 0
+
+    def cursor(self):
+        return self.cursor_obj
+
+    def commit(self):
+        self.commits += 1
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+@pytest.mark.db
+def test_standardize_new_rows_batches_distinct_programs(monkeypatch):
+    """Ensure each distinct program is sent once and written back per batch."""
+    pending = [(1, "CS, U"), (2, "Math, V"), (3, "CS, U"), (4, None)]
+    cursor = FakeCursor(pending)
+    connection = FakeConnection(cursor)
+    http = FakeHttp()
+    monkeypatch.setattr(standardize_module.psycopg, "connect", lambda **_kwargs: connection)
+    monkeypatch.setattr(standardize_module.urllib3, "PoolManager", lambda: http)
+    monkeypatch.setenv("LLM_STANDARDIZER_URL", "http://llm:8000/")
+
+    updated = standardize_module.standardize_new_rows(["u1", "u2", "u3", "u4"], batch_size=2)
+
+    assert updated == 4
+    assert connection.commits == 2
+    assert [r[1] for r in http.requests] == ["http://llm:8000/standardize?stream=1"] * 2
+    assert [r[2]["rows"] for r in http.requests] == [
+        [{"program": "CS, U"}, {"program": "Math, V"}],
+        [{"program": ""}],
+    ]
+    assert all(response.released for response in http.responses)
+
+    select, updates = cursor.executed[0], cursor.executed[1:]
+    assert "url = ANY(%s)" in select[0]
+    assert select[1] == (["u1", "u2", "u3", "u4"],)
+    assert all(query.startswith("UPDATE applicantData AS a") for query, _ in updates)
+    assert all("university_id = (SELECT id FROM university" in query for query, _ in updates)
+    assert updates[0][1] == ([1, 3, 2], ["CS, U", "CS, U", "MATH, V"], ["Uni", "Uni", "Uni"])
+    assert updates[1][1] == ([4], [""], ["Uni"])
+
+
+@pytest.mark.db
+def test_standardize_new_rows_disabled_or_empty(monkeypatch):
+    """Ensure the stage is a no-op without a service URL or new rows."""
+    def fail_connect(**_kwargs):
+        raise AssertionError("DB should not be opened")
+
+    monkeypatch.setattr(standardize_module.psycopg, "connect", fail_connect)
+    monkeypatch.delenv("LLM_STANDARDIZER_URL", raising=False)
+    assert standardize_module.standardizer_url() == ""
+    assert standardize_module.standardize_new_rows(["u1"]) == 0
+    assert standardize_module.standardize_new_rows([], base_url="http://llm") == 0
+
+
+@pytest.mark.db
+def test_standardize_batch_rejects_bad_responses():
+    """Ensure HTTP errors and short responses fail instead of misaligning rows."""
+    with pytest.raises(RuntimeError, match="HTTP 503"):
+        standardize_module.standardize_batch(FakeHttp(status=503), "http://llm", ["CS"])
+    short = FakeHttp(drop=1)
+    with pytest.raises(RuntimeError, match="1 rows for 2"):
+        standardize_module.standardize_batch(short, "http://llm", ["CS", "Math"])
+    assert short.responses[0].released
+
+
+@pytest.mark.db
+def test_run_standardize_job_reads_urls_from_file(tmp_path, monkeypatch):
+    """Ensure the job standardizes only rows listed in the pull output file."""
+    source = tmp_path / "new_only.json"
+    source.write_text(json.dumps([{"url": "u1"}, {"url": ""}, {"program": "x"}]), encoding="utf-8")
+    captured = {}
+
+    def fake_standardize(urls):
+        captured["urls"] = urls
+        return 1
+
+    monkeypatch.setattr(standardize_module, "standardize_new_rows", fake_standardize)
+
+    assert standardize_module.run_standardize_job(str(source)) == 1
+    assert captured["urls"] == ["u1"]